@@ -13,12 +13,16 @@ __all__ = [
     "deck",
     "deck_factory",
     "deck_manager",
+    "distance",
     "events",
     "game_manager",
     "general_store",
     "helpers",
+    "legal_actions",
     "network",
     "player",
+    "simulation",
+    "snapshot",
     "turn_phases",
     "ui",
 ]
@@ -45,6 +45,15 @@ class AbilityDispatchMixin:
         player.metadata.doc_free_bang += 1
         player.hand.append(BangCard())
 
+    def sid_ketchum_ability(
+        self: GameManagerProtocol, player: "Player", indices: list[int] | None = None
+    ) -> bool:
+        """Discard two cards to regain one life point."""
+        character = player.character
+        if character is None or not hasattr(character, "use_ability"):
+            return False
+        return bool(character.use_ability(self, player, indices=indices))
+
     def pat_brennan_draw(
         self: GameManagerProtocol,
         player: "Player",
@@ -0,0 +1,252 @@
+"""Append-only record of the commands applied to a game.
+
+A :class:`GameManager` created with an :class:`ActionLog` appends every
+command it is given from outside, such as ``play_card`` or ``end_turn``, to
+the log before running it. Commands issued while another one runs, for
+example the draw phase started by ``end_turn``, are part of that command and
+are not logged again. Players and cards in the arguments are stored by seat
+and position, so together with the seed the log is enough for :func:`replay`
+to rebuild the game exactly: every shuffle draws from the seeded game
+generator.
+
+The log serializes to JSON lines: a header with the seed and expansions
+followed by one ``[name, args, kwargs]`` line per command.
+"""
+
+from __future__ import annotations
+
+import json
+import secrets
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import wraps
+from typing import TYPE_CHECKING, Any, cast
+
+from .cards.card import BaseCard
+from .cards.roles import BaseRole
+from .characters.base import BaseCharacter
+from .player import Player
+
+if TYPE_CHECKING:  # pragma: no cover - imported for type checking
+    from .game_manager import GameManager
+
+Command = tuple[str, list[Any], dict[str, Any]]
+
+
+@dataclass(slots=True)
+class ActionLog:
+    """Seed, expansions and commands of one game."""
+
+    seed: int | None = None
+    expansions: list[str] = field(default_factory=list)
+    commands: list[Command] = field(default_factory=list)
+    # Called with each command as it is logged, before it runs.
+    listeners: list[Callable[[Command], None]] = field(default_factory=list, repr=False)
+    # Number of logged commands currently running; nested calls are skipped.
+    depth: int = field(default=0, init=False, repr=False)
+
+    def __len__(self) -> int:
+        return len(self.commands)
+
+    def header(self) -> str:
+        """Return the JSON header line."""
+        return json.dumps({"seed": self.seed, "expansions": self.expansions})
+
+    def dumps(self) -> str:
+        """Return the log as JSON lines."""
+        lines = [self.header()]
+        lines.extend(encode_command(command) for command in self.commands)
+        return "\n".join(lines) + "\n"
+
+    @contextmanager
+    def standalone(self) -> Iterator[None]:
+        """Log commands issued in the block even while another command runs.
+
+        Code reacting to a game listener, such as a server room starting the
+        draw phase it prompted for, uses this so the commands it issues are
+        replayed without it.
+        """
+        depth, self.depth = self.depth, 0
+        try:
+            yield
+        finally:
+            self.depth = depth
+
+    @classmethod
+    def loads(cls, text: str) -> ActionLog:
+        """Parse a log produced by :meth:`dumps`."""
+        lines = [line for line in text.splitlines() if line.strip()]
+        if not lines:
+            raise ValueError("empty action log")
+        header = json.loads(lines[0])
+        log = cls(seed=header.get("seed"), expansions=list(header.get("expansions") or []))
+        log.commands = [decode_command(line) for line in lines[1:]]
+        return log
+
+
+def encode_command(command: Command) -> str:
+    """Return ``command`` as one compact JSON line."""
+    return json.dumps(command, separators=(",", ":"))
+
+
+def decode_command(line: str) -> Command:
+    """Parse a line produced by :func:`encode_command`."""
+    name, args, kwargs = json.loads(line)
+    return name, args, kwargs
+
+
+def _subclasses(base: type) -> dict[str, type]:
+    found: dict[str, type] = {}
+    stack: list[type] = [base]
+    while stack:
+        cls = stack.pop()
+        sub: type
+        for sub in cls.__subclasses__():
+            found.setdefault(sub.__name__, sub)
+            stack.append(sub)
+    return found
+
+
+def _class_by_name(base: type, name: str) -> type:
+    cls = _subclasses(base).get(name)
+    if cls is None:
+        raise ValueError(f"unknown {base.__name__} {name!r}")
+    return cls
+
+
+def _encode_card(gm: GameManager, card: BaseCard) -> dict[str, Any]:
+    for seat, player in enumerate(gm.players):
+        for idx, held in enumerate(player.hand):
+            if held is card:
+                return {"hand": [seat, idx]}
+        for slot, equipped in player.equipment.items():
+            if equipped is card:
+                return {"equipment": [seat, slot]}
+    for idx, discarded in enumerate(gm.discard_pile):
+        if discarded is card:
+            return {"discard": idx}
+    # Cards created by the caller, such as those handed out in tests.
+    return {"new_card": type(card).__name__, "suit": card.suit, "rank": card.rank}
+
+
+def _encode(gm: GameManager, value: Any) -> Any:
+    if isinstance(value, Player):
+        players = gm.players
+        for seat, player in enumerate(players):
+            if player is value:
+                return {"seat": seat}
+        return {
+            "player": value.name,
+            "role": type(value.role).__name__ if value.role else None,
+            "character": type(value.character).__name__ if value.character else None,
+        }
+    if isinstance(value, BaseCard):
+        return _encode_card(gm, value)
+    if isinstance(value, list | tuple):
+        return [_encode(gm, v) for v in value]
+    return value
+
+
+def _decode(gm: GameManager, value: Any) -> Any:
+    if isinstance(value, list):
+        return [_decode(gm, v) for v in value]
+    if not isinstance(value, dict):
+        return value
+    if "seat" in value:
+        return gm.players[value["seat"]]
+    if "hand" in value:
+        seat, idx = value["hand"]
+        return gm.players[seat].hand[idx]
+    if "equipment" in value:
+        seat, slot = value["equipment"]
+        return gm.players[seat].equipment[slot]
+    if "discard" in value:
+        return gm.discard_pile[value["discard"]]
+    if "new_card" in value:
+        card_cls = _class_by_name(BaseCard, value["new_card"])
+        return card_cls(value["suit"], value["rank"])
+    if "player" in value:
+        role = _class_by_name(BaseRole, value["role"])() if value["role"] else None
+        character = (
+            _class_by_name(BaseCharacter, value["character"])() if value["character"] else None
+        )
+        return Player(value["player"], role=role, character=character)
+    raise ValueError(f"cannot decode argument {value!r}")
+
+
+def logged[F: Callable[..., Any]](method: F) -> F:
+    """Make a :class:`GameManager` method append its call to ``action_log``."""
+    name = method.__name__
+
+    @wraps(method)
+    def command(gm: GameManager, *args: Any, **kwargs: Any) -> Any:
+        log = gm.action_log
+        if log is None or log.depth:
+            return method(gm, *args, **kwargs)
+        entry = (name, _encode(gm, args), {key: _encode(gm, v) for key, v in kwargs.items()})
+        log.commands.append(entry)
+        for cb in log.listeners:
+            cb(entry)
+        log.depth += 1
+        try:
+            return method(gm, *args, **kwargs)
+        finally:
+            log.depth -= 1
+
+    return cast(F, command)
+
+
+def new_seed() -> int:
+    """Return a seed for a recorded game that was not given one."""
+    return secrets.randbits(63)
+
+
+def apply_command(gm: GameManager, command: Command) -> Any:
+    """Run ``command`` on ``gm`` and return its result."""
+    name, args, kwargs = command
+    method = getattr(gm, name)
+    return method(*_decode(gm, args), **{key: _decode(gm, v) for key, v in kwargs.items()})
+
+
+def _new_game(log: ActionLog) -> GameManager:
+    from .game_manager import GameManager
+
+    return GameManager(expansions=list(log.expansions), seed=log.seed, action_log=ActionLog())
+
+
+def iter_replay(log: ActionLog) -> Iterator[GameManager]:
+    """Yield the game rebuilt from ``log`` after each command.
+
+    The same :class:`GameManager` is yielded every time. It records a new log
+    equal to ``log`` as the commands are applied, so play can continue from
+    any point.
+    """
+    gm = _new_game(log)
+    for command in log.commands:
+        apply_command(gm, command)
+        yield gm
+
+
+def replay(log: ActionLog, until: int | None = None) -> GameManager:
+    """Rebuild the game recorded in ``log``.
+
+    Only the first ``until`` commands are applied when it is given.
+    """
+    gm = _new_game(log)
+    for command in log.commands[:until]:
+        apply_command(gm, command)
+    return gm
+
+
+__all__ = [
+    "ActionLog",
+    "Command",
+    "apply_command",
+    "decode_command",
+    "encode_command",
+    "iter_replay",
+    "logged",
+    "new_seed",
+    "replay",
+]
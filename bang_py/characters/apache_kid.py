@@ -25,6 +25,8 @@ class ApacheKid(BaseCharacter):
             if p is not player and target is player and getattr(card, "suit", None) == "Diamonds":
                 if gm._duel_counts is not None and not isinstance(card, DuelCard):
                     return True
+                if gm._listing_actions:
+                    return False
                 if card in getattr(p, "hand", []):
                     p.hand.remove(card)
                 gm._pass_left_or_discard(p, card)
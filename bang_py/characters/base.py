@@ -3,13 +3,18 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, ClassVar
 
 if TYPE_CHECKING:  # pragma: no cover - for type hints only
     from ..game_manager_protocol import GameManagerProtocol
     from ..player import Player
 
 
+# Prompt name of every character class that chooses how to draw, filled in
+# as character classes declaring ``draw_prompt`` are defined.
+DRAW_PROMPTS: dict[type["BaseCharacter"], str] = {}
+
+
 class BaseCharacter(ABC):
     """Abstract base class for all Bang characters."""
 
@@ -22,6 +27,15 @@ class BaseCharacter(ABC):
     range_modifier: int = 0
     distance_modifier: int = 0
     starting_health: int = 4
+    # Name of the prompt asking the player how to draw. The engine pauses the
+    # turn before the draw phase of characters that set it, and the server
+    # sends the prompt registered under this name.
+    draw_prompt: ClassVar[str | None] = None
+
+    def __init_subclass__(cls, **kwargs: object) -> None:
+        super().__init_subclass__(**kwargs)
+        if cls.draw_prompt is not None:
+            DRAW_PROMPTS[cls] = cls.draw_prompt
 
     @abstractmethod
     def ability(self, gm: "GameManagerProtocol", player: "Player", **_: object) -> bool:
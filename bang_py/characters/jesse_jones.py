@@ -18,6 +18,7 @@ class JesseJones(BaseCharacter):
         "player's hand instead of the deck."
     )
     starting_health = 4
+    draw_prompt = "jesse_jones"
 
     def ability(self, gm: "GameManagerProtocol", player: "Player", **_: object) -> bool:
         player.metadata.abilities.add(JesseJones)
@@ -15,6 +15,7 @@ class JoseDelgado(BaseCharacter):
     name = "Jose Delgado"
     description = "You may discard a blue card to draw two cards."
     starting_health = 4
+    draw_prompt = "jose_delgado"
 
     def ability(self, gm: "GameManagerProtocol", player: "Player", **_: object) -> bool:
         player.metadata.abilities.add(JoseDelgado)
@@ -18,6 +18,7 @@ class KitCarlson(BaseCharacter):
         " two to keep and put the other back on top."
     )
     starting_health = 4
+    draw_prompt = "kit_carlson"
 
     def ability(self, gm: "GameManagerProtocol", player: "Player", **_: object) -> bool:
         player.metadata.abilities.add(KitCarlson)
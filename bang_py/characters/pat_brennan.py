@@ -17,6 +17,7 @@ class PatBrennan(BaseCharacter):
         "During phase 1 of your turn, you may draw a card in play instead of from the deck."
     )
     starting_health = 4
+    draw_prompt = "pat_brennan"
 
     def ability(self, gm: "GameManagerProtocol", player: "Player", **_: object) -> bool:
         player.metadata.abilities.add(PatBrennan)
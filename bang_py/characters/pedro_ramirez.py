@@ -18,6 +18,7 @@ class PedroRamirez(BaseCharacter):
         "pile instead of drawing."
     )
     starting_health = 4
+    draw_prompt = "pedro_ramirez"
 
     def ability(self, gm: "GameManagerProtocol", player: "Player", **_: object) -> bool:
         player.metadata.abilities.add(PedroRamirez)
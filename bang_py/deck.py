@@ -10,11 +10,18 @@ from .cards.card import BaseCard
 
 
 class Deck:
-    """Simple deck of cards supporting drawing."""
+    """Simple deck of cards supporting drawing.
 
-    def __init__(self, cards: Iterable[BaseCard] | None = None) -> None:
+    Shuffles use ``rng`` so a game can own its random state; a private
+    :class:`random.Random` is created when none is given.
+    """
+
+    def __init__(
+        self, cards: Iterable[BaseCard] | None = None, rng: random.Random | None = None
+    ) -> None:
+        self.rng = rng if rng is not None else random.Random()
         card_list = list(cards) if cards else []
-        random.shuffle(card_list)
+        self.rng.shuffle(card_list)
         self.cards: deque[BaseCard] = deque(card_list)
 
     def draw(self) -> BaseCard | None:
@@ -42,7 +49,7 @@ class Deck:
     def shuffle(self) -> None:
         """Shuffle the deck in-place."""
         card_list = list(self.cards)
-        random.shuffle(card_list)
+        self.rng.shuffle(card_list)
         self.cards = deque(card_list)
 
     def __len__(self) -> int:
@@ -121,34 +121,41 @@ EXPANSION_CARDS = {
 }
 
 
-def _generate_suits(count: int) -> list[str]:
+def _generate_suits(count: int, rng: random.Random) -> list[str]:
     """Return a shuffled list of suits with nearly even distribution."""
     base = count // 4
     extra = count % 4
     suits_pool: list[str] = []
     for i, suit in enumerate(["Hearts", "Diamonds", "Clubs", "Spades"]):
         suits_pool.extend([suit] * (base + (1 if i < extra else 0)))
-    random.shuffle(suits_pool)
+    rng.shuffle(suits_pool)
     return suits_pool
 
 
-def create_standard_deck(expansions: Iterable[str] | None = None) -> Deck:
+def create_standard_deck(
+    expansions: Iterable[str] | None = None, rng: random.Random | None = None
+) -> Deck:
     """Return a Deck built with cards using a balanced suit distribution.
 
     Parameters
     ----------
     expansions:
         Iterable of expansion names to include additional cards.
+    rng:
+        Random generator used for suits, ranks and the deck order. The
+        returned deck keeps it for later reshuffles.
     """
+    if rng is None:
+        rng = random.Random()
     card_counts = CARD_COUNTS[:]
     if expansions:
         for exp in expansions:
             card_counts.extend(EXPANSION_CARDS.get(exp, []))
 
     total = sum(c for _, c in card_counts)
-    suits = _generate_suits(total)
+    suits = _generate_suits(total, rng)
     ranks = list(range(1, 14)) * (total // 13 + 1)
-    random.shuffle(ranks)
+    rng.shuffle(ranks)
 
     cards: list[BaseCard] = []
     idx = 0
@@ -159,4 +166,4 @@ def create_standard_deck(expansions: Iterable[str] | None = None) -> Deck:
             cards.append(card_cls(suit=suit, rank=rank))
             idx += 1
 
-    return Deck(cards)
+    return Deck(cards, rng)
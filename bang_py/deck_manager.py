@@ -28,6 +28,7 @@ class DeckManagerMixin:
 
     deck: Deck | None
     expansions: list[str]
+    rng: random.Random
     _players: list["Player"]
     discard_pile: list[BaseCard]
     event_flags: EventFlags
@@ -39,13 +40,16 @@ class DeckManagerMixin:
         if self.deck is None:
             if not self.expansions:
                 self.expansions.append("dodge_city")
-            self.deck = create_standard_deck(self.expansions)
+            self.deck = create_standard_deck(self.expansions, self.rng)
+        else:
+            self.deck.rng = self.rng
         self.event_flags = {}
 
     def add_player(self: GameManagerProtocol, player: "Player") -> None:
         """Add a player to the game and record the game reference."""
         player.metadata.game = self
         self._players.append(player)
+        self.invalidate_distances()
         if player.character is not None:
             player.character.ability(self, player)
 
@@ -57,6 +61,7 @@ class DeckManagerMixin:
         idx = self._players.index(player)
         self._players.pop(idx)
         player.metadata.game = None
+        self.invalidate_distances()
         self._reindex_turn_order(idx)
         if not self.turn_order:
             self.current_turn = 0
@@ -134,9 +139,9 @@ class DeckManagerMixin:
 
     def _deal_roles_and_characters(self: GameManagerProtocol) -> None:
         role_classes = self._build_role_deck()
-        random.shuffle(role_classes)
+        self.rng.shuffle(role_classes)
         char_deck = [cls() for cls in self._build_character_deck()]
-        random.shuffle(char_deck)
+        self.rng.shuffle(char_deck)
         for player in self._players:
             player.role = role_classes.pop()()
             choices = [char_deck.pop(), char_deck.pop()]
@@ -0,0 +1,112 @@
+"""Cached distances between seated players.
+
+Working out one distance means collecting the living players, finding both
+seats and summing the equipment modifiers of both players, and target
+validation does this for every candidate. :class:`DistanceCache` keeps the
+all-pairs distance matrix of the living players and only rebuilds it after
+:meth:`DistanceCache.invalidate`. The game calls that when a player dies, is
+revived, joins or leaves, or changes equipment or character. The event flags
+that alter distances are part of the cache key, so setting them needs no
+explicit invalidation.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # pragma: no cover - imported for type checking
+    from .game_manager_protocol import GameManagerProtocol
+    from .player import Player
+
+# Event flags that change seat distances or equipment modifiers.
+_FLAG_KEYS = ("ambush", "lasso")
+
+
+class DistanceCache:
+    """All-pairs distance matrix for the living players of one game."""
+
+    __slots__ = ("_flags", "_ambush", "_seats", "_alive", "_distances", "_range_bonus")
+
+    def __init__(self) -> None:
+        self._flags: tuple[object, ...] | None = None
+        self._ambush = False
+        self._seats: dict[int, int] = {}
+        self._alive: list[Player] = []
+        self._distances: list[list[int]] = []
+        self._range_bonus: list[int] = []
+
+    def invalidate(self) -> None:
+        """Discard the matrix so it is rebuilt on the next lookup."""
+        self._flags = None
+
+    def _refresh(self, game: GameManagerProtocol) -> None:
+        flags = game.event_flags
+        key = tuple([flags.get(name) for name in _FLAG_KEYS])
+        if key != self._flags:
+            self._rebuild(game)
+            self._flags = key
+
+    def _rebuild(self, game: GameManagerProtocol) -> None:
+        alive = [p for p in game._players if p.is_alive()]
+        count = len(alive)
+        ambush = self._ambush = bool(game.event_flags.get("ambush"))
+        range_bonus = [p.range_bonus for p in alive]
+        distance_bonus = [p.distance_bonus for p in alive]
+        distances = []
+        for i in range(count):
+            row = []
+            for j in range(count):
+                seat = 1 if ambush else min(abs(i - j), count - abs(i - j))
+                row.append(max(1, seat + distance_bonus[j] - range_bonus[i]))
+            distances.append(row)
+        self._seats = {id(p): i for i, p in enumerate(alive)}
+        self._alive = alive
+        self._distances = distances
+        self._range_bonus = range_bonus
+
+    def _ignores_equipment(self, game: GameManagerProtocol, player: Player) -> bool:
+        """Return ``True`` if ``player`` ignores other players' equipment now."""
+        if not (player.metadata.ignore_others_equipment and game.turn_order):
+            return False
+        order = game.turn_order
+        return game._players[order[game.current_turn % len(order)]] is player
+
+    def distance(self, game: GameManagerProtocol, player: Player, other: Player) -> int | None:
+        """Return the distance from ``player`` to ``other``.
+
+        ``None`` is returned if either player is not a living member of
+        ``game``.
+        """
+        self._refresh(game)
+        seats = self._seats
+        i = seats.get(id(player))
+        j = seats.get(id(other))
+        if i is None or j is None:
+            return None
+        if self._ignores_equipment(game, player):
+            count = len(self._alive)
+            seat = 1 if self._ambush else min(abs(i - j), count - abs(i - j))
+            return max(1, seat - self._range_bonus[i])
+        return self._distances[i][j]
+
+    def targets(
+        self, game: GameManagerProtocol, player: Player, max_distance: int | None = None
+    ) -> list[Player]:
+        """Return living opponents within ``max_distance`` of ``player``.
+
+        ``max_distance`` defaults to the attack range of ``player``. Players
+        that are not alive or not seated in ``game`` have no targets.
+        """
+        self._refresh(game)
+        i = self._seats.get(id(player))
+        if i is None:
+            return []
+        limit = player.attack_range if max_distance is None else max_distance
+        alive = self._alive
+        if self._ignores_equipment(game, player):
+            return [t for t in alive if t is not player and player.distance_to(t) <= limit]
+        row = self._distances[i]
+        return [t for j, t in enumerate(alive) if j != i and row[j] <= limit]
+
+
+__all__ = ["DistanceCache"]
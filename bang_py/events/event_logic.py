@@ -21,6 +21,7 @@ class EventLogicMixin:
     current_event: EventCard | None
     event_flags: EventFlags
     expansions: list[str]
+    rng: random.Random
     deck: Deck | None
     discard_pile: list[Any]
     _players: list[Any]
@@ -44,7 +45,7 @@ class EventLogicMixin:
             self.event_deck = self._prepare_fistful_deck()
         elif self.event_deck:
             deck_list = list(self.event_deck)
-            random.shuffle(deck_list)
+            self.rng.shuffle(deck_list)
             self.event_deck = deque(deck_list)
 
     def _prepare_high_noon_deck(self: GameManagerProtocol) -> deque[EventCard] | None:
@@ -55,7 +56,7 @@ class EventLogicMixin:
             final = next((c for c in deck_list if c.name == "High Noon"), None)
             if final:
                 deck_list.remove(final)
-                random.shuffle(deck_list)
+                self.rng.shuffle(deck_list)
                 deck_list.append(final)
             deck = deque(deck_list)
         return cast(deque[EventCard] | None, deck)
@@ -68,7 +69,7 @@ class EventLogicMixin:
             final = next((c for c in deck_list if c.name == "A Fistful of Cards"), None)
             if final:
                 deck_list.remove(final)
-                random.shuffle(deck_list)
+                self.rng.shuffle(deck_list)
                 deck_list.append(final)
             deck = deque(deck_list)
         return cast(deque[EventCard] | None, deck)
@@ -2,25 +2,32 @@
 
 from __future__ import annotations
 
+import random
 from dataclasses import dataclass, field
 from collections.abc import Callable, Iterable, Sequence
 from collections import deque
-from typing import cast, override
+from typing import TYPE_CHECKING, Any, cast, override
 
 from .ability_dispatch import AbilityDispatchMixin
+from .action_log import ActionLog, logged, new_seed
 from .card_handlers import CardHandlersMixin
 from .cards.card import BaseCard
 from .deck import Deck
 from .deck_manager import DeckManagerMixin
+from .distance import DistanceCache
 from .event_flags import EventFlags
 from .events.event_decks import EventCard
 from .events.event_hooks import EventHooksMixin
 from .events.event_logic import EventLogicMixin
 from .general_store import GeneralStoreMixin
 from .game_manager_protocol import GameManagerProtocol
+from .legal_actions import LegalActionsMixin
 from .player import Player
 from .turn_phases import TurnPhasesMixin
 
+if TYPE_CHECKING:  # pragma: no cover - imported for type checking
+    from .snapshot import GameSnapshot
+
 
 @dataclass(slots=True)
 class GameManager(
@@ -30,6 +37,7 @@ class GameManager(
     EventLogicMixin,
     CardHandlersMixin,
     GeneralStoreMixin,
+    LegalActionsMixin,
     TurnPhasesMixin,
 ):
     """Coordinate game state, players and turn progression."""
@@ -46,6 +54,13 @@ class GameManager(
     first_eliminated: Player | None = None
     sheriff_turns: int = 0
     phase: str = "draw"
+    # Seed for ``rng``; every shuffle in the game draws from ``rng`` so a
+    # seeded game is reproducible and independent of the global RNG.
+    seed: int | None = None
+    rng: random.Random = field(default_factory=random.Random, repr=False)
+    # Commands applied to the game, recorded when a log is given. A seed is
+    # chosen for recorded games created without one so they can be replayed.
+    action_log: ActionLog | None = field(default=None, repr=False)
 
     # General Store state
     general_store_cards: list[BaseCard] | None = None
@@ -72,16 +87,114 @@ class GameManager(
     play_phase_listeners: list[Callable[[Player], None]] = field(default_factory=list)
     _card_handlers: dict = field(default_factory=dict, init=False, repr=False)
     _duel_counts: dict | None = field(default=None, init=False, repr=False)
+    # Set while ``legal_actions`` runs the card play checks, which must then
+    # leave the game unchanged.
+    _listing_actions: bool = field(default=False, init=False, repr=False)
+    _distances: DistanceCache = field(default_factory=DistanceCache, init=False, repr=False)
 
     @property
     def players(self) -> Sequence[Player]:
         """Players in turn order as a read-only sequence."""
         return tuple(self._players)
 
+    def invalidate_distances(self) -> None:
+        """Discard cached distances after seating, health or equipment changes."""
+        self._distances.invalidate()
+
+    def players_in_range(self, player: Player, max_distance: int | None = None) -> list[Player]:
+        """Return living opponents of ``player`` within ``max_distance``.
+
+        ``max_distance`` defaults to the attack range of ``player``.
+        """
+        gm: GameManagerProtocol = cast(GameManagerProtocol, self)
+        return self._distances.targets(gm, player, max_distance)
+
     def prompt_new_identity(self, player: Player) -> bool:
         """Return True if the player opts to switch characters."""
         return True
 
+    @logged
+    def set_auto_miss(self, player: Player, enabled: bool) -> None:
+        """Choose whether Missed! cards are played automatically for ``player``."""
+        player.metadata.auto_miss = enabled
+
+    # ------------------------------------------------------------------
+    # Logged commands
+    @logged
+    def add_player(self, player: Player) -> None:
+        """Add a player to the game and record the game reference."""
+        super(GameManager, self).add_player(player)
+
+    @logged
+    def remove_player(self, player: Player) -> None:
+        """Remove ``player`` from the game and update turn order."""
+        super(GameManager, self).remove_player(player)
+
+    @logged
+    def start_game(self, deal_roles: bool = True) -> None:
+        """Begin the game and deal starting hands."""
+        super(GameManager, self).start_game(deal_roles)
+
+    @logged
+    def draw_card(self, player: Player, num: int = 1) -> None:
+        """Draw ``num`` cards for ``player`` applying event modifiers."""
+        super(GameManager, self).draw_card(player, num)
+
+    @logged
+    def draw_phase(self, player: Player, **choices: Any) -> None:
+        """Execute the draw phase for ``player``."""
+        super(GameManager, self).draw_phase(player, **choices)
+
+    @logged
+    def play_phase(self, player: Player) -> None:
+        """Open the play phase for ``player``."""
+        super(GameManager, self).play_phase(player)
+
+    @logged
+    def play_card(self, player: Player, card: BaseCard, target: Player | None = None) -> None:
+        """Play ``card`` from ``player`` against ``target`` if allowed."""
+        super(GameManager, self).play_card(player, card, target)
+
+    @logged
+    def discard_card(self, player: Player, card: BaseCard) -> None:
+        """Discard ``card`` from ``player`` and process event effects."""
+        super(GameManager, self).discard_card(player, card)
+
+    @logged
+    def end_turn(self) -> None:
+        """Finish the current player's turn and advance to the next."""
+        super(GameManager, self).end_turn()
+
+    @logged
+    def chuck_wengam_ability(self, player: Player) -> None:
+        """Lose 1 life to draw 2 cards."""
+        super(GameManager, self).chuck_wengam_ability(player)
+
+    @logged
+    def doc_holyday_ability(self, player: Player, indices: list[int] | None = None) -> None:
+        """Discard two cards to gain a free Bang!."""
+        super(GameManager, self).doc_holyday_ability(player, indices)
+
+    @logged
+    def sid_ketchum_ability(self, player: Player, indices: list[int] | None = None) -> bool:
+        """Discard two cards to regain one life point."""
+        return super(GameManager, self).sid_ketchum_ability(player, indices)
+
+    @logged
+    def uncle_will_ability(self, player: Player, card: BaseCard) -> bool:
+        """Play ``card`` as a General Store once per turn."""
+        return super(GameManager, self).uncle_will_ability(player, card)
+
+    @logged
+    def vera_custer_copy(self, player: Player, target: Player) -> None:
+        """Copy ``target``'s ability for the turn."""
+        super(GameManager, self).vera_custer_copy(player, target)
+
+    @logged
+    def open_general_store(self, player: Player, card: BaseCard) -> list[str]:
+        """Discard ``card`` and deal the General Store for ``player``."""
+        return super(GameManager, self).open_general_store(player, card)
+
     # ------------------------------------------------------------------
     # Protocol wrappers
     def initialize_main_deck(self) -> None:
@@ -99,6 +212,20 @@ class GameManager(
         gm: GameManagerProtocol = cast(GameManagerProtocol, self)
         gm._register_card_handlers(groups)
 
+    def snapshot(self) -> GameSnapshot:
+        """Return a :class:`~bang_py.snapshot.GameSnapshot` of this game."""
+        from .snapshot import snapshot
+
+        return snapshot(self)
+
+    @classmethod
+    def restore(cls, snap: GameSnapshot) -> GameManager:
+        """Create a new game in the state captured by ``snap``."""
+        from .snapshot import restore
+
+        return restore(snap)
+
+    @logged
     def start_general_store(self, player: Player) -> list[str]:
         """Deal cards for the General Store and establish the pick order."""
         gm: GameManagerProtocol = cast(GameManagerProtocol, self)
@@ -112,6 +239,7 @@ class GameManager(
         gm._set_general_store_order(player)
         return [c.card_name for c in cards]
 
+    @logged
     def general_store_pick(self, player: Player, index: int) -> bool:
         """Allow ``player`` to take a card from the General Store."""
         gm: GameManagerProtocol = cast(GameManagerProtocol, self)
@@ -137,12 +265,14 @@ class GameManager(
         """Advance to the next player's turn."""
         super(GameManager, self)._advance_turn()
 
+    @logged
     def pat_brennan_draw(
         self, player: Player, target: Player | None = None, card: str | None = None
     ) -> bool:
         """Handle Pat Brennan's draw ability."""
         return super(GameManager, self).pat_brennan_draw(player, target, card)
 
+    @logged
     def ricochet_shoot(self, player: Player, target: Player, card_name: str) -> bool:
         """Discard a Bang! to shoot at ``card_name`` in front of ``target``."""
         return super(GameManager, self).ricochet_shoot(player, target, card_name)
@@ -190,6 +320,13 @@ class GameManager(
 
     def __post_init__(self) -> None:
         """Initialize decks and register card handlers."""
+        if self.action_log is not None and self.seed is None:
+            self.seed = new_seed()
+        if self.seed is not None:
+            self.rng.seed(self.seed)
         self.initialize_main_deck()
         self.initialize_event_deck()
         self.register_card_handlers()
+        if self.action_log is not None:
+            self.action_log.seed = self.seed
+            self.action_log.expansions = list(self.expansions)
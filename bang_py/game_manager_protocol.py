@@ -5,16 +5,20 @@ from __future__ import annotations
 from collections import deque
 from collections.abc import Callable, Iterable, Sequence
 from typing import Protocol, TYPE_CHECKING
+import random
 
 from .event_flags import EventFlags
 
 if TYPE_CHECKING:  # pragma: no cover - imported for type checking
+    from .action_log import ActionLog
     from .cards.card import BaseCard
     from .cards.bang import BangCard
     from .cards.roles import BaseRole
     from .characters.base import BaseCharacter
     from .deck import Deck
+    from .distance import DistanceCache
     from .events.event_decks import EventCard
+    from .legal_actions import LegalAction
     from .player import Player
 
 
@@ -25,6 +29,8 @@ class GameManagerProtocol(Protocol):
     discard_pile: list[BaseCard]
     event_flags: EventFlags
     expansions: list[str]
+    rng: random.Random
+    action_log: ActionLog | None
     _players: list[Player]
     turn_order: list[int]
     current_turn: int
@@ -48,6 +54,8 @@ class GameManagerProtocol(Protocol):
     game_over_listeners: list[Callable[[str], None]]
     _card_handlers: dict
     _duel_counts: dict | None
+    _listing_actions: bool
+    _distances: DistanceCache
 
     @property
     def players(self) -> Sequence[Player]:
@@ -87,6 +95,16 @@ class GameManagerProtocol(Protocol):
     def remove_player(self, player: Player) -> None:
         """Remove ``player`` from the game."""
 
+    def start_game(self, deal_roles: bool = True) -> None:
+        """Begin the game and deal starting hands."""
+
+    def invalidate_distances(self) -> None:
+        """Discard cached distances so they are recomputed on next use."""
+
+    def players_in_range(self, player: Player, max_distance: int | None = None) -> list[Player]:
+        """Return living opponents of ``player`` within ``max_distance``."""
+        ...
+
     def draw_card(self, player: Player, num: int = 1) -> None:
         """Draw ``num`` cards for ``player``."""
 
@@ -156,6 +174,9 @@ class GameManagerProtocol(Protocol):
     def start_general_store(self, player: Player) -> list[str]:
         """Deal cards for the General Store and set pick order."""
 
+    def open_general_store(self, player: Player, card: BaseCard) -> list[str]:
+        """Discard ``card`` and deal the General Store for ``player``."""
+
     def general_store_pick(self, player: Player, index: int) -> bool:
         """Let ``player`` take the card at ``index`` from the General Store."""
 
@@ -183,6 +204,12 @@ class GameManagerProtocol(Protocol):
     def doc_holyday_ability(self, player: Player, indices: list[int] | None = None) -> None:
         """Discard two cards to gain a free Bang!."""
 
+    def sid_ketchum_ability(self, player: Player, indices: list[int] | None = None) -> bool:
+        """Discard two cards to regain one life point."""
+
+    def set_auto_miss(self, player: Player, enabled: bool) -> None:
+        """Choose whether Missed! cards are played automatically for ``player``."""
+
     def vera_custer_copy(self, player: Player, target: Player) -> None:
         """Copy ``target``'s ability for the turn."""
 
@@ -335,6 +362,20 @@ class GameManagerProtocol(Protocol):
     def _can_play_bang(self, player: Player) -> bool:
         """Return ``True`` if ``player`` may play a Bang!."""
 
+    def legal_actions(self, player: Player) -> list[LegalAction]:
+        """Return every card play and ability use ``player`` may make now."""
+        ...
+
+    def _card_targets(
+        self, player: Player, card: BaseCard, opponents: list[Player]
+    ) -> list[Player | None]:
+        """Return the candidate targets for playing ``card``."""
+        ...
+
+    def _ability_actions(self, player: Player, opponents: list[Player]) -> list[LegalAction]:
+        """Return the character abilities ``player`` can use in the play phase."""
+        ...
+
     def _dispatch_play(self, player: Player, card: BaseCard, target: Player | None) -> None:
         """Dispatch ``card`` to its handler."""
 
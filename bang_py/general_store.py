@@ -33,6 +33,14 @@ class GeneralStoreMixin:
         self._set_general_store_order(player)
         return [c.card_name for c in cards]
 
+    def open_general_store(
+        self: GameManagerProtocol, player: "Player", card: BaseCard
+    ) -> list[str]:
+        """Discard ``card`` from ``player``'s hand and deal the General Store."""
+        player.hand.remove(card)
+        self.discard_pile.append(card)
+        return self.start_general_store(player)
+
     def _deal_general_store_cards(self: GameManagerProtocol) -> list[BaseCard]:
         alive = [p for p in self._players if p.is_alive()]
         cards: list[BaseCard] = []
@@ -0,0 +1,176 @@
+"""Enumerate the card plays and ability uses available to a player."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from .cards import (
+    BrawlCard,
+    CanCanCard,
+    CatBalouCard,
+    ConestogaCard,
+    DerringerCard,
+    JailCard,
+    KnifeCard,
+    MissedCard,
+    PanicCard,
+    PepperboxCard,
+    PunchCard,
+    RagTimeCard,
+    SpringfieldCard,
+    TequilaCard,
+    WhiskyCard,
+)
+from .cards.card import BaseCard
+from .characters import ChuckWengam, DocHolyday, SidKetchum, UncleWill, VeraCuster
+from .game_manager_protocol import GameManagerProtocol
+from .helpers import has_ability
+
+if TYPE_CHECKING:  # pragma: no cover - imported for type checking
+    from .player import Player
+
+# Handlers that resolve a card without a chosen target.
+_UNTARGETED_HANDLERS = frozenset(
+    {"_handler_self_game", "_handler_self_player_game", "_handler_target_or_self_player_game"}
+)
+# Target rule bits, computed once per card class by ``_target_rules``.
+_COSTLY = 1  # discards another card from the hand as its cost
+_STEALS = 2  # takes or discards a card from its target
+_MELEE = 4  # fizzles beyond distance 1
+_RANGED = 8  # fizzles beyond the attack range
+_EQUIPMENT = 16  # is put into play in front of a player
+_JAIL = 32  # is put into play in front of an opponent
+_MISSED = 64  # can be played as Bang! by Calamity Janet
+
+_RULE_CLASSES: tuple[tuple[int, tuple[type[BaseCard], ...]], ...] = (
+    (_COSTLY, (BrawlCard, RagTimeCard, SpringfieldCard, TequilaCard, WhiskyCard)),
+    (_STEALS, (CanCanCard, CatBalouCard, ConestogaCard, PanicCard, RagTimeCard)),
+    (_MELEE, (DerringerCard, KnifeCard, PunchCard)),
+    (_RANGED, (PepperboxCard,)),
+    (_JAIL, (JailCard,)),
+    (_MISSED, (MissedCard,)),
+)
+_RULES_BY_CLASS: dict[type[BaseCard], int] = {}
+
+
+def _target_rules(cls: type[BaseCard]) -> int:
+    """Return the target rule bits of card class ``cls``."""
+    rules = _RULES_BY_CLASS.get(cls)
+    if rules is None:
+        rules = _EQUIPMENT if cls.card_type in {"blue", "green"} else 0
+        for bit, classes in _RULE_CLASSES:
+            if issubclass(cls, classes):
+                rules |= bit
+        _RULES_BY_CLASS[cls] = rules
+    return rules
+
+
+@dataclass(slots=True, frozen=True)
+class LegalAction:
+    """A card play or ability use the game accepts from a player.
+
+    Card plays set ``card`` and its ``card_index`` in the hand. Ability uses
+    set ``ability`` to the name used by the ``use_ability`` message and may
+    also spend a card. ``target`` is ``None`` when nothing is targeted.
+    """
+
+    card: BaseCard | None = None
+    card_index: int | None = None
+    target: Player | None = None
+    ability: str | None = None
+
+
+class LegalActionsMixin:
+    """Mixin listing legal moves using the card play checks of the game."""
+
+    def legal_actions(self: GameManagerProtocol, player: "Player") -> list[LegalAction]:
+        """Return every card play and ability use ``player`` may make now.
+
+        The card checks are the ones :meth:`play_card` applies, together with
+        the target requirements cards would otherwise enforce by silently
+        doing nothing: a card to take from the target, a card to pay the cost
+        and the reach of close-range weapons. Draw phase choices are offered
+        through prompts and are not listed.
+        """
+        if not player.is_alive():
+            return []
+        opponents = [p for p in self._players if p is not player and p.is_alive()]
+        actions: list[LegalAction] = []
+        self._listing_actions = True
+        try:
+            for index, card in enumerate(player.hand):
+                if not self._check_event_restrictions(player, card):
+                    continue
+                for target in self._card_targets(player, card, opponents):
+                    if (
+                        self._run_card_play_checks(player, card, target)
+                        and self._check_target_restrictions(player, card, target)
+                        and not (
+                            self._is_bang(player, card, target) and not self._can_play_bang(player)
+                        )
+                    ):
+                        actions.append(LegalAction(card, index, target))
+        finally:
+            self._listing_actions = False
+        actions.extend(self._ability_actions(player, opponents))
+        return actions
+
+    def _card_targets(
+        self: GameManagerProtocol, player: "Player", card: BaseCard, opponents: list["Player"]
+    ) -> list["Player | None"]:
+        """Return the candidate targets for playing ``card``."""
+        rules = _target_rules(type(card))
+        if rules & _COSTLY and len(player.hand) < 2:
+            return []
+        targets: list["Player | None"] = []
+        handler = self._card_handlers.get(type(card))
+        if handler is None:
+            if rules & _MISSED and player.metadata.play_missed_as_bang:
+                reach = player.attack_range
+                targets.extend(t for t in opponents if player.distance_to(t) <= reach)
+            if rules & _EQUIPMENT:
+                targets.extend(opponents if rules & _JAIL else [player])
+            return targets
+        if getattr(handler, "__name__", "") in _UNTARGETED_HANDLERS:
+            return [None]
+        reach = player.attack_range if rules & _RANGED else 1
+        for target in opponents:
+            if rules & _STEALS and not (target.hand or target.equipment):
+                continue
+            if rules & (_MELEE | _RANGED) and player.distance_to(target) > reach:
+                continue
+            targets.append(target)
+        return targets
+
+    def _ability_actions(
+        self: GameManagerProtocol, player: "Player", opponents: list["Player"]
+    ) -> list[LegalAction]:
+        """Return the character abilities ``player`` can use in the play phase."""
+        actions: list[LegalAction] = []
+        meta = player.metadata
+        if has_ability(player, ChuckWengam) and player.health > 1:
+            actions.append(LegalAction(ability="chuck_wengam"))
+        if has_ability(player, DocHolyday) and not meta.doc_used and len(player.hand) >= 2:
+            actions.append(LegalAction(ability="doc_holyday"))
+        if (
+            has_ability(player, SidKetchum)
+            and len(player.hand) >= 2
+            and player.health < player.max_health
+        ):
+            actions.append(LegalAction(ability="sid_ketchum"))
+        if isinstance(player.character, VeraCuster) and meta.vera_copy is None:
+            actions.extend(
+                LegalAction(target=t, ability="vera_custer")
+                for t in opponents
+                if t.character is not None
+            )
+        if has_ability(player, UncleWill) and not meta.uncle_used:
+            actions.extend(
+                LegalAction(card, index, ability="uncle_will")
+                for index, card in enumerate(player.hand)
+            )
+        return actions
+
+
+__all__ = ["LegalAction", "LegalActionsMixin"]
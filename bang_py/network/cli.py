@@ -7,15 +7,28 @@ import asyncio
 import logging
 from collections.abc import Sequence
 
-from .server import BangServer
+from ..simulation.bots import POLICIES
+from .outbox import DEFAULT_MAX_LAG, DEFAULT_QUEUE_SIZE
+from .persistence import DEFAULT_FSYNC, DEFAULT_SNAPSHOT_EVERY, FSYNC_POLICIES
+from .server import (
+    DEFAULT_MAX_WAITING,
+    MAX_MESSAGE_SIZE,
+    MAX_SPECTATORS,
+    RECONNECT_GRACE,
+    ROOM_TTL,
+    TURN_TIMEOUT,
+    WRITE_LIMIT,
+    BangServer,
+)
+from .supervisor import Supervisor
 from .token_utils import generate_join_token
 
 
 def main(argv: Sequence[str] | None = None) -> None:
     """Parse ``argv`` and launch the Bang websocket server.
 
-    When ``--show-token`` is supplied, the function prints a join token for the
-    configured server and exits without starting it.
+    When ``--show-token`` is supplied, the function prints a join token for each
+    hosted room and exits without starting the server.
     """
 
     parser = argparse.ArgumentParser(description="Start Bang websocket server")
@@ -24,6 +37,130 @@ def main(argv: Sequence[str] | None = None) -> None:
     parser.add_argument("--certfile", help="Path to SSL certificate", default=None)
     parser.add_argument("--keyfile", help="Path to SSL key", default=None)
     parser.add_argument("--token-key", help="Key for join tokens", default=None)
+    parser.add_argument(
+        "--rooms",
+        type=int,
+        default=1,
+        help="Number of game rooms to host in this process",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help="Spread the rooms over this many worker processes (0 hosts them in this one)",
+    )
+    parser.add_argument(
+        "--broadcast-window",
+        type=float,
+        default=0.0,
+        help="Seconds to coalesce state broadcasts (0 flushes once per loop tick)",
+    )
+    parser.add_argument(
+        "--no-compact",
+        dest="compact",
+        action="store_false",
+        help="Send state frames to every client as JSON text",
+    )
+    parser.add_argument(
+        "--no-compression",
+        dest="compression",
+        action="store_false",
+        help="Disable permessage-deflate compression",
+    )
+    parser.add_argument(
+        "--max-message-size",
+        type=int,
+        default=MAX_MESSAGE_SIZE,
+        help="Largest message in bytes accepted from a client",
+    )
+    parser.add_argument(
+        "--write-limit",
+        type=int,
+        default=WRITE_LIMIT,
+        help="Bytes buffered per client before sends wait for it",
+    )
+    parser.add_argument(
+        "--send-queue",
+        type=int,
+        default=DEFAULT_QUEUE_SIZE,
+        help="Messages that may wait for a client before it is disconnected",
+    )
+    parser.add_argument(
+        "--max-lag",
+        type=float,
+        default=DEFAULT_MAX_LAG,
+        help="Seconds a message may wait for a client before it is disconnected",
+    )
+    parser.add_argument(
+        "--auto-start",
+        action="store_true",
+        help="Start each room's game as soon as the table is full",
+    )
+    parser.add_argument(
+        "--reconnect-grace",
+        type=float,
+        default=RECONNECT_GRACE,
+        help="Seconds a dropped client's seat is held for it to resume (0 disables)",
+    )
+    parser.add_argument(
+        "--turn-timeout",
+        type=float,
+        default=TURN_TIMEOUT,
+        help="Seconds a player has to end their turn before the room ends it (0 disables)",
+    )
+    parser.add_argument(
+        "--turn-bot",
+        choices=sorted(POLICIES),
+        default=None,
+        help="Bot policy playing a turn that ran out of time before it is ended",
+    )
+    parser.add_argument(
+        "--room-ttl",
+        type=float,
+        default=ROOM_TTL,
+        help="Seconds a finished or abandoned room is kept before it is torn down (0 keeps it)",
+    )
+    parser.add_argument(
+        "--max-spectators",
+        type=int,
+        default=MAX_SPECTATORS,
+        help="Clients that may watch each room without a seat",
+    )
+    parser.add_argument(
+        "--max-waiting",
+        type=int,
+        default=DEFAULT_MAX_WAITING,
+        help="Clients that may wait in the matchmaking queue",
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        default=None,
+        help="Serve Prometheus metrics over HTTP on this port",
+    )
+    parser.add_argument(
+        "--metrics-interval",
+        type=float,
+        default=0.0,
+        help="Log a metrics summary every this many seconds (0 disables)",
+    )
+    parser.add_argument(
+        "--state-dir",
+        default=None,
+        help="Persist rooms in this directory and restore them on startup",
+    )
+    parser.add_argument(
+        "--fsync",
+        choices=FSYNC_POLICIES,
+        default=DEFAULT_FSYNC,
+        help="When room journals are forced to disk",
+    )
+    parser.add_argument(
+        "--snapshot-every",
+        type=int,
+        default=DEFAULT_SNAPSHOT_EVERY,
+        help="Commands journaled between room snapshots",
+    )
     parser.add_argument(
         "--show-token",
         action="store_true",
@@ -31,23 +168,60 @@ def main(argv: Sequence[str] | None = None) -> None:
     )
     args = parser.parse_args(argv)
 
-    server = BangServer(
-        host=args.host,
-        port=args.port,
-        certfile=args.certfile,
-        keyfile=args.keyfile,
-        token_key=args.token_key,
-    )
+    options = {
+        "host": args.host,
+        "port": args.port,
+        "certfile": args.certfile,
+        "keyfile": args.keyfile,
+        "token_key": args.token_key,
+        "broadcast_window": args.broadcast_window,
+        "compact": args.compact,
+        "compression": args.compression,
+        "max_message_size": args.max_message_size,
+        "write_limit": args.write_limit,
+        "send_queue_size": args.send_queue,
+        "max_send_lag": args.max_lag,
+        "auto_start": args.auto_start,
+        "metrics_port": args.metrics_port,
+        "metrics_interval": args.metrics_interval,
+        "reconnect_grace": args.reconnect_grace,
+        "max_spectators": args.max_spectators,
+        "max_waiting": args.max_waiting,
+        "turn_timeout": args.turn_timeout,
+        "turn_bot": args.turn_bot,
+        "room_ttl": args.room_ttl,
+        "state_dir": args.state_dir,
+        "fsync": args.fsync,
+        "snapshot_every": args.snapshot_every,
+    }
+    if args.workers > 0:
+        supervisor = Supervisor(args.workers, rooms=args.rooms, **options)
+        if args.show_token:
+            for code in supervisor.codes:
+                logging.info(
+                    generate_join_token(
+                        supervisor.host, supervisor.port, code, supervisor.token_key
+                    )
+                )
+            return
+        asyncio.run(supervisor.start())
+        return
+
+    server = BangServer(**options)
+    # Restored rooms count towards the number of rooms to host.
+    for _ in range(args.rooms - len(server.rooms)):
+        server.create_room()
 
     if args.show_token:
-        logging.info(
-            generate_join_token(
-                server.host,
-                server.port,
-                server.room_code,
-                server.token_key,
+        for code in server.rooms:
+            logging.info(
+                generate_join_token(
+                    server.host,
+                    server.port,
+                    code,
+                    server.token_key,
+                )
             )
-        )
         return
 
     asyncio.run(server.start())
@@ -10,11 +10,19 @@ import asyncio
 import json
 import logging
 import ssl
+from typing import Any, cast
 
 from websockets.asyncio.client import connect
+from websockets.exceptions import ConnectionClosedError
+from websockets.typing import Subprotocol
 
+from .compact import SUBPROTOCOL, decode_frame
+from .state import StateFrame, StateTracker
 from .token_utils import parse_join_token
 
+# Seconds between attempts to resume a dropped session.
+RECONNECT_DELAY = 1.0
+
 
 async def main(
     uri: str = "ws://localhost:8765",
@@ -23,6 +31,9 @@ async def main(
     cafile: str | None = None,
     token: str | None = None,
     token_key: str | None = None,
+    compact: bool = True,
+    compression: bool = True,
+    spectate: bool = False,
 ) -> None:
     """Connect to a ``bang-server`` instance and handle basic interaction.
 
@@ -43,12 +54,24 @@ async def main(
         derived from the token.
     token_key:
         Key used to decrypt ``token``. If omitted, the default key is used.
+    compact:
+        Offer the compact state encoding. Binary messages are decoded with
+        :func:`~bang_py.network.compact.decode_frame`.
+    compression:
+        Offer permessage-deflate compression to the server.
+    spectate:
+        Watch the game without taking a seat. Only the public state is
+        received and nothing is sent back except resync requests.
 
     Workflow
     --------
     The client connects to ``uri`` and exchanges the room code and player name.
     Incoming messages are parsed as JSON when possible and printed to the
-    console along with the list of players.
+    console along with the list of players. State frames are applied to a
+    :class:`StateTracker`, and a ``resync`` is requested when a frame's
+    version leaves a gap. The client asks for a session when joining; if the connection
+    drops it reconnects and resumes its seat until the server's grace period
+    runs out.
     """
 
     if token:
@@ -61,33 +84,83 @@ async def main(
         if cafile:
             ssl_ctx.load_verify_locations(cafile)
 
-    async with connect(uri, ssl=ssl_ctx) as websocket:
-        prompt = await websocket.recv()
-        logging.info(prompt)
-        await websocket.send(room_code)
-        response = await websocket.recv()
-        if response != "Enter your name:":
-            logging.info(response)
+    subprotocols = [Subprotocol(SUBPROTOCOL)] if compact else None
+    loop = asyncio.get_running_loop()
+    # Session token issued by the server and the time until which it holds
+    # the seat after the connection dropped.
+    session: str | None = None
+    grace = 0.0
+    deadline: float | None = None
+    while True:
+        try:
+            async with connect(
+                uri,
+                ssl=ssl_ctx,
+                subprotocols=subprotocols,
+                compression="deflate" if compression else None,
+            ) as websocket:
+                prompt = await websocket.recv()
+                logging.info(prompt)
+                await websocket.send(room_code)
+                response = await websocket.recv()
+                if response != "Enter your name:":
+                    logging.info(response)
+                    return
+                if spectate:
+                    await websocket.send(json.dumps({"spectate": True}))
+                elif session is None:
+                    logging.info(response)
+                    if name is None:
+                        name = input()
+                    await websocket.send(json.dumps({"name": name, "session": True}))
+                else:
+                    await websocket.send(json.dumps({"resume": session}))
+                join_msg = await websocket.recv()
+                logging.info(join_msg)
+                if not isinstance(join_msg, str) or not join_msg.startswith(
+                    ("Joined", "Resumed", "Watching")
+                ):
+                    return
+                deadline = None
+
+                tracker = StateTracker()
+                async for message in websocket:
+                    data: Any
+                    if isinstance(message, bytes):
+                        data = decode_frame(message)
+                    else:
+                        try:
+                            data = json.loads(message)
+                        except json.JSONDecodeError:
+                            data = message
+                    if isinstance(data, dict):
+                        if "session" in data:
+                            session = str(data["session"])
+                            grace = float(data.get("grace", 0))
+                            continue
+                        for msg in data.get("messages", []):
+                            logging.info(msg)
+                        if data.get("type") != "state":
+                            logging.info("Players: %s", data.get("players"))
+                            continue
+                        state = tracker.apply(cast(StateFrame, data))
+                        if state is None:
+                            await websocket.send(json.dumps({"action": "resync"}))
+                            continue
+                        logging.info("Players: %s", state["players"])
+                    else:
+                        logging.info(str(data))
             return
-        logging.info(response)
-        if name is None:
-            name = input()
-        await websocket.send(name)
-        join_msg = await websocket.recv()
-        logging.info(join_msg)
-
-        async for message in websocket:
-            try:
-                data = json.loads(message)
-            except json.JSONDecodeError:
-                data = message
-            if isinstance(data, dict):
-                msg = data.get("message")
-                if msg:
-                    logging.info(msg)
-                logging.info("Players: %s", data.get("players"))
-            else:
-                logging.info(str(data))
+        except (OSError, ConnectionClosedError) as exc:
+            if session is None:
+                raise
+            if deadline is None:
+                deadline = loop.time() + grace
+            if loop.time() >= deadline:
+                logging.info("Connection lost: %s", exc)
+                return
+            logging.info("Connection lost, reconnecting: %s", exc)
+            await asyncio.sleep(RECONNECT_DELAY)
 
 
 def run() -> None:
@@ -101,6 +174,23 @@ def run() -> None:
     parser.add_argument("--cafile", default=None)
     parser.add_argument("--token", default=None)
     parser.add_argument("--token-key", default=None)
+    parser.add_argument(
+        "--no-compact",
+        dest="compact",
+        action="store_false",
+        help="Request state frames as JSON text",
+    )
+    parser.add_argument(
+        "--no-compression",
+        dest="compression",
+        action="store_false",
+        help="Disable permessage-deflate compression",
+    )
+    parser.add_argument(
+        "--spectate",
+        action="store_true",
+        help="Watch the game without taking a seat",
+    )
     args = parser.parse_args()
 
     asyncio.run(
@@ -111,6 +201,9 @@ def run() -> None:
             args.cafile,
             args.token,
             args.token_key,
+            args.compact,
+            args.compression,
+            args.spectate,
         )
     )
 
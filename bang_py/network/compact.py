@@ -0,0 +1,261 @@
+"""Compact encoding of state frames negotiated as a websocket subprotocol.
+
+Clients that offer :data:`SUBPROTOCOL` during the websocket handshake receive
+state frames as binary messages instead of JSON text. The compact form uses
+one-letter keys, lists players as positional arrays and replaces card,
+character, role and event names with their index in :data:`NAMES`, a
+registry both sides build from the game's own card classes. The subprotocol
+name includes a digest of the registry, so a client built from a different
+card set does not match and falls back to plain JSON.
+
+Everything other than state frames, such as prompts and errors, is still
+sent as JSON text. Like :mod:`bang_py.network.state` this module has no
+websocket dependency.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from collections.abc import Sequence
+from typing import Any, cast
+
+from .. import cards, characters
+from ..events.event_decks import EVENT_CARD_MAP
+from .messages import ActionPayload
+from .state import PlayerState, StateFrame
+
+
+def _registry_names() -> tuple[str, ...]:
+    """Return every card, character, role and event name in a stable order."""
+    names: set[str] = set(EVENT_CARD_MAP)
+    for module, attr in ((cards, "card_name"), (characters, "name")):
+        for export in module.__all__:
+            value = getattr(getattr(module, export), attr, None)
+            if isinstance(value, str) and value:
+                names.add(value)
+    return tuple(sorted(names))
+
+
+# Names replaced by their index on the wire.
+NAMES = _registry_names()
+NAME_IDS = {name: idx for idx, name in enumerate(NAMES)}
+# Websocket subprotocol selecting this encoding for the registry above.
+SUBPROTOCOL = "bang.compact." + hashlib.sha1("\n".join(NAMES).encode()).hexdigest()[:8]
+
+# Short keys of player fields inside a compact ``players_diff``.
+_PLAYER_SHORT = {
+    "name": "n",
+    "health": "h",
+    "role": "r",
+    "character": "c",
+    "equipment": "q",
+}
+_PLAYER_LONG = {short: key for key, short in _PLAYER_SHORT.items()}
+_NAMED_FIELDS = frozenset({"role", "character"})
+
+
+def _name_id(name: str) -> int | str:
+    return NAME_IDS.get(name, name)
+
+
+def _name(value: int | str) -> str:
+    return NAMES[value] if isinstance(value, int) else value
+
+
+def _names(values: Sequence[str]) -> list[int | str]:
+    return [NAME_IDS.get(v, v) for v in values]
+
+
+def _from_ids(values: Sequence[int | str]) -> list[str]:
+    return [NAMES[v] if isinstance(v, int) else v for v in values]
+
+
+def _pack_field(key: str, value: object) -> object:
+    if key in _NAMED_FIELDS:
+        return _name_id(cast(str, value))
+    if key == "equipment":
+        return _names(cast(list[str], value))
+    return value
+
+
+def _unpack_field(key: str, value: Any) -> object:
+    if key in _NAMED_FIELDS:
+        return _name(value)
+    if key == "equipment":
+        return _from_ids(value)
+    return value
+
+
+def _pack_players(players: list[PlayerState]) -> list[list[object]]:
+    return [
+        [
+            p["name"],
+            p["health"],
+            _name_id(p["role"]),
+            _name_id(p["character"]),
+            _names(p["equipment"]),
+        ]
+        for p in players
+    ]
+
+
+def _unpack_players(players: list[list[Any]]) -> list[PlayerState]:
+    names = NAMES
+    return [
+        {
+            "name": name,
+            "health": health,
+            "role": names[role] if isinstance(role, int) else role,
+            "character": names[character] if isinstance(character, int) else character,
+            "equipment": [names[v] if isinstance(v, int) else v for v in equipment],
+        }
+        for name, health, role, character, equipment in players
+    ]
+
+
+def _pack_diff(diff: dict[str, dict[str, object]]) -> dict[str, dict[str, object]]:
+    return {
+        idx: {_PLAYER_SHORT[key]: _pack_field(key, value) for key, value in fields.items()}
+        for idx, fields in diff.items()
+    }
+
+
+def _unpack_diff(diff: dict[str, dict[str, Any]]) -> dict[str, dict[str, object]]:
+    result: dict[str, dict[str, object]] = {}
+    for idx, fields in diff.items():
+        unpacked: dict[str, object] = {}
+        for short, value in fields.items():
+            key = _PLAYER_LONG[short]
+            unpacked[key] = _unpack_field(key, value)
+        result[idx] = unpacked
+    return result
+
+
+def _pack_actions(actions: list[ActionPayload]) -> list[list[object]]:
+    """Return card plays as ``[index, target?]``, abilities as ``[name, index, target]``.
+
+    Ending the turn is an empty list.
+    """
+    packed: list[list[object]] = []
+    for action in actions:
+        data = cast(dict[str, Any], action)
+        if data["action"] == "end_turn":
+            entry: list[object] = []
+        elif data["action"] == "play_card":
+            entry = [data["card_index"]]
+            if "target" in data:
+                entry.append(data["target"])
+        else:
+            entry = [data["ability"], data.get("card_index"), data.get("target")]
+        packed.append(entry)
+    return packed
+
+
+def _unpack_actions(actions: list[list[Any]]) -> list[ActionPayload]:
+    result: list[dict[str, Any]] = []
+    for entry in actions:
+        if not entry:
+            result.append({"action": "end_turn"})
+            continue
+        first = entry[0]
+        if isinstance(first, str):
+            data = {"action": "use_ability", "ability": first}
+            if entry[1] is not None:
+                data["card_index"] = entry[1]
+            if entry[2] is not None:
+                data["target"] = entry[2]
+            result.append(data)
+        elif len(entry) > 1:
+            result.append({"action": "play_card", "card_index": first, "target": entry[1]})
+        else:
+            result.append({"action": "play_card", "card_index": first})
+    return cast(list[ActionPayload], result)
+
+
+class CompactEncoder:
+    """Encode the frames of one broadcast in the compact format.
+
+    Like :class:`~bang_py.network.state.FrameEncoder`, values shared by all
+    recipients are converted once and reused by identity.
+    """
+
+    def __init__(self) -> None:
+        # Values are kept alongside their conversion so ids are not reused.
+        self._packed: dict[int, tuple[object, object]] = {}
+
+    def _shared(self, value: Any, pack: Any) -> object:
+        cached = self._packed.get(id(value))
+        if cached is None:
+            cached = (value, pack(value))
+            self._packed[id(value)] = cached
+        return cached[1]
+
+    def encode(self, frame: StateFrame) -> bytes:
+        """Return ``frame`` as a compact binary message."""
+        out: dict[str, object] = {"v": frame["version"]}
+        if frame.get("keyframe"):
+            out["k"] = 1
+        if "base" in frame:
+            out["b"] = frame["base"]
+        if "players" in frame:
+            out["p"] = self._shared(frame["players"], _pack_players)
+        if "players_diff" in frame:
+            out["d"] = self._shared(frame["players_diff"], _pack_diff)
+        if "hand" in frame:
+            out["h"] = _names(frame["hand"])
+        if "hand_splice" in frame:
+            at, count, inserted = cast(tuple[int, int, list[str]], frame["hand_splice"])
+            out["s"] = [at, count, _names(inserted)]
+        if "character" in frame:
+            out["c"] = _name_id(frame["character"])
+        if "event" in frame:
+            out["e"] = _name_id(frame["event"])
+        if "actions" in frame:
+            out["a"] = _pack_actions(frame["actions"])
+        if "messages" in frame:
+            out["m"] = frame["messages"]
+        return json.dumps(out, separators=(",", ":")).encode()
+
+
+def encode_frame(frame: StateFrame) -> bytes:
+    """Return ``frame`` as a compact binary message."""
+    return CompactEncoder().encode(frame)
+
+
+def decode_frame(data: bytes | str) -> StateFrame:
+    """Return the :class:`StateFrame` carried by a compact message."""
+    raw: dict[str, Any] = json.loads(data)
+    frame: StateFrame = {"type": "state", "version": raw["v"]}
+    if raw.get("k"):
+        frame["keyframe"] = True
+    if "b" in raw:
+        frame["base"] = raw["b"]
+    if "p" in raw:
+        frame["players"] = _unpack_players(raw["p"])
+    if "d" in raw:
+        frame["players_diff"] = _unpack_diff(raw["d"])
+    if "h" in raw:
+        frame["hand"] = _from_ids(raw["h"])
+    if "s" in raw:
+        at, count, inserted = raw["s"]
+        frame["hand_splice"] = [at, count, _from_ids(inserted)]
+    if "c" in raw:
+        frame["character"] = _name(raw["c"])
+    if "e" in raw:
+        frame["event"] = _name(raw["e"])
+    if "a" in raw:
+        frame["actions"] = _unpack_actions(raw["a"])
+    if "m" in raw:
+        frame["messages"] = raw["m"]
+    return frame
+
+
+__all__ = [
+    "NAMES",
+    "NAME_IDS",
+    "SUBPROTOCOL",
+    "CompactEncoder",
+    "decode_frame",
+    "encode_frame",
+]
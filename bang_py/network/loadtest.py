@@ -0,0 +1,407 @@
+"""Load test a local :class:`BangServer` with simulated websocket clients.
+
+The server runs in a child process so its CPU time can be measured apart from
+the clients. Every room is filled with asyncio clients that perform the normal
+room-code and name handshake, answer start-of-turn prompts with a default
+choice and pick one of the legal actions sent with each state frame.
+
+The reported latency is measured from sending an action to receiving the next
+state frame, which is the broadcast the action caused as long as only the
+current player acts.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import json
+import multiprocessing
+import random
+import socket
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from typing import Any, cast
+
+from websockets import connect
+from websockets.exceptions import ConnectionClosed
+from websockets.typing import Subprotocol
+
+from .compact import SUBPROTOCOL, decode_frame
+from .server import BangServer
+from .state import StateFrame, StateTracker
+from .token_utils import DEFAULT_TOKEN_KEY
+
+try:  # pragma: no cover - unavailable on Windows
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None  # type: ignore[assignment]
+
+POLICIES = ("random", "first")
+# Seconds to wait for the broadcast caused by an action before giving up on it.
+ACTION_TIMEOUT = 2.0
+# Cards a random client plays in one turn before it ends the turn.
+MAX_PLAYS_PER_TURN = 8
+# Chance that a random client ends its turn while it still has cards to play.
+END_TURN_CHANCE = 0.2
+END_TURN: dict[str, object] = {"action": "end_turn"}
+
+
+@dataclass(slots=True)
+class LoadTestStats:
+    """Counters collected by the simulated clients of one run."""
+
+    clients: int = 0
+    connected: int = 0
+    actions: int = 0
+    timeouts: int = 0
+    errors: int = 0
+    messages_sent: int = 0
+    messages_received: int = 0
+    bytes_received: int = 0
+    latencies: list[float] = field(default_factory=list)
+    elapsed: float = 0.0
+    server_cpu: float | None = None
+    last_message: float = 0.0
+
+    def percentile(self, q: float) -> float:
+        """Return the ``q`` quantile of the latencies in seconds."""
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def report(self) -> str:
+        """Return a human readable summary of the run."""
+        elapsed = self.elapsed or 1.0
+        lines = [
+            f"clients         {self.connected}/{self.clients} connected",
+            f"duration        {self.elapsed:.1f}s",
+            f"actions         {self.actions} ({self.actions / elapsed:.1f}/s), "
+            f"{self.timeouts} without broadcast",
+            f"latency p50     {self.percentile(0.5) * 1000:.2f}ms",
+            f"latency p99     {self.percentile(0.99) * 1000:.2f}ms",
+            f"messages sent   {self.messages_sent / elapsed:.1f}/s",
+            f"messages recv   {self.messages_received / elapsed:.1f}/s "
+            f"({self.bytes_received / elapsed / 1024:.1f} KiB/s)",
+        ]
+        if self.server_cpu is not None:
+            lines.append(
+                f"server cpu      {self.server_cpu:.2f}s ({self.server_cpu / elapsed:.0%})"
+            )
+        if self.errors:
+            lines.append(f"errors          {self.errors}")
+        return "\n".join(lines)
+
+
+@dataclass(slots=True)
+class _Run:
+    """Settings shared by the clients of one run."""
+
+    uri: str
+    policy: str
+    compact: bool
+    deadline: float
+    stats: LoadTestStats
+
+
+def _prompt_reply(data: dict[str, Any]) -> dict[str, object] | None:
+    """Return the default answer to a start-of-turn prompt."""
+    prompt = data.get("prompt")
+    if prompt == "vera":
+        options = data.get("options") or []
+        if not options:
+            return None
+        return {"action": "use_ability", "ability": "vera_custer", "target": options[0]["index"]}
+    if prompt in ("jesse_jones", "jose_delgado", "pat_brennan"):
+        return {"action": "use_ability", "ability": prompt}
+    if prompt == "kit_carlson":
+        return {"action": "use_ability", "ability": "kit_carlson", "discard": 0}
+    if prompt == "pedro_ramirez":
+        return {"action": "use_ability", "ability": "pedro_ramirez", "use_discard": False}
+    return None
+
+
+def choose_action(
+    actions: list[dict[str, Any]], policy: str, rng: random.Random, plays: int
+) -> dict[str, Any]:
+    """Return the action to send from the legal ``actions`` of a state frame.
+
+    ``plays`` is the number of actions already sent this turn. The ``first``
+    policy plays the first legal card until only ending the turn is left, the
+    ``random`` policy picks any legal card and ends the turn now and then.
+    """
+    playable = [a for a in actions if a.get("action") != "end_turn"]
+    if not playable or plays >= MAX_PLAYS_PER_TURN:
+        return END_TURN
+    if policy == "first":
+        return playable[0]
+    if rng.random() < END_TURN_CHANCE:
+        return END_TURN
+    return rng.choice(playable)
+
+
+def _decode(message: str | bytes) -> Any:
+    if isinstance(message, bytes):
+        return decode_frame(message)
+    try:
+        return json.loads(message)
+    except json.JSONDecodeError:
+        return message
+
+
+async def run_client(run: _Run, code: str, name: str, rng: random.Random) -> None:
+    """Join room ``code`` as ``name`` and play until the run ends."""
+    stats = run.stats
+    loop = asyncio.get_running_loop()
+    subprotocols = [Subprotocol(SUBPROTOCOL)] if run.compact else None
+    async with connect(run.uri, subprotocols=subprotocols) as ws:
+
+        async def send(payload: dict[str, object]) -> None:
+            await ws.send(json.dumps(payload))
+            stats.messages_sent += 1
+
+        await ws.recv()
+        await ws.send(code)
+        await ws.recv()
+        await ws.send(name)
+        joined = await ws.recv()
+        if not isinstance(joined, str) or not joined.startswith("Joined"):
+            stats.errors += 1
+            return
+        stats.connected += 1
+
+        tracker = StateTracker()
+        sent_at: float | None = None
+        plays = 0
+        while (remaining := run.deadline - loop.time()) > 0:
+            try:
+                message = await asyncio.wait_for(ws.recv(), min(remaining, ACTION_TIMEOUT))
+            except TimeoutError:
+                if sent_at is not None and loop.time() - sent_at >= ACTION_TIMEOUT:
+                    # The action changed nothing; end the turn so the game moves on.
+                    stats.timeouts += 1
+                    sent_at = loop.time()
+                    plays = MAX_PLAYS_PER_TURN
+                    await send(END_TURN)
+                continue
+            now = loop.time()
+            stats.messages_received += 1
+            stats.bytes_received += len(message)
+            stats.last_message = now
+            data = _decode(message)
+            if not isinstance(data, dict):
+                continue
+            if "prompt" in data:
+                reply = _prompt_reply(data)
+                if reply is not None:
+                    await send(reply)
+                continue
+            if data.get("type") != "state":
+                continue
+            state = tracker.apply(cast(StateFrame, data))
+            if state is None:
+                await send({"action": "resync"})
+                continue
+            if sent_at is not None:
+                stats.latencies.append(now - sent_at)
+                sent_at = None
+            actions = cast(list[dict[str, Any]], state.get("actions") or [])
+            if not actions:
+                plays = 0
+                continue
+            await send(choose_action(actions, run.policy, rng, plays))
+            stats.actions += 1
+            plays += 1
+            sent_at = loop.time()
+
+
+async def _stop_when_idle(run: _Run, idle: float) -> None:
+    """Shorten the run once no client has received anything for ``idle`` seconds."""
+    loop = asyncio.get_running_loop()
+    run.stats.last_message = loop.time()
+    while loop.time() < run.deadline:
+        await asyncio.sleep(min(idle, 0.5))
+        if loop.time() - run.stats.last_message > idle:
+            run.deadline = loop.time()
+
+
+async def run_clients(
+    uri: str,
+    codes: Sequence[str],
+    players: int,
+    duration: float,
+    *,
+    policy: str = "random",
+    compact: bool = True,
+    seed: int | None = None,
+    idle: float = 5.0,
+) -> LoadTestStats:
+    """Fill every room in ``codes`` with ``players`` clients and play for ``duration``."""
+    loop = asyncio.get_running_loop()
+    stats = LoadTestStats(clients=len(codes) * players)
+    run = _Run(uri, policy, compact, loop.time() + duration, stats)
+    seeds = random.Random(seed)
+    clients = [
+        run_client(run, code, f"Bot{i}", random.Random(seeds.getrandbits(32)))
+        for code in codes
+        for i in range(players)
+    ]
+    start = loop.time()
+    watcher = asyncio.create_task(_stop_when_idle(run, idle))
+    results = await asyncio.gather(*clients, return_exceptions=True)
+    watcher.cancel()
+    stats.elapsed = loop.time() - start
+    for result in results:
+        if isinstance(result, ConnectionClosed | OSError):
+            stats.errors += 1
+        elif isinstance(result, BaseException):
+            raise result
+    return stats
+
+
+def _serve(host: str, port: int, codes: Sequence[str], players: int, compact: bool) -> None:
+    """Run a server hosting ``codes`` until the process is terminated."""
+    server = BangServer(
+        host=host,
+        port=port,
+        room_code=codes[0],
+        max_players=players,
+        token_key=DEFAULT_TOKEN_KEY,
+        compact=compact,
+        auto_start=True,
+    )
+    for code in codes[1:]:
+        server.create_room(code)
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(server.start())
+
+
+def _free_port(host: str) -> int:
+    with socket.socket() as sock:
+        sock.bind((host, 0))
+        return int(sock.getsockname()[1])
+
+
+def _wait_for_port(host: str, port: int, timeout: float = 10.0) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            with socket.create_connection((host, port), timeout=0.5):
+                return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.05)
+
+
+def _children_cpu() -> float | None:
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+def run_loadtest(
+    rooms: int = 4,
+    players: int = 4,
+    duration: float = 10.0,
+    *,
+    policy: str = "random",
+    compact: bool = True,
+    seed: int | None = None,
+    idle: float = 5.0,
+    host: str = "127.0.0.1",
+    port: int = 0,
+) -> LoadTestStats:
+    """Start a server process, run the clients against it and return the stats.
+
+    Parameters
+    ----------
+    rooms:
+        Number of rooms to fill.
+    players:
+        Clients per room. Each room starts its game once it is full.
+    duration:
+        Seconds to play before the clients disconnect.
+    policy:
+        ``"random"`` to pick random legal actions, ``"first"`` to always play
+        the first legal card.
+    compact:
+        Offer the compact state encoding.
+    seed:
+        Seed for the clients' choices.
+    idle:
+        Stop early once no client has received a message for this many
+        seconds, for example because every game has finished.
+    host, port:
+        Address the server listens on. Port ``0`` picks a free port.
+    """
+    if policy not in POLICIES:
+        raise ValueError(f"unknown policy: {policy}")
+    codes = [f"lt{i:04d}" for i in range(rooms)]
+    port = port or _free_port(host)
+    cpu_before = _children_cpu()
+    ctx = multiprocessing.get_context("spawn")
+    process = ctx.Process(target=_serve, args=(host, port, codes, players, compact))
+    process.start()
+    try:
+        _wait_for_port(host, port)
+        stats = asyncio.run(
+            run_clients(
+                f"ws://{host}:{port}",
+                codes,
+                players,
+                duration,
+                policy=policy,
+                compact=compact,
+                seed=seed,
+                idle=idle,
+            )
+        )
+    finally:
+        process.terminate()
+        process.join()
+    cpu_after = _children_cpu()
+    if cpu_before is not None and cpu_after is not None:
+        stats.server_cpu = cpu_after - cpu_before
+    return stats
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    """Entry point for the ``bang-loadtest`` console script."""
+    parser = argparse.ArgumentParser(description="Load test a local Bang server")
+    parser.add_argument("--rooms", type=int, default=4, help="Number of rooms")
+    parser.add_argument("--players", type=int, default=4, help="Clients per room")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds to play")
+    parser.add_argument("--policy", choices=POLICIES, default="random")
+    parser.add_argument("--seed", type=int, help="Seed for the clients' choices")
+    parser.add_argument(
+        "--idle", type=float, default=5.0, help="Stop after this many seconds without messages"
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=0, help="Server port, 0 picks a free one")
+    parser.add_argument(
+        "--no-compact", action="store_true", help="Use JSON state frames instead of compact"
+    )
+    args = parser.parse_args(argv)
+    stats = run_loadtest(
+        args.rooms,
+        args.players,
+        args.duration,
+        policy=args.policy,
+        compact=not args.no_compact,
+        seed=args.seed,
+        idle=args.idle,
+        host=args.host,
+        port=args.port,
+    )
+    print(stats.report())
+
+
+__all__ = ["LoadTestStats", "choose_action", "main", "run_clients", "run_loadtest"]
+
+
+if __name__ == "__main__":  # pragma: no cover - manual execution
+    main()
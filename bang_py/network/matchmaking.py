@@ -0,0 +1,127 @@
+"""Queue of players waiting to be seated at a table of their choice.
+
+Clients that do not know a room code may ask the server to find them a
+table by giving a table size and a set of expansions. Each distinct choice
+has its own first-in first-out queue. As soon as one of them holds enough
+players for a full table, they are taken out together and the server opens
+a room for them.
+
+Every queue is a dictionary used as an ordered set, so a client that gives
+up is removed in constant time. The total number of waiting players is
+capped, and since table sizes and expansions are validated, the number of
+queues is bounded too. Like :mod:`bang_py.network.state` this module has no
+websocket dependency.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+from ..deck_factory import EXPANSION_CARDS
+
+# Table sizes the role deck supports.
+MIN_TABLE_SIZE = 3
+MAX_TABLE_SIZE = 7
+# Players that may wait in all queues together.
+DEFAULT_MAX_WAITING = 1000
+
+TableKey = tuple[int, tuple[str, ...]]
+
+
+def table_key(players: object, expansions: object) -> TableKey | None:
+    """Return the queue for a table of ``players`` with ``expansions``.
+
+    ``None`` is returned when the size is out of range or an expansion is
+    unknown.
+    """
+    if not isinstance(players, int) or isinstance(players, bool):
+        return None
+    if not MIN_TABLE_SIZE <= players <= MAX_TABLE_SIZE:
+        return None
+    if not isinstance(expansions, list) or not all(e in EXPANSION_CARDS for e in expansions):
+        return None
+    return players, tuple(sorted(set(expansions)))
+
+
+@dataclass(slots=True, eq=False)
+class Ticket:
+    """A player waiting for a table.
+
+    ``seat`` is resolved with the code of the room opened for the table.
+    """
+
+    name: str
+    key: TableKey
+    session: bool = False
+    seat: asyncio.Future[str] = field(
+        default_factory=lambda: asyncio.get_running_loop().create_future()
+    )
+
+
+class MatchQueue:
+    """Waiting players grouped by the table they asked for."""
+
+    def __init__(self, max_waiting: int = DEFAULT_MAX_WAITING) -> None:
+        self.max_waiting = max_waiting
+        self._queues: dict[TableKey, dict[Ticket, None]] = {}
+        self._waiting = 0
+
+    def __len__(self) -> int:
+        return self._waiting
+
+    @property
+    def is_full(self) -> bool:
+        """Return ``True`` when no further players may wait."""
+        return self._waiting >= self.max_waiting
+
+    def waiting(self, key: TableKey) -> int:
+        """Return how many players wait for a ``key`` table."""
+        return len(self._queues.get(key, ()))
+
+    def add(self, ticket: Ticket) -> list[Ticket] | None:
+        """Queue ``ticket`` and return a full table of tickets once there is one.
+
+        The returned tickets, the oldest first, are no longer queued.
+
+        Raises:
+            OverflowError: If the queue is full.
+        """
+        if self.is_full:
+            raise OverflowError("matchmaking queue is full")
+        queue = self._queues.setdefault(ticket.key, {})
+        queue[ticket] = None
+        self._waiting += 1
+        players = ticket.key[0]
+        if len(queue) < players:
+            return None
+        table = list(queue)[:players]
+        self._discard(ticket.key, table)
+        return table
+
+    def remove(self, ticket: Ticket) -> None:
+        """Drop ``ticket`` if it is still waiting."""
+        self._discard(ticket.key, (ticket,))
+
+    def _discard(self, key: TableKey, tickets: Iterable[Ticket]) -> None:
+        queue = self._queues.get(key)
+        if queue is None:
+            return
+        for ticket in tickets:
+            if ticket in queue:
+                del queue[ticket]
+                self._waiting -= 1
+        if not queue:
+            del self._queues[key]
+
+
+__all__ = [
+    "DEFAULT_MAX_WAITING",
+    "MAX_TABLE_SIZE",
+    "MIN_TABLE_SIZE",
+    "MatchQueue",
+    "TableKey",
+    "Ticket",
+    "table_key",
+]
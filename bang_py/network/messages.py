@@ -42,6 +42,16 @@ class UseAbilityPayload(TypedDict, total=False):
     enabled: NotRequired[bool]
 
 
+class EndTurnPayload(TypedDict):
+    """Payload ending the sender's turn, like the plain ``end_turn`` message."""
+
+    action: Literal["end_turn"]
+
+
+# Message performing one of the legal actions listed in a state frame.
+ActionPayload = PlayCardPayload | UseAbilityPayload | EndTurnPayload
+
+
 class SetAutoMissPayload(TypedDict):
     """Payload for toggling automatic responses to Bang! cards."""
 
@@ -49,8 +59,20 @@ class SetAutoMissPayload(TypedDict):
     enabled: bool
 
 
+class ResyncPayload(TypedDict):
+    """Payload requesting a full state keyframe."""
+
+    action: Literal["resync"]
+
+
 ClientPayload = (
-    DrawPayload | DiscardPayload | PlayCardPayload | UseAbilityPayload | SetAutoMissPayload
+    DrawPayload
+    | DiscardPayload
+    | PlayCardPayload
+    | UseAbilityPayload
+    | EndTurnPayload
+    | SetAutoMissPayload
+    | ResyncPayload
 )
 
 
@@ -72,7 +94,10 @@ __all__ = [
     "DiscardPayload",
     "PlayCardPayload",
     "UseAbilityPayload",
+    "EndTurnPayload",
+    "ActionPayload",
     "SetAutoMissPayload",
+    "ResyncPayload",
     "ErrorInfo",
     "ErrorPayload",
     "ClientPayload",
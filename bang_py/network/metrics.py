@@ -0,0 +1,236 @@
+"""Counters and histograms describing a running server.
+
+The metrics are plain Python objects updated inline by the rooms and the
+server, so collecting them costs a few additions per message. They can be
+scraped in the Prometheus text exposition format from :func:`serve_metrics`
+on a side port, or written to the log every few seconds by
+:func:`log_metrics`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from bisect import bisect_left
+from collections.abc import Sequence
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds in seconds for message processing and broadcast fan-out.
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5)
+# Upper bounds in seconds for whole games.
+GAME_BUCKETS = (60.0, 300.0, 600.0, 1200.0, 1800.0, 3600.0, 7200.0)
+
+
+def _labels(labels: tuple[tuple[str, str], ...]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{value}"' for key, value in labels) + "}"
+
+
+class Counter:
+    """Monotonically increasing value, optionally split by labels."""
+
+    __slots__ = ("name", "help", "_values")
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str) -> None:
+        self.name = name
+        self.help = documentation
+        self._values: dict[tuple[tuple[str, str], ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        """Add ``amount`` to the value with ``labels``."""
+        key = tuple(sorted(labels.items()))
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        """Return the value with ``labels``."""
+        return self._values.get(tuple(sorted(labels.items())), 0.0)
+
+    def total(self) -> float:
+        """Return the sum over every label combination."""
+        return sum(self._values.values())
+
+    def samples(self) -> list[str]:
+        """Return the exposition lines for this metric."""
+        if not self._values:
+            return [f"{self.name} 0"]
+        return [f"{self.name}{_labels(key)} {value:g}" for key, value in self._values.items()]
+
+
+class Gauge(Counter):
+    """Value that can go up and down."""
+
+    __slots__ = ()
+    kind = "gauge"
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        """Subtract ``amount`` from the value with ``labels``."""
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: str) -> None:
+        """Replace the value with ``labels``."""
+        self._values[tuple(sorted(labels.items()))] = value
+
+    def remove(self, **labels: str) -> None:
+        """Stop reporting the value with ``labels``."""
+        self._values.pop(tuple(sorted(labels.items())), None)
+
+
+class Histogram:
+    """Distribution of observed values in cumulative buckets."""
+
+    __slots__ = ("name", "help", "buckets", "_counts", "count", "sum")
+    kind = "histogram"
+
+    def __init__(
+        self, name: str, documentation: str, buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> None:
+        self.name = name
+        self.help = documentation
+        self.buckets = tuple(buckets)
+        # One count per bucket plus the ``+Inf`` bucket, not yet cumulative.
+        self._counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """Record ``value``."""
+        self._counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def samples(self) -> list[str]:
+        """Return the exposition lines for this metric."""
+        lines = []
+        cumulative = 0
+        for bound, count in zip((*self.buckets, "+Inf"), self._counts):
+            cumulative += count
+            le = bound if isinstance(bound, str) else f"{bound:g}"
+            lines.append(f'{self.name}_bucket{{le="{le}"}} {cumulative}')
+        lines.append(f"{self.name}_sum {self.sum:g}")
+        lines.append(f"{self.name}_count {self.count}")
+        return lines
+
+
+class ServerMetrics:
+    """Every metric collected by a :class:`~bang_py.network.server.BangServer`."""
+
+    def __init__(self) -> None:
+        self.rooms = Gauge("bang_rooms", "Rooms hosted by the server")
+        self.idle_rooms = Gauge("bang_idle_rooms", "Rooms whose game is over or that nobody uses")
+        self.rooms_reaped = Counter("bang_rooms_reaped_total", "Idle rooms torn down by reason")
+        self.room_tasks = Gauge("bang_room_tasks", "Live tasks of each room")
+        self.room_queued = Gauge("bang_room_queued_messages", "Messages waiting to be written")
+        self.room_state_bytes = Gauge(
+            "bang_room_state_bytes",
+            "Pickled size of each room's game, a proxy for its memory, sampled a few rooms a sweep",
+        )
+        self.connections = Gauge("bang_connections", "Clients currently seated")
+        self.spectators = Gauge("bang_spectators", "Clients currently spectating")
+        self.matchmaking = Gauge("bang_matchmaking_waiting", "Clients waiting for a table")
+        self.handshakes = Counter(
+            "bang_handshakes_total", "Completed handshakes by outcome (joined or the refusal)"
+        )
+        self.messages = Counter("bang_messages_processed_total", "Client messages by action")
+        self.message_seconds = Histogram(
+            "bang_message_processing_seconds", "Time spent handling one client message"
+        )
+        self.broadcasts = Counter("bang_broadcasts_total", "State broadcasts")
+        self.broadcast_seconds = Histogram(
+            "bang_broadcast_seconds", "Time spent preparing and queuing one broadcast"
+        )
+        self.sent = Counter("bang_messages_sent_total", "Messages written to clients")
+        self.sent_bytes = Counter("bang_sent_bytes_total", "Bytes written to clients")
+        self.send_failures = Counter("bang_send_failures_total", "Writes that failed")
+        self.evictions = Counter(
+            "bang_slow_client_evictions_total", "Clients disconnected for falling behind"
+        )
+        self.games_started = Counter("bang_games_started_total", "Games started")
+        self.turn_timeouts = Counter(
+            "bang_turn_timeouts_total", "Turns ended by the room after running out of time"
+        )
+        self.game_seconds = Histogram(
+            "bang_game_duration_seconds", "Duration of finished games", GAME_BUCKETS
+        )
+
+    def forget_room(self, code: str) -> None:
+        """Drop the per-room values of room ``code``."""
+        for gauge in (self.room_tasks, self.room_queued, self.room_state_bytes):
+            gauge.remove(room=code)
+
+    @property
+    def metrics(self) -> list[Counter | Histogram]:
+        """Return every metric in exposition order."""
+        return [m for m in vars(self).values() if isinstance(m, Counter | Histogram)]
+
+    def render(self) -> str:
+        """Return the metrics in the Prometheus text exposition format."""
+        lines = []
+        for metric in self.metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+    def summary(self) -> str:
+        """Return a one-line digest of the metrics for the log."""
+        parts = []
+        for metric in self.metrics:
+            name = metric.name.removeprefix("bang_")
+            if isinstance(metric, Histogram):
+                mean = metric.sum / metric.count if metric.count else 0.0
+                parts.append(f"{name}={metric.count}/{mean:.6f}")
+            else:
+                parts.append(f"{name}={metric.total():g}")
+        return " ".join(parts)
+
+
+async def _handle_scrape(
+    metrics: ServerMetrics, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+) -> None:
+    try:
+        request = await reader.readline()
+        while (await reader.readline()).strip():
+            pass
+        parts = request.split()
+        if len(parts) >= 2 and parts[0] == b"GET" and parts[1] in (b"/", b"/metrics"):
+            status, content_type = "200 OK", "text/plain; version=0.0.4; charset=utf-8"
+            body = metrics.render().encode()
+        else:
+            status, content_type, body = "404 Not Found", "text/plain", b"not found\n"
+        head = (
+            f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n"
+        )
+        writer.write(head.encode() + body)
+        await writer.drain()
+    except (OSError, asyncio.IncompleteReadError, ValueError) as exc:
+        logger.debug("Metrics request failed: %s", exc)
+    finally:
+        writer.close()
+
+
+async def serve_metrics(metrics: ServerMetrics, host: str, port: int) -> asyncio.Server:
+    """Serve ``metrics`` over HTTP at ``/metrics`` on ``host:port``."""
+    return await asyncio.start_server(
+        lambda reader, writer: _handle_scrape(metrics, reader, writer), host, port
+    )
+
+
+async def log_metrics(metrics: ServerMetrics, interval: float) -> None:
+    """Log :meth:`ServerMetrics.summary` every ``interval`` seconds until cancelled."""
+    while True:
+        await asyncio.sleep(interval)
+        logger.info("Metrics: %s", metrics.summary())
+
+
+__all__ = [
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "ServerMetrics",
+    "log_metrics",
+    "serve_metrics",
+]
@@ -0,0 +1,106 @@
+"""Bounded queue of messages waiting to be written to one client.
+
+Every connection owns an :class:`Outbox` drained by a single writer task, so
+a client that reads slowly only delays its own messages. State frames are
+kept in one slot: queuing a new frame while the previous one is still waiting
+replaces it, so a lagging client skips straight to the latest state instead
+of working through a backlog of stale updates. The room is responsible for
+making the replacement frame apply to the state the client last received.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from time import monotonic
+from typing import cast
+
+# Messages a connection may have waiting before it is considered stalled.
+DEFAULT_QUEUE_SIZE = 64
+# Seconds the oldest waiting message may wait before the client is evicted.
+DEFAULT_MAX_LAG = 10.0
+
+# Placeholder for the position of the pending state frame in the queue.
+_STATE = object()
+
+
+class Outbox:
+    """Outgoing messages of one connection in the order they were queued."""
+
+    __slots__ = ("max_size", "_items", "_state", "_ready", "_closed")
+
+    def __init__(self, max_size: int = DEFAULT_QUEUE_SIZE) -> None:
+        self.max_size = max_size
+        # Queued payloads, or ``_STATE`` for the state slot, with queue times.
+        self._items: deque[tuple[object, float]] = deque()
+        self._state: str | bytes | None = None
+        self._ready = asyncio.Event()
+        self._closed = False
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    @property
+    def has_state(self) -> bool:
+        """Return ``True`` if a state frame is waiting to be written."""
+        return self._state is not None
+
+    @property
+    def closed(self) -> bool:
+        """Return ``True`` once :meth:`close` was called."""
+        return self._closed
+
+    def lag(self) -> float:
+        """Return how many seconds the oldest waiting message has waited."""
+        return monotonic() - self._items[0][1] if self._items else 0.0
+
+    def put(self, payload: str | bytes) -> bool:
+        """Queue ``payload`` and return ``False`` if the outbox is full."""
+        if len(self._items) >= self.max_size:
+            return False
+        self._items.append((payload, monotonic()))
+        self._ready.set()
+        return True
+
+    def put_state(self, payload: str | bytes) -> bool:
+        """Queue state frame ``payload``, replacing a waiting one.
+
+        The replacement keeps the queue position and age of the frame it
+        replaces. Returns ``False`` if the outbox is full.
+        """
+        if self._state is None:
+            if len(self._items) >= self.max_size:
+                return False
+            self._items.append((_STATE, monotonic()))
+            self._ready.set()
+        self._state = payload
+        return True
+
+    def discard_state(self) -> None:
+        """Drop the waiting state frame, if any."""
+        if self._state is not None:
+            self._state = None
+            self._items = deque(item for item in self._items if item[0] is not _STATE)
+
+    def close(self) -> None:
+        """Drop every waiting message and wake the writer so it can stop."""
+        self._closed = True
+        self._items.clear()
+        self._state = None
+        self._ready.set()
+
+    async def get(self) -> str | bytes | None:
+        """Wait for the next message, or return ``None`` once closed."""
+        while not self._items:
+            if self._closed:
+                return None
+            self._ready.clear()
+            await self._ready.wait()
+        payload, _ = self._items.popleft()
+        if payload is _STATE:
+            state, self._state = self._state, None
+            return state
+        return cast(str | bytes, payload)
+
+
+__all__ = ["DEFAULT_MAX_LAG", "DEFAULT_QUEUE_SIZE", "Outbox"]
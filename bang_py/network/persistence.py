@@ -0,0 +1,308 @@
+"""Crash-safe storage of room state.
+
+Every room of a server started with a state directory keeps two files in a
+subdirectory named after its code:
+
+``journal.jsonl``
+    Each command the game logs (see :mod:`bang_py.action_log`) is appended
+    before it runs, so the journal always covers the game up to the command
+    in progress.
+``snapshot.pickle``
+    A :class:`RoomCheckpoint` with the whole room. Every ``snapshot_every``
+    commands, and whenever the seating changes, a new snapshot replaces the
+    old one atomically and the journal starts over.
+
+Restoring a room loads the snapshot and replays the journal on top of it.
+Both files carry a generation number. A journal from an older generation
+than the snapshot was already folded into it and is ignored, which covers a
+crash between writing a snapshot and starting the new journal.
+
+``fsync`` decides when data is forced to disk: after every command
+(``"always"``), at most once per ``fsync_interval`` seconds
+(``"interval"``), or only when a snapshot is written (``"never"``). With
+``"interval"`` a command is synced at the latest ``fsync_interval`` seconds
+after it was journaled, even if no other command follows. Lines are flushed
+to the operating system either way, so only a crash of the whole machine
+can lose commands that were not synced.
+
+Files are written by one writer thread shared by all stores, in the order
+the writes were asked for, so pickling snapshots and waiting for ``fsync``
+do not hold up the event loop. Outside an event loop files are written
+right away, once the writes already handed to the thread are done.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import pickle
+import shutil
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from typing import IO
+
+from ..action_log import Command, decode_command, encode_command
+from ..snapshot import GameSnapshot
+
+logger = logging.getLogger(__name__)
+
+FSYNC_POLICIES = ("always", "interval", "never")
+DEFAULT_FSYNC = "interval"
+DEFAULT_FSYNC_INTERVAL = 1.0
+DEFAULT_SNAPSHOT_EVERY = 256
+
+SNAPSHOT_FILE = "snapshot.pickle"
+JOURNAL_FILE = "journal.jsonl"
+
+# Writes the files of every store, created when the first write is asked for.
+_writer: ThreadPoolExecutor | None = None
+
+
+@dataclass(slots=True, frozen=True)
+class RoomCheckpoint:
+    """Everything needed to bring a room back after a restart.
+
+    ``sessions`` maps the session tokens of seated clients to their seat, so
+    they can resume once the server is back.
+    """
+
+    code: str
+    expansions: tuple[str, ...]
+    max_players: int
+    game: GameSnapshot
+    sessions: tuple[tuple[str, int], ...]
+    game_started: bool
+
+
+def _fsync_dir(directory: Path) -> None:
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:  # pragma: no cover - directories cannot be opened on Windows
+        return
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _log_failure(future: Future[None]) -> None:
+    exc = future.exception()
+    if exc is not None:
+        logger.error("Writing room state failed", exc_info=exc)
+
+
+class RoomStore:
+    """Journal and snapshot files of one room."""
+
+    def __init__(
+        self,
+        directory: str | Path,
+        fsync: str = DEFAULT_FSYNC,
+        fsync_interval: float = DEFAULT_FSYNC_INTERVAL,
+        snapshot_every: int = DEFAULT_SNAPSHOT_EVERY,
+    ) -> None:
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"fsync must be one of {', '.join(FSYNC_POLICIES)}")
+        self.directory = Path(directory)
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self.snapshot_every = snapshot_every
+        self.generation = 0
+        # Commands journaled since the last snapshot.
+        self.pending = 0
+        # Whether a journal was started; ``_journal`` itself is only touched
+        # by the writer thread.
+        self._journaling = False
+        self._journal: IO[str] | None = None
+        self._synced = time.monotonic()
+        self._sync_timer: asyncio.TimerHandle | None = None
+        # The last write handed to the writer thread.
+        self._last: Future[None] | None = None
+
+    @property
+    def snapshot_due(self) -> bool:
+        """Return ``True`` once enough commands were journaled for a new snapshot."""
+        return self.pending >= self.snapshot_every
+
+    def _submit(self, write: Callable[[], None]) -> None:
+        """Run ``write`` on the writer thread, or right away outside an event loop."""
+        global _writer
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            if self._last is not None:
+                self._last.result()
+                self._last = None
+            write()
+            return
+        if _writer is None:
+            _writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="room-store")
+        self._last = _writer.submit(write)
+        self._last.add_done_callback(_log_failure)
+
+    def _cancel_sync_timer(self) -> None:
+        if self._sync_timer is not None:
+            self._sync_timer.cancel()
+            self._sync_timer = None
+
+    def _schedule_sync(self) -> None:
+        """Sync once ``fsync_interval`` seconds passed since the last sync."""
+        if self._sync_timer is not None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        delay = self._synced + self.fsync_interval - time.monotonic()
+        self._sync_timer = loop.call_later(delay, self.sync)
+
+    def append(self, command: Command) -> None:
+        """Journal ``command``."""
+        if not self._journaling:
+            return
+        self.pending += 1
+        sync = self.fsync == "always"
+        if self.fsync == "interval":
+            if time.monotonic() - self._synced >= self.fsync_interval:
+                sync = True
+            else:
+                self._schedule_sync()
+        if sync:
+            self._cancel_sync_timer()
+            self._synced = time.monotonic()
+        self._submit(partial(self._write_line, encode_command(command) + "\n", sync))
+
+    def write_snapshot(self, checkpoint: RoomCheckpoint) -> None:
+        """Replace the snapshot with ``checkpoint`` and start a new journal."""
+        self.generation += 1
+        self.pending = 0
+        self._journaling = True
+        self._cancel_sync_timer()
+        self._synced = time.monotonic()
+        self._submit(partial(self._store_snapshot, self.generation, checkpoint))
+
+    def _write_line(self, line: str, sync: bool) -> None:
+        journal = self._journal
+        if journal is None:
+            return
+        journal.write(line)
+        journal.flush()
+        if sync:
+            os.fsync(journal.fileno())
+
+    def _store_snapshot(self, generation: int, checkpoint: RoomCheckpoint) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp = self.directory / (SNAPSHOT_FILE + ".tmp")
+        with open(tmp, "wb") as handle:
+            pickle.dump((generation, checkpoint), handle, protocol=pickle.HIGHEST_PROTOCOL)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp, self.directory / SNAPSHOT_FILE)
+        _fsync_dir(self.directory)
+
+        if self._journal is not None:
+            self._journal.close()
+        self._journal = open(self.directory / JOURNAL_FILE, "w", encoding="utf-8")
+        self._journal.write(json.dumps({"generation": generation}) + "\n")
+        self._sync_journal()
+
+    def _sync_journal(self) -> None:
+        if self._journal is not None:
+            self._journal.flush()
+            os.fsync(self._journal.fileno())
+
+    def _close_journal(self, sync: bool) -> None:
+        if self._journal is not None:
+            if sync:
+                self._sync_journal()
+            self._journal.close()
+            self._journal = None
+
+    def _remove(self) -> None:
+        self._close_journal(sync=False)
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def load(self) -> tuple[RoomCheckpoint, list[Command]] | None:
+        """Return the stored checkpoint and the commands journaled after it.
+
+        A last journal line cut short by a crash is dropped, since its command
+        never ran to completion on disk either.
+        """
+        try:
+            with open(self.directory / SNAPSHOT_FILE, "rb") as handle:
+                generation, checkpoint = pickle.load(handle)
+        except FileNotFoundError:
+            return None
+        self.generation = generation
+        commands: list[Command] = []
+        try:
+            with open(self.directory / JOURNAL_FILE, encoding="utf-8") as handle:
+                lines = handle.read().splitlines()
+        except FileNotFoundError:
+            lines = []
+        if lines and json.loads(lines[0]).get("generation") == generation:
+            for number, line in enumerate(lines[1:], 2):
+                try:
+                    commands.append(decode_command(line))
+                except (json.JSONDecodeError, ValueError):
+                    if number < len(lines):
+                        raise
+                    logger.warning("Dropping incomplete journal entry in %s", self.directory)
+        return checkpoint, commands
+
+    def sync(self) -> None:
+        """Force journaled commands to disk."""
+        self._cancel_sync_timer()
+        if self._journaling:
+            self._synced = time.monotonic()
+            self._submit(self._sync_journal)
+
+    def close(self) -> None:
+        """Sync and close the journal, keeping the files for a later restore."""
+        self._cancel_sync_timer()
+        if self._journaling:
+            self._journaling = False
+            self._submit(partial(self._close_journal, sync=True))
+
+    def destroy(self) -> None:
+        """Close the journal and delete the files of a room that is gone for good."""
+        self._cancel_sync_timer()
+        self._journaling = False
+        self._submit(self._remove)
+
+
+def stored_rooms(
+    state_dir: str | Path,
+    fsync: str = DEFAULT_FSYNC,
+    fsync_interval: float = DEFAULT_FSYNC_INTERVAL,
+    snapshot_every: int = DEFAULT_SNAPSHOT_EVERY,
+) -> Iterator[tuple[RoomStore, RoomCheckpoint, list[Command]]]:
+    """Yield the store, checkpoint and journal tail of every room in ``state_dir``.
+
+    Directories holding no snapshot are skipped.
+    """
+    root = Path(state_dir)
+    if not root.is_dir():
+        return
+    for directory in sorted(p for p in root.iterdir() if p.is_dir()):
+        store = RoomStore(directory, fsync, fsync_interval, snapshot_every)
+        loaded = store.load()
+        if loaded is not None:
+            yield store, *loaded
+
+
+__all__ = [
+    "DEFAULT_FSYNC",
+    "DEFAULT_FSYNC_INTERVAL",
+    "DEFAULT_SNAPSHOT_EVERY",
+    "FSYNC_POLICIES",
+    "RoomCheckpoint",
+    "RoomStore",
+    "stored_rooms",
+]
@@ -0,0 +1,1244 @@
+"""Game rooms hosted by :class:`~bang_py.network.server.BangServer`.
+
+Each :class:`GameRoom` owns an isolated :class:`GameManager` together with the
+connections seated at that table, so a single server process can host many
+games on one event loop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import pickle
+import random
+import secrets
+import time
+from contextlib import nullcontext
+from itertools import islice
+from collections.abc import Awaitable, Callable, Coroutine, Sequence, Mapping
+from dataclasses import dataclass, field
+from typing import Any, cast
+import logging
+
+from websockets.asyncio.server import ServerConnection
+from websockets.exceptions import WebSocketException
+
+from ..action_log import ActionLog, Command, apply_command
+from ..characters.base import DRAW_PROMPTS
+from ..characters.vera_custer import VeraCuster
+from ..game_manager import GameManager
+from ..game_manager_protocol import GameManagerProtocol
+from ..legal_actions import LegalAction
+from ..player import Player
+from ..cards.general_store import GeneralStoreCard
+from ..simulation.bots import BotPolicy, create_policy
+from .compact import SUBPROTOCOL, CompactEncoder
+from .metrics import ServerMetrics
+from .outbox import DEFAULT_MAX_LAG, DEFAULT_QUEUE_SIZE, Outbox
+from .persistence import RoomCheckpoint, RoomStore
+from .schema import parse_payload
+from .spectators import MAX_SPECTATORS, Spectator, SpectatorFeed, public_state
+from .messages import (
+    ActionPayload,
+    ClientPayload,
+    DiscardPayload,
+    DrawPayload,
+    EndTurnPayload,
+    ErrorPayload,
+    PlayCardPayload,
+    ResyncPayload,
+    SetAutoMissPayload,
+    UseAbilityPayload,
+)
+from .state import (
+    KEYFRAME_INTERVAL,
+    FrameEncoder,
+    GameState,
+    PlayerState,
+    StateFrame,
+    delta,
+    diff_players,
+    is_empty_delta,
+    keyframe,
+)
+
+logger = logging.getLogger(__name__)
+
+# Maximum allowed size for incoming websocket messages
+MAX_MESSAGE_SIZE = 4096
+# Bytes buffered on a socket before sends wait for the peer to catch up
+WRITE_LIMIT = 32 * 1024
+# Seconds the seat of a disconnected client with a session is held for it
+RECONNECT_GRACE = 30.0
+# Seconds a player has to end their turn; ``0`` lets turns last forever
+TURN_TIMEOUT = 0.0
+
+__all__ = [
+    "Connection",
+    "GameRoom",
+    "MAX_MESSAGE_SIZE",
+    "RECONNECT_GRACE",
+    "RoomUsage",
+    "TURN_TIMEOUT",
+    "WRITE_LIMIT",
+]
+
+
+# Use slots to reduce memory footprint and prevent dynamic attribute assignment.
+@dataclass(slots=True)
+class Connection:
+    websocket: ServerConnection
+    player: Player
+    task_group: asyncio.TaskGroup = field(default_factory=asyncio.TaskGroup)
+    # Last state written to the socket, its version and the version of the
+    # last keyframe; the next delta is computed against this state.
+    sent_state: GameState | None = None
+    sent_version: int = 0
+    keyframe_version: int = 0
+    # Whether state frames go out in the compact binary encoding.
+    compact: bool = False
+    # Messages waiting for the connection's writer task.
+    outbox: Outbox = field(default_factory=Outbox)
+    # Sent state, version and keyframe version the waiting state frame applies
+    # to, and the messages it carries, so a newer frame can replace it.
+    pending_base: tuple[GameState | None, int, int] = (None, 0, 0)
+    pending_messages: list[str] = field(default_factory=list)
+
+    @property
+    def name(self) -> str:
+        """Name of the seated player."""
+        return self.player.name
+
+
+@dataclass(slots=True, frozen=True)
+class RoomUsage:
+    """Resources held by one room, as reported to monitoring."""
+
+    players: int
+    connections: int
+    spectators: int
+    # Live tasks started by the room: writers, client loops and broadcasts.
+    tasks: int
+    # Messages queued for clients and not yet written.
+    queued_messages: int
+
+
+def _serialize_players(players: Sequence[Player]) -> list[PlayerState]:
+    """Return minimal player info for the UI."""
+    return [
+        {
+            "name": p.name,
+            "health": p.health,
+            "role": "" if p.role is None else p.role.card_name,
+            "character": getattr(p.character, "name", ""),
+            "equipment": [eq.card_name for eq in p.equipment.values()],
+        }
+        for p in players
+    ]
+
+
+def _serialize_actions(
+    players: Sequence[Player], actions: list[LegalAction]
+) -> list[ActionPayload]:
+    """Return ``actions`` as the messages a client sends to perform them."""
+    seats = {id(p): i for i, p in enumerate(players)}
+    payloads: list[ActionPayload] = []
+    for action in actions:
+        payload: ActionPayload
+        if action.ability is None:
+            payload = {"action": "play_card", "card_index": cast(int, action.card_index)}
+        else:
+            payload = {"action": "use_ability", "ability": action.ability}
+            if action.card_index is not None:
+                payload["card_index"] = action.card_index
+        if action.target is not None:
+            payload["target"] = seats[id(action.target)]
+        payloads.append(payload)
+    return payloads
+
+
+class GameRoom:
+    """Host a single Bang game and the clients seated at its table.
+
+    A room given a :class:`~bang_py.network.persistence.RoomStore` journals
+    every command of its game and checkpoints itself, so :meth:`restore` can
+    bring it back after the server restarts. :attr:`idle_since` tells the
+    server how long the room has had nothing left to do.
+    """
+
+    def __init__(
+        self,
+        code: str,
+        expansions: list[str] | None = None,
+        max_players: int = 7,
+        broadcast_window: float = 0.0,
+        max_message_size: int = MAX_MESSAGE_SIZE,
+        seed: int | None = None,
+        send_queue_size: int = DEFAULT_QUEUE_SIZE,
+        max_send_lag: float = DEFAULT_MAX_LAG,
+        auto_start: bool = False,
+        metrics: ServerMetrics | None = None,
+        reconnect_grace: float = RECONNECT_GRACE,
+        game: GameManager | None = None,
+        store: RoomStore | None = None,
+        max_spectators: int = MAX_SPECTATORS,
+        turn_timeout: float = TURN_TIMEOUT,
+        turn_bot: str | None = None,
+    ) -> None:
+        self.code = code
+        if game is None:
+            game = GameManager(expansions=expansions or [], seed=seed, action_log=ActionLog())
+        self.game: GameManagerProtocol = game
+        self.connections: dict[ServerConnection, Connection] = {}
+        # Read-only clients, fed the public state as one shared stream.
+        self.spectators = SpectatorFeed(max_spectators)
+        self.max_players = max_players
+        self.max_message_size = max_message_size
+        # Clients with more messages waiting, or whose oldest message has
+        # waited longer than this many seconds, are disconnected.
+        self.send_queue_size = send_queue_size
+        self.max_send_lag = max_send_lag
+        # Deal and start the game as soon as the table is full.
+        self.auto_start = auto_start
+        # Names of the matched players whose seats are kept for them until
+        # they join, ``None`` for rooms anyone may join.
+        self.reserved: list[str] | None = None
+        # Shared with the server so every room reports into one set of metrics.
+        self.metrics = metrics if metrics is not None else ServerMetrics()
+        self._game_started: float | None = None
+        # Session tokens of clients that may resume their seat, and the
+        # expiry timers of seats held for disconnected ones.
+        self.reconnect_grace = reconnect_grace
+        self._sessions: dict[str, Player] = {}
+        self._held: dict[str, asyncio.TimerHandle] = {}
+        # Players seated when the room was restored, unseated or held by
+        # :meth:`run` since none of them is connected any more.
+        self._restored: list[Player] = []
+        # Turns not ended within ``turn_timeout`` seconds are ended by the
+        # room, after ``turn_bot`` played them when a bot policy is named.
+        self.turn_timeout = turn_timeout
+        self._turn_bot: BotPolicy | None = (
+            None if turn_bot is None else create_policy(turn_bot, random.Random())
+        )
+        self._turn_timer: asyncio.TimerHandle | None = None
+        self._game_over = False
+        # Monotonic time since which the game is over or nobody is connected,
+        # after which the server reaps the room once its TTL has passed.
+        self.idle_since: float | None = None
+        # Tasks started for this room, counted for :meth:`usage`.
+        self._tasks: set[asyncio.Task[Any]] = set()
+        # Handlers for each validated client action and each ability name,
+        # bound once so routing a message is a dictionary lookup.
+        self._action_handlers: dict[str, Callable[[ServerConnection, Any], Awaitable[None]]] = {
+            "draw": self._handle_draw,
+            "discard": self._handle_discard,
+            "play_card": self._handle_play_card,
+            "use_ability": self._handle_use_ability,
+            "set_auto_miss": self._handle_set_auto_miss,
+            "resync": self._handle_resync,
+            "end_turn": self._handle_end_turn,
+        }
+        self._ability_handlers: dict[
+            str, Callable[[Player, UseAbilityPayload], Awaitable[bool]]
+        ] = {
+            name.removeprefix("_ability_"): getattr(self, name)
+            for name in dir(type(self))
+            if name.startswith("_ability_")
+        }
+        # Draw-phase prompt senders keyed by ``BaseCharacter.draw_prompt``.
+        # Each returns ``False`` when it cannot prompt, letting the player
+        # draw normally.
+        self._prompt_starters: dict[str, Callable[[Connection, Player], bool]] = {
+            name.removeprefix("_prompt_"): getattr(self, name)
+            for name in dir(type(self))
+            if name.startswith("_prompt_")
+        }
+        missing = set(DRAW_PROMPTS.values()) - self._prompt_starters.keys()
+        if missing:
+            raise RuntimeError(f"no handler for draw prompts: {', '.join(sorted(missing))}")
+        self._broadcast_group: asyncio.TaskGroup | None = None
+        self._closed = asyncio.Event()
+        self.state_version = 0
+        # Seconds to wait before flushing coalesced broadcasts; ``0`` flushes
+        # on the next event-loop iteration.
+        self.broadcast_window = broadcast_window
+        self._pending_messages: list[str] = []
+        self._flush_handle: asyncio.Handle | None = None
+        self.game.player_damaged_listeners.append(self._on_player_damaged)
+        self.game.player_healed_listeners.append(self._on_player_healed)
+        self.game.game_over_listeners.append(self._on_game_over)
+        self.game.turn_started_listeners.append(self._on_turn_started)
+        # Journal and snapshots when the server persists its rooms.
+        self.store = store
+        if store is not None and game.action_log is not None:
+            game.action_log.listeners.append(store.append)
+            self._checkpoint(force=True)
+
+    @classmethod
+    def restore(
+        cls,
+        store: RoomStore,
+        checkpoint: RoomCheckpoint,
+        commands: Sequence[Command],
+        **settings: Any,
+    ) -> GameRoom:
+        """Rebuild a room from ``checkpoint`` and the ``commands`` journaled after it.
+
+        ``settings`` are passed on to the constructor. No client is connected
+        to the new room: when it runs, seats with a session are held for
+        ``reconnect_grace`` seconds and the others are freed.
+        """
+        game = GameManager.restore(checkpoint.game)
+        game.action_log = ActionLog(seed=game.seed, expansions=list(game.expansions))
+        for command in commands:
+            try:
+                apply_command(game, command)
+            except Exception:  # it failed the same way before the restart
+                logger.exception("Replaying %r in room %s failed", command[0], checkpoint.code)
+        room = cls(
+            checkpoint.code,
+            max_players=checkpoint.max_players,
+            game=game,
+            store=store,
+            **settings,
+        )
+        room._sessions = {token: game.players[seat] for token, seat in checkpoint.sessions}
+        room._restored = list(game.players)
+        if checkpoint.game_started:
+            room._game_started = time.monotonic()
+        return room
+
+    def checkpoint(self) -> RoomCheckpoint:
+        """Return the state :meth:`restore` needs to rebuild this room."""
+        game = cast(GameManager, self.game)
+        seats = {id(p): i for i, p in enumerate(game.players)}
+        return RoomCheckpoint(
+            code=self.code,
+            expansions=tuple(game.expansions),
+            max_players=self.max_players,
+            game=game.snapshot(),
+            sessions=tuple((token, seats[id(p)]) for token, p in self._sessions.items()),
+            game_started=self._game_started is not None,
+        )
+
+    def _checkpoint(self, force: bool = False) -> None:
+        """Write a snapshot when one is due, or with ``force`` at once."""
+        store = self.store
+        if store is not None and (force or store.snapshot_due):
+            store.write_snapshot(self.checkpoint())
+
+    @property
+    def is_full(self) -> bool:
+        """Return ``True`` when no further players may join."""
+        return len(self.game.players) >= self.max_players
+
+    @property
+    def is_open(self) -> bool:
+        """Return ``True`` while anyone may join, the game has not started and seats are free."""
+        return self.reserved is None and not self.is_full and not self.game.turn_order
+
+    def admits(self, name: str) -> bool:
+        """Return ``False`` when the free seats are kept for players other than ``name``."""
+        return self.reserved is None or name in self.reserved
+
+    def listing(self) -> dict[str, object]:
+        """Return how the room is described to clients browsing the lobby."""
+        game = cast(GameManager, self.game)
+        return {
+            "code": self.code,
+            "players": len(game.players),
+            "max_players": self.max_players,
+            "expansions": list(game.expansions),
+            "spectators": len(self.spectators),
+        }
+
+    async def run(self) -> None:
+        """Supervise this room's background broadcasts until :meth:`close`."""
+        restored, self._restored = self._restored, []
+        for player in restored:
+            self._leave(player)
+        if restored:
+            self._update_idle()
+        # A restored game resumes with a fresh turn timer.
+        current = self.game._current_player_obj()
+        if current is not None:
+            self._start_turn_timer(current)
+        async with asyncio.TaskGroup() as tg:
+            self._broadcast_group = tg
+            try:
+                await self._closed.wait()
+            finally:
+                self._broadcast_group = None
+
+    @property
+    def game_over(self) -> bool:
+        """Return ``True`` once the game has been won."""
+        return self._game_over
+
+    def usage(self) -> RoomUsage:
+        """Return the resources this room currently holds."""
+        game = cast(GameManager, self.game)
+        clients = self._clients()
+        return RoomUsage(
+            players=len(game.players),
+            connections=len(self.connections),
+            spectators=len(self.spectators),
+            tasks=len(self._tasks),
+            queued_messages=sum(len(client.outbox) for client in clients),
+        )
+
+    def state_size(self) -> int:
+        """Return the pickled size of the game, a proxy for the memory it holds.
+
+        This pickles a snapshot of the whole game, so it is too costly to ask
+        every room for it on every sweep.
+        """
+        game = cast(GameManager, self.game)
+        return len(pickle.dumps(game.snapshot(), protocol=pickle.HIGHEST_PROTOCOL))
+
+    def close(self) -> None:
+        """Stop supervising background tasks and disconnect every client of this room."""
+        for handle in self._held.values():
+            handle.cancel()
+        self._held.clear()
+        self._stop_turn_timer()
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        clients = self._clients()
+        # Forget the seats first so the client loops do not hold or free them.
+        self.connections.clear()
+        for client in clients:
+            client.outbox.close()
+            self._track(
+                client.task_group.create_task(
+                    client.websocket.close(code=1001, reason="Room closed")
+                )
+            )
+        if self.store is not None:
+            self.store.close()
+        self._closed.set()
+
+    def _clients(self) -> list[Connection | Spectator]:
+        """Return the seated and the spectating clients."""
+        return [*self.connections.values(), *self.spectators.spectators.values()]
+
+    def _track(self, task: asyncio.Task[Any]) -> None:
+        """Count ``task`` towards :meth:`usage` until it finishes."""
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _update_idle(self) -> None:
+        """Record when the room became idle, or that it no longer is.
+
+        Seats held for disconnected players keep the room in use until their
+        grace period runs out.
+        """
+        if self._game_over or not (self.connections or self.spectators or self._held):
+            if self.idle_since is None:
+                self.idle_since = time.monotonic()
+        else:
+            self.idle_since = None
+
+    def _send(
+        self, conn: Connection | Spectator, payload: str | bytes | Mapping[str, object]
+    ) -> None:
+        """Queue ``payload`` for the writer task of ``conn``.
+
+        ``payload`` may be an encoded message or a mapping that will be
+        serialized as JSON.
+        """
+        if conn.outbox.closed:
+            return
+        if not isinstance(payload, (str, bytes)):
+            payload = json.dumps(payload)
+        self._check_lag(conn, conn.outbox.put(payload))
+
+    def _send_state(self, conn: Connection, payload: str | bytes) -> None:
+        """Queue state frame ``payload``, replacing one ``conn`` has not received."""
+        if not conn.outbox.closed:
+            self._check_lag(conn, conn.outbox.put_state(payload))
+
+    def _check_lag(self, conn: Connection | Spectator, queued: bool) -> None:
+        """Evict ``conn`` if its outbox is full or its oldest message is too old."""
+        if queued and conn.outbox.lag() <= self.max_send_lag:
+            return
+        logger.warning(
+            "Disconnecting %s: %d messages waiting for %.1fs",
+            conn.name,
+            len(conn.outbox),
+            conn.outbox.lag(),
+        )
+        conn.outbox.close()
+        self.metrics.evictions.inc()
+        self._track(
+            conn.task_group.create_task(conn.websocket.close(code=1008, reason="Client too slow"))
+        )
+
+    async def _write_loop(self, conn: Connection | Spectator) -> None:
+        """Write the messages queued for ``conn`` until its outbox is closed."""
+        metrics = self.metrics
+        while (payload := await conn.outbox.get()) is not None:
+            try:
+                await conn.websocket.send(payload)
+                metrics.sent.inc()
+                metrics.sent_bytes.inc(len(payload))
+            except (OSError, WebSocketException) as exc:
+                logger.exception("Failed to send to %s", conn.name, exc_info=exc)
+                metrics.send_failures.inc()
+                conn.outbox.close()
+                # Closing the socket ends the client loop, which unseats the player.
+                try:
+                    await conn.websocket.close()
+                except (OSError, WebSocketException) as close_exc:
+                    logger.exception(
+                        "Error closing websocket for %s",
+                        conn.name,
+                        exc_info=close_exc,
+                    )
+
+    def _spawn_broadcast(self, coro: Coroutine[Any, Any, Any]) -> None:
+        if self._broadcast_group is not None:
+            self._track(self._broadcast_group.create_task(coro))
+        else:  # pragma: no cover - room not supervised
+            self._track(asyncio.create_task(coro))
+
+    def request_broadcast(self, message: str | None = None) -> None:
+        """Mark the state dirty and schedule one coalesced broadcast.
+
+        Every request made before the flush is merged into a single frame per
+        connection carrying all queued ``message`` strings in order.
+        """
+        if message:
+            self._pending_messages.append(message)
+        if self._flush_handle is not None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No loop yet; queued messages go out with the next broadcast.
+            return
+        if self.broadcast_window > 0:
+            self._flush_handle = loop.call_later(self.broadcast_window, self._flush)
+        else:
+            self._flush_handle = loop.call_soon(self._flush)
+
+    def _flush(self) -> None:
+        self._flush_handle = None
+        self._spawn_broadcast(self.broadcast_state())
+
+    async def join(self, websocket: ServerConnection, name: str, session: bool = False) -> None:
+        """Seat ``name`` at this table and process its messages until disconnect.
+
+        With ``session`` the client is sent a token right after the join
+        message. Presenting it to :meth:`resume` within ``reconnect_grace``
+        seconds of losing the connection gives the seat back.
+        """
+
+        if self.reserved is not None and name in self.reserved:
+            self.reserved.remove(name)
+        player = Player(name)
+        player.metadata.auto_miss = True
+        conn = self._connect(websocket, player)
+        self.game.add_player(player)
+        await websocket.send(f"Joined game as {player.name}")
+        if session:
+            token = secrets.token_urlsafe(16)
+            self._sessions[token] = player
+            await websocket.send(json.dumps({"session": token, "grace": self.reconnect_grace}))
+        # Sessions are not journaled and refer to seats, so seating changes
+        # are snapshotted straight away.
+        self._checkpoint(force=True)
+        await self._serve(conn, start=True)
+
+    def has_session(self, token: str) -> bool:
+        """Return ``True`` if ``token`` can resume a seat at this table."""
+        return token in self._sessions
+
+    async def resume(self, websocket: ServerConnection, token: str) -> None:
+        """Give the seat of session ``token`` to ``websocket``.
+
+        A connection still holding the seat is closed. The client receives one
+        keyframe with the current state and is then served as usual.
+        """
+
+        player = self._sessions[token]
+        handle = self._held.pop(token, None)
+        if handle is not None:
+            handle.cancel()
+        old = self._find_connection(player)
+        if old is not None:
+            # Unseat the stale socket first so its loop leaves the player alone.
+            del self.connections[old.websocket]
+            old.outbox.close()
+            self._track(
+                old.task_group.create_task(old.websocket.close(code=1000, reason="Session resumed"))
+            )
+        conn = self._connect(websocket, player)
+        await websocket.send(f"Resumed game as {player.name}")
+        await self._serve(conn)
+
+    async def spectate(self, websocket: ServerConnection) -> None:
+        """Stream the public state of this table to ``websocket`` until it disconnects.
+
+        The spectator is sent a keyframe right away and then the frames shared
+        by every spectator. The only message it may send is ``resync``, which
+        is answered with a new keyframe; anything else is refused.
+        """
+
+        spectator = Spectator(
+            websocket,
+            compact=websocket.subprotocol == SUBPROTOCOL,
+            outbox=Outbox(self.send_queue_size),
+        )
+        feed = self.spectators
+        if feed.sent_state is None:
+            players, event = self._public_state()
+            feed.update(public_state(players, event), self.state_version)
+        feed.add(spectator)
+        self._update_idle()
+        self.metrics.spectators.inc()
+        await websocket.send("Watching game")
+        self._resync_spectator(spectator)
+
+        async def watch_loop(writer: asyncio.Task[None]) -> None:
+            try:
+                async for message in websocket:
+                    if len(message) > self.max_message_size:
+                        await websocket.close(code=1009, reason="Message too large")
+                        break
+                    self._handle_spectator_message(spectator, message)
+            finally:
+                self.metrics.spectators.dec()
+                spectator.outbox.close()
+                writer.cancel()
+                feed.remove(spectator)
+                self._update_idle()
+
+        async with spectator.task_group as tg:
+            writer = tg.create_task(self._write_loop(spectator))
+            self._track(writer)
+            self._track(tg.create_task(watch_loop(writer)))
+
+    def _resync_spectator(self, spectator: Spectator) -> None:
+        payload = self.spectators.keyframe(spectator.compact)
+        if payload is not None:
+            self._send(spectator, payload)
+
+    def _handle_spectator_message(self, spectator: Spectator, message: str | bytes) -> None:
+        try:
+            payload = json.loads(message)
+        except json.JSONDecodeError:
+            payload = None
+        action = payload.get("action") if isinstance(payload, dict) else None
+        if action == "resync":
+            self._resync_spectator(spectator)
+        else:
+            error = {"error": {"code": "spectator", "message": "spectators cannot act"}}
+            self._send(spectator, error)
+        self.metrics.messages.inc(action="spectator")
+
+    def _connect(self, websocket: ServerConnection, player: Player) -> Connection:
+        conn = Connection(
+            websocket,
+            player,
+            compact=websocket.subprotocol == SUBPROTOCOL,
+            outbox=Outbox(self.send_queue_size),
+        )
+        self.connections[websocket] = conn
+        self._update_idle()
+        self.metrics.connections.inc()
+        return conn
+
+    async def _serve(self, conn: Connection, start: bool = False) -> None:
+        """Run the writer and message loop of ``conn`` until it disconnects."""
+        websocket = conn.websocket
+
+        async def client_loop(writer: asyncio.Task[None]) -> None:
+            try:
+                async for message in websocket:
+                    if len(message) > self.max_message_size:
+                        await websocket.close(code=1009, reason="Message too large")
+                        break
+                    await self._process_message(websocket, message)
+            finally:
+                self.metrics.connections.dec()
+                conn.outbox.close()
+                writer.cancel()
+                if self.connections.get(websocket) is conn:
+                    del self.connections[websocket]
+                    self._leave(conn.player)
+                    self._update_idle()
+                    await self.broadcast_state()
+
+        async with conn.task_group as tg:
+            writer = tg.create_task(self._write_loop(conn))
+            self._track(writer)
+            if start and self.auto_start and len(self.game.players) == self.max_players:
+                self._game_started = time.monotonic()
+                self.metrics.games_started.inc()
+                self.game.start_game()
+            await self.broadcast_state()
+            self._track(tg.create_task(client_loop(writer)))
+
+    def _leave(self, player: Player) -> None:
+        """Hold the seat of disconnected ``player`` if it has a session, else free it."""
+        token = next((t for t, p in self._sessions.items() if p is player), None)
+        if token is None or self.reconnect_grace <= 0:
+            self._remove_player(player, token)
+            return
+        loop = asyncio.get_running_loop()
+        self._held[token] = loop.call_later(self.reconnect_grace, self._expire, token)
+        self._pending_messages.append(f"{player.name} lost connection")
+
+    def _expire(self, token: str) -> None:
+        """Free the seat held for session ``token``."""
+        self._held.pop(token, None)
+        self._update_idle()
+        player = self._sessions.get(token)
+        if player is not None:
+            self._remove_player(player, token)
+            self.request_broadcast(f"{player.name} left the game")
+
+    def _remove_player(self, player: Player, token: str | None) -> None:
+        if token is not None:
+            del self._sessions[token]
+        self.game.remove_player(player)
+        self._checkpoint(force=True)
+
+    def _parse_payload(self, payload: dict[str, object]) -> ClientPayload | ErrorPayload:
+        """Validate and coerce a raw ``payload`` from the client."""
+        return parse_payload(payload)
+
+    async def _process_message(self, websocket: ServerConnection, message: str | bytes) -> None:
+        """Parse and route a single message from ``websocket``, recording metrics."""
+        start = time.perf_counter()
+        try:
+            action = await self._handle_message(websocket, message)
+        finally:
+            self.metrics.message_seconds.observe(time.perf_counter() - start)
+            self._checkpoint()
+        self.metrics.messages.inc(action=action)
+
+    async def _handle_message(self, websocket: ServerConnection, message: str | bytes) -> str:
+        """Route a single message and return its action, or ``"invalid"``."""
+
+        if message == "end_turn":
+            await self._handle_end_turn(websocket, {"action": "end_turn"})
+            return "end_turn"
+
+        try:
+            payload = json.loads(message)
+        except json.JSONDecodeError:
+            logger.warning("Malformed JSON from client: %r", message)
+            await websocket.send(
+                json.dumps({"error": {"code": "invalid_json", "message": "invalid json"}})
+            )
+            return "invalid"
+
+        if not isinstance(payload, dict):
+            logger.warning("Non-object payload received: %r", payload)
+            await websocket.send(
+                json.dumps(
+                    {
+                        "error": {
+                            "code": "invalid_message",
+                            "message": "payload must be object",
+                        }
+                    }
+                )
+            )
+            return "invalid"
+
+        parsed = self._parse_payload(payload)
+        if "error" in parsed:
+            logger.warning("Invalid payload received: %r", payload)
+            await websocket.send(json.dumps(parsed))
+            return "invalid"
+
+        action = cast(str, parsed["action"])
+        await self._action_handlers[action](websocket, parsed)
+        return action
+
+    async def _handle_end_turn(self, websocket: ServerConnection, _payload: EndTurnPayload) -> None:
+        if self.game._current_player_obj() is self.connections[websocket].player:
+            self.game.end_turn()
+            self.request_broadcast()
+
+    async def _handle_draw(self, websocket: ServerConnection, payload: DrawPayload) -> None:
+        num = int(payload.get("num", 1))
+        player = self.connections[websocket].player
+        self.game.draw_card(player, num)
+        self.request_broadcast()
+
+    async def _handle_discard(self, websocket: ServerConnection, payload: DiscardPayload) -> None:
+        idx = payload.get("card_index")
+        player = self.connections[websocket].player
+        if idx is not None and 0 <= idx < len(player.hand):
+            card = player.hand[idx]
+            self.game.discard_card(player, card)
+            self.request_broadcast()
+
+    async def _handle_play_card(
+        self, websocket: ServerConnection, payload: PlayCardPayload
+    ) -> None:
+        idx = payload.get("card_index")
+        target_idx = payload.get("target")
+        player = self.connections[websocket].player
+        if idx is None or not 0 <= idx < len(player.hand):
+            return
+
+        target = None
+        if target_idx is not None:
+            target = self.game.get_player_by_index(target_idx)
+            if target is None:
+                return
+
+        card = player.hand[idx]
+        if isinstance(card, GeneralStoreCard):
+            names = self.game.open_general_store(player, card)
+            desc = f"{player.name} played {card.__class__.__name__}"
+            await self.broadcast_state(desc)
+
+            order = self.game.general_store_order or []
+            if order:
+                first = order[0]
+                conn = self._find_connection(first)
+                if conn:
+                    message = json.dumps({"prompt": "general_store", "cards": names})
+                    self._send(conn, message)
+        else:
+            desc = f"{player.name} played {card.__class__.__name__}"
+            if target:
+                desc += f" on {target.name}"
+            # Queue the description first so it precedes the messages raised
+            # by listeners while the card resolves.
+            self.request_broadcast(desc)
+            self.game.play_card(player, card, target)
+
+    async def _handle_use_ability(
+        self, websocket: ServerConnection, payload: UseAbilityPayload
+    ) -> None:
+        handler = self._ability_handlers.get(payload["ability"])
+        if not handler:
+            return
+        player = self.connections[websocket].player
+        skip = await handler(player, payload)
+        if not skip:
+            self.request_broadcast()
+
+    def _draw_and_play(self, player: Player, **choices: Any) -> None:
+        """Resolve ``player``'s postponed draw phase and open their play phase.
+
+        This also runs from the turn-started listener while the game is still
+        inside ``end_turn``, so the phases are logged as commands of their own.
+        """
+        log = self.game.action_log
+        with log.standalone() if log is not None else nullcontext():
+            self.game.draw_phase(player, **choices)
+            self.game.play_phase(player)
+
+    def _awaits_draw(self, player: Player) -> bool:
+        """Return ``True`` when ``player`` may answer their draw prompt now.
+
+        Draw prompt answers from anyone else, or sent twice, are ignored.
+        """
+        return player is self.game._current_player_obj() and player.metadata.awaiting_draw
+
+    async def _ability_sid_ketchum(self, player: Player, payload: UseAbilityPayload) -> bool:
+        idxs = payload.get("indices") or []
+        self.game.sid_ketchum_ability(player, idxs)
+        return False
+
+    async def _ability_chuck_wengam(self, player: Player, _payload: UseAbilityPayload) -> bool:
+        self.game.chuck_wengam_ability(player)
+        return False
+
+    async def _ability_doc_holyday(self, player: Player, payload: UseAbilityPayload) -> bool:
+        idxs = payload.get("indices") or []
+        self.game.doc_holyday_ability(player, idxs)
+        return False
+
+    async def _ability_vera_custer(self, player: Player, payload: UseAbilityPayload) -> bool:
+        idx = payload.get("target")
+        target = None
+        if idx is not None:
+            target = self.game.get_player_by_index(idx)
+        if target is None:
+            return False
+        self.game.vera_custer_copy(player, target)
+        return False
+
+    async def _ability_jesse_jones(self, player: Player, payload: UseAbilityPayload) -> bool:
+        if not self._awaits_draw(player):
+            return True
+        idx = payload.get("target")
+        card_idx = payload.get("card_index")
+        target = None
+        if idx is not None:
+            target = self.game.get_player_by_index(idx)
+            if target is None:
+                return False
+        self._draw_and_play(player, jesse_target=target, jesse_card=card_idx)
+        return False
+
+    async def _ability_kit_carlson(self, player: Player, payload: UseAbilityPayload) -> bool:
+        if not self._awaits_draw(player):
+            return True
+        self._draw_and_play(player, kit_back=payload.get("discard"))
+        return False
+
+    async def _ability_pedro_ramirez(self, player: Player, payload: UseAbilityPayload) -> bool:
+        if not self._awaits_draw(player):
+            return True
+        use_discard = bool(payload.get("use_discard", True))
+        self._draw_and_play(player, pedro_use_discard=use_discard)
+        return False
+
+    async def _ability_jose_delgado(self, player: Player, payload: UseAbilityPayload) -> bool:
+        if not self._awaits_draw(player):
+            return True
+        eq_idx = payload.get("equipment")
+        self._draw_and_play(player, jose_equipment=eq_idx)
+        return False
+
+    async def _ability_pat_brennan(self, player: Player, payload: UseAbilityPayload) -> bool:
+        if not self._awaits_draw(player):
+            return True
+        idx = payload.get("target")
+        card = cast(str | None, payload.get("card"))
+        target = None
+        if idx is not None:
+            target = self.game.get_player_by_index(idx)
+            if target is None:
+                return False
+        self._draw_and_play(player, pat_target=target, pat_card=card)
+        return False
+
+    async def _ability_uncle_will(self, player: Player, payload: UseAbilityPayload) -> bool:
+        cidx = payload.get("card_index")
+        if cidx is not None and 0 <= cidx < len(player.hand):
+            card = player.hand[cidx]
+            if self.game.uncle_will_ability(player, card):
+                self.request_broadcast()
+                return True
+        return False
+
+    async def _handle_set_auto_miss(
+        self, websocket: ServerConnection, payload: SetAutoMissPayload
+    ) -> None:
+        enabled = bool(payload.get("enabled", True))
+        self.game.set_auto_miss(self.connections[websocket].player, enabled)
+        self.request_broadcast()
+
+    async def _handle_resync(self, websocket: ServerConnection, _payload: ResyncPayload) -> None:
+        conn = self.connections[websocket]
+        players, event = self._public_state()
+        frame = self._next_frame(conn, self._snapshot(conn, players, event), keyframe=True)
+        if frame is not None:
+            if conn.compact:
+                self._send_state(conn, CompactEncoder().encode(frame))
+            else:
+                self._send_state(conn, json.dumps(frame))
+
+    def _public_state(self) -> tuple[list[PlayerState], str]:
+        """Return the player list and event shown to every connection."""
+        return (
+            _serialize_players(self.game.players),
+            getattr(self.game.current_event, "name", ""),
+        )
+
+    def _snapshot(self, conn: Connection, players: list[PlayerState], event: str) -> GameState:
+        """Return the state visible to ``conn`` sharing the public ``players``."""
+        return {
+            "players": players,
+            "hand": [c.card_name for c in conn.player.hand],
+            "character": getattr(conn.player.character, "name", ""),
+            "event": event,
+            "actions": self._legal_actions(conn.player),
+        }
+
+    def _legal_actions(self, player: Player) -> list[ActionPayload]:
+        """Return the actions ``player`` may send, empty outside their play phase.
+
+        Ending the turn is always listed last, so a non-empty list also tells
+        the client that it is their turn.
+        """
+        game = self.game
+        if game.phase != "play" or game._current_player_obj() is not player:
+            return []
+        actions = _serialize_actions(game.players, game.legal_actions(player))
+        actions.append({"action": "end_turn"})
+        return actions
+
+    def _state_frame(
+        self,
+        conn: Connection,
+        state: GameState,
+        messages: list[str] | None = None,
+        encoder: FrameEncoder | None = None,
+    ) -> StateFrame | None:
+        """Return the frame bringing ``conn`` to ``state`` and record it as sent.
+
+        Websocket frames arrive in order, so deltas are computed against the
+        last state written to the connection. A keyframe is sent to new or
+        resyncing clients and every ``KEYFRAME_INTERVAL`` versions. ``None`` is
+        returned when there is nothing to tell the client.
+        """
+        version = self.state_version
+        frame: StateFrame
+        if conn.sent_state is None or version - conn.keyframe_version >= KEYFRAME_INTERVAL:
+            frame = keyframe(version, state)
+            conn.keyframe_version = version
+        else:
+            players_diff = encoder.diff_players if encoder is not None else diff_players
+            frame = delta(
+                version, conn.sent_version, conn.sent_state, state, players_diff=players_diff
+            )
+            if not messages and is_empty_delta(frame):
+                return None
+        if messages:
+            frame["messages"] = messages
+        conn.sent_state = state
+        conn.sent_version = version
+        return frame
+
+    def _next_frame(
+        self,
+        conn: Connection,
+        state: GameState,
+        messages: list[str] | None = None,
+        encoder: FrameEncoder | None = None,
+        keyframe: bool = False,
+    ) -> StateFrame | None:
+        """Return the next state frame for ``conn`` as :meth:`_state_frame` does.
+
+        If the previous frame is still waiting in the outbox, the new frame is
+        computed from the state that frame applied to and carries its messages
+        too, so it can take the waiting frame's place. ``keyframe`` forces a
+        full state.
+        """
+        if conn.outbox.has_state:
+            conn.sent_state, conn.sent_version, conn.keyframe_version = conn.pending_base
+            messages = conn.pending_messages + (messages or [])
+        if keyframe:
+            conn.sent_state = None
+        conn.pending_base = (conn.sent_state, conn.sent_version, conn.keyframe_version)
+        conn.pending_messages = list(messages or [])
+        frame = self._state_frame(conn, state, messages, encoder)
+        if frame is None:
+            conn.outbox.discard_state()
+        return frame
+
+    def prepare_broadcast(
+        self, messages: list[str] | None = None
+    ) -> list[tuple[Connection, str | bytes]]:
+        """Return the encoded state frame for each connection and record it as sent.
+
+        The public part of the state is serialized once and its JSON shared by
+        all recipients; only the private hand is encoded per connection.
+        Connections that negotiated the compact encoding receive bytes.
+        """
+        self.state_version += 1
+        players, event = self._public_state()
+        encoder = FrameEncoder()
+        compact: CompactEncoder | None = None
+        frames: list[tuple[Connection, str | bytes]] = []
+        for conn in list(self.connections.values()):
+            state = self._snapshot(conn, players, event)
+            frame = self._next_frame(conn, state, messages, encoder)
+            if frame is None:
+                continue
+            if conn.compact:
+                if compact is None:
+                    compact = CompactEncoder()
+                frames.append((conn, compact.encode(frame)))
+            else:
+                frames.append((conn, encoder.encode(frame)))
+        return frames
+
+    async def broadcast_state(self, message: str | None = None) -> None:
+        """Queue for each connected client the changes to its visible game state.
+
+        Messages queued by :meth:`request_broadcast` are sent along with
+        ``message`` and any scheduled coalesced flush is cancelled. Frames go
+        to the writer task of each connection, so a slow client does not hold
+        up the others. Spectators all share one frame of the public changes.
+        """
+
+        if message:
+            self._pending_messages.append(message)
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        start = time.perf_counter()
+        messages, self._pending_messages = self._pending_messages, []
+        for conn, payload in self.prepare_broadcast(messages):
+            self._send_state(conn, payload)
+        if self.spectators:
+            players, event = self._public_state()
+            frame = self.spectators.update(
+                public_state(players, event), self.state_version, messages
+            )
+            if frame is not None:
+                for spectator, payload in self.spectators.fan_out(frame):
+                    self._send(spectator, payload)
+        self.metrics.broadcasts.inc()
+        self.metrics.broadcast_seconds.observe(time.perf_counter() - start)
+
+    def _find_connection(self, player: Player) -> Connection | None:
+        for conn in self.connections.values():
+            if conn.player is player:
+                return conn
+        return None
+
+    def _on_turn_started(self, player: Player) -> None:
+        """Handle start-of-turn prompts for ``player``."""
+        self._start_turn_timer(player)
+        conn = self._find_connection(player)
+        if not conn:
+            return
+
+        if isinstance(player.character, VeraCuster):
+            self._start_vera_custer(conn, player)
+            return
+
+        if player.metadata.awaiting_draw:
+            self._handle_character_draw_start(conn, player)
+
+    def _start_vera_custer(self, conn: Connection, player: Player) -> None:
+        options = [
+            {"index": i, "name": p.character.name}
+            for i, p in enumerate(self.game.players)
+            if p is not player and p.is_alive() and p.character is not None
+        ]
+        if options:
+            payload = json.dumps({"prompt": "vera", "options": options})
+            self._send(conn, payload)
+
+    def _handle_character_draw_start(self, conn: Connection, player: Player) -> None:
+        character = player.character
+        prompt = DRAW_PROMPTS.get(type(character)) if character else None
+        starter = self._prompt_starters[prompt] if prompt else None
+        if starter is not None and starter(conn, player):
+            return
+        self._draw_and_play(player)
+        self.request_broadcast()
+
+    def _prompt_jesse_jones(self, conn: Connection, player: Player) -> bool:
+        targets = [
+            {"index": i, "name": p.name}
+            for i, p in enumerate(self.game.players)
+            if p is not player and p.hand
+        ]
+        if targets:
+            payload = json.dumps({"prompt": "jesse_jones", "targets": targets})
+            self._send(conn, payload)
+        else:
+            self._draw_and_play(player)
+            self.request_broadcast()
+        return True
+
+    def _prompt_kit_carlson(self, conn: Connection, player: Player) -> bool:
+        deck = self.game.deck
+        if deck is None:
+            return False
+        # Show the cards without drawing them; the draw phase deals them once
+        # the player picks the one to put back.
+        names = [c.card_name for c in islice(deck.cards, 3)]
+        payload = json.dumps({"prompt": "kit_carlson", "cards": names})
+        self._send(conn, payload)
+        return True
+
+    def _prompt_pedro_ramirez(self, conn: Connection, player: Player) -> bool:
+        if self.game.discard_pile:
+            payload = json.dumps({"prompt": "pedro_ramirez"})
+            self._send(conn, payload)
+        else:
+            self._draw_and_play(player, pedro_use_discard=False)
+            self.request_broadcast()
+        return True
+
+    def _prompt_jose_delgado(self, conn: Connection, player: Player) -> bool:
+        equips = [
+            {"index": i, "name": c.card_name}
+            for i, c in enumerate(player.hand)
+            if hasattr(c, "slot")
+        ]
+        if equips:
+            payload = json.dumps({"prompt": "jose_delgado", "equipment": equips})
+            self._send(conn, payload)
+        else:
+            self._draw_and_play(player)
+            self.request_broadcast()
+        return True
+
+    def _prompt_pat_brennan(self, conn: Connection, player: Player) -> bool:
+        targets = []
+        for i, p in enumerate(self.game.players):
+            if p is player or not p.equipment:
+                continue
+            targets.append({"index": i, "cards": [c.card_name for c in p.equipment.values()]})
+        if targets:
+            payload = json.dumps({"prompt": "pat_brennan", "targets": targets})
+            self._send(conn, payload)
+        else:
+            self._draw_and_play(player)
+            self.request_broadcast()
+        return True
+
+    def _on_player_damaged(self, player: Player, _src: Player | None = None) -> None:
+        msg = (
+            f"{player.name} was eliminated"
+            if not player.is_alive()
+            else f"{player.name} took damage ({player.health})"
+        )
+        self.request_broadcast(msg)
+
+    def _on_player_healed(self, player: Player) -> None:
+        msg = f"{player.name} healed to {player.health}"
+        self.request_broadcast(msg)
+
+    def _start_turn_timer(self, player: Player) -> None:
+        """Give ``player`` ``turn_timeout`` seconds to end the turn starting now."""
+        self._stop_turn_timer()
+        if self.turn_timeout <= 0 or self._game_over:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No loop yet; :meth:`run` starts the timer of the current turn.
+            return
+        self._turn_timer = loop.call_later(self.turn_timeout, self._turn_expired, player)
+
+    def _stop_turn_timer(self) -> None:
+        if self._turn_timer is not None:
+            self._turn_timer.cancel()
+            self._turn_timer = None
+
+    def _turn_expired(self, player: Player) -> None:
+        """End the turn of ``player``, letting the bot play it first if there is one."""
+        self._turn_timer = None
+        if self._game_over or self.game._current_player_obj() is not player:
+            return
+        self.metrics.turn_timeouts.inc()
+        self._pending_messages.append(f"{player.name} ran out of time")
+        game = cast(GameManager, self.game)
+        if self._turn_bot is not None and player.is_alive():
+            if player.metadata.awaiting_draw:
+                self._draw_and_play(player)
+            self._turn_bot.play_turn(game, player)
+        # The bot may have won the game, leaving no turn to end.
+        if not self._game_over:
+            self.game.end_turn()
+        self.request_broadcast()
+        self._checkpoint()
+
+    def _on_game_over(self, result: str) -> None:
+        self._game_over = True
+        self._update_idle()
+        self._stop_turn_timer()
+        if self._game_started is not None:
+            self.metrics.game_seconds.observe(time.monotonic() - self._game_started)
+            self._game_started = None
+        self.request_broadcast(result)
@@ -0,0 +1,120 @@
+"""Declarative validation of the JSON payloads clients send.
+
+The fields of every action are declared once in :data:`PAYLOAD_SCHEMAS`.
+:func:`compile_schema` turns each declaration into a validator function when
+the module is imported, so checking a message is a dictionary lookup followed
+by straight-line field checks.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from typing import cast
+
+from .messages import ClientPayload, ErrorPayload
+
+Validator = Callable[[dict[str, object]], ClientPayload | ErrorPayload]
+
+
+@dataclass(frozen=True, slots=True)
+class Field:
+    """One field of an action payload.
+
+    Missing or ``null`` optional fields are left out of the parsed payload,
+    unless ``default`` gives a value to use instead. ``items`` is the type of
+    the elements of list fields. ``message`` overrides the error message sent
+    back when the field has the wrong type.
+    """
+
+    name: str
+    kind: type
+    required: bool = False
+    default: object = None
+    items: type | None = None
+    message: str | None = None
+
+
+def _invalid(message: str) -> ErrorPayload:
+    return {"error": {"code": "invalid_field", "message": message}}
+
+
+def compile_schema(action: str, fields: Sequence[Field]) -> Validator:
+    """Return a validator building the ``action`` payload from ``fields``.
+
+    The checks are generated as straight-line code, one block per field, and
+    compiled once, the way :mod:`dataclasses` builds ``__init__`` methods.
+    """
+
+    namespace: dict[str, object] = {"_invalid": _invalid, "action": action}
+    lines = ["def validate(payload):", "    parsed = {'action': action}"]
+    for i, f in enumerate(fields):
+        namespace[f"kind{i}"] = f.kind
+        namespace[f"items{i}"] = f.items
+        namespace[f"message{i}"] = f.message or f"{f.name} must be {f.kind.__name__}"
+        namespace[f"default{i}"] = f.default
+        check = f"not isinstance(value, kind{i})"
+        if f.items is not None:
+            check += f" or not all(isinstance(v, items{i}) for v in value)"
+        lines.append(f"    value = payload.get({f.name!r})")
+        if f.required:
+            lines += [
+                f"    if value is None or {check}:",
+                f"        return _invalid(message{i})",
+                f"    parsed[{f.name!r}] = value",
+            ]
+            continue
+        lines += [
+            "    if value is not None:",
+            f"        if {check}:",
+            f"            return _invalid(message{i})",
+            f"        parsed[{f.name!r}] = value",
+        ]
+        if f.default is not None:
+            lines += ["    else:", f"        parsed[{f.name!r}] = default{i}"]
+    lines.append("    return parsed")
+    exec("\n".join(lines), namespace)
+    return cast(Validator, namespace["validate"])
+
+
+_PLAY_CARD_ERROR = "invalid card_index or target"
+
+# Fields accepted for each action, checked in this order.
+PAYLOAD_SCHEMAS: dict[str, tuple[Field, ...]] = {
+    "draw": (Field("num", int, default=1),),
+    "discard": (Field("card_index", int, required=True),),
+    "play_card": (
+        Field("card_index", int, required=True, message=_PLAY_CARD_ERROR),
+        Field("target", int, message=_PLAY_CARD_ERROR),
+    ),
+    "use_ability": (
+        Field("ability", str, required=True),
+        Field("indices", list, items=int, message="indices must be list[int]"),
+        Field("target", int),
+        Field("card_index", int),
+        Field("discard", int),
+        Field("equipment", int),
+        Field("card", int),
+        Field("use_discard", bool),
+        Field("enabled", bool),
+    ),
+    "set_auto_miss": (Field("enabled", bool, required=True),),
+    "resync": (),
+    "end_turn": (),
+}
+
+VALIDATORS: dict[str, Validator] = {
+    action: compile_schema(action, fields) for action, fields in PAYLOAD_SCHEMAS.items()
+}
+
+
+def parse_payload(payload: dict[str, object]) -> ClientPayload | ErrorPayload:
+    """Validate and coerce a raw ``payload`` from a client."""
+    action = payload.get("action")
+    validator = VALIDATORS.get(action) if isinstance(action, str) else None
+    if validator is None:
+        return {"error": {"code": "unknown_action", "message": "unknown action"}}
+    return validator(payload)
+
+
+__all__ = ["PAYLOAD_SCHEMAS", "VALIDATORS", "Field", "Validator", "compile_schema", "parse_payload"]
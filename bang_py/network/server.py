@@ -1,4 +1,4 @@
-"""Websocket server implementation for hosting a Bang game."""
+"""Websocket server implementation for hosting Bang games."""
 
 from __future__ import annotations
 
@@ -6,62 +6,129 @@ import asyncio
 import json
 import secrets
 import ssl
-from collections.abc import Coroutine, Sequence, Mapping
-from dataclasses import dataclass, field
-from typing import Any, cast
 import logging
+import time
+import zlib
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any
 
 from websockets.asyncio.server import serve, ServerConnection
-from websockets.exceptions import WebSocketException
+from websockets.typing import Subprotocol
 
-from ..game_manager import GameManager
 from ..game_manager_protocol import GameManagerProtocol
-from ..player import Player
-from ..cards.general_store import GeneralStoreCard
-from .messages import (
-    ClientPayload,
-    DiscardPayload,
-    DrawPayload,
-    ErrorPayload,
-    PlayCardPayload,
-    SetAutoMissPayload,
-    UseAbilityPayload,
+from .compact import SUBPROTOCOL
+from .matchmaking import DEFAULT_MAX_WAITING, MatchQueue, TableKey, Ticket, table_key
+from .metrics import ServerMetrics, log_metrics, serve_metrics
+from .outbox import DEFAULT_MAX_LAG, DEFAULT_QUEUE_SIZE
+from .persistence import (
+    DEFAULT_FSYNC,
+    DEFAULT_FSYNC_INTERVAL,
+    DEFAULT_SNAPSHOT_EVERY,
+    RoomStore,
+    stored_rooms,
 )
+from .room import (
+    MAX_MESSAGE_SIZE,
+    RECONNECT_GRACE,
+    TURN_TIMEOUT,
+    WRITE_LIMIT,
+    Connection,
+    GameRoom,
+)
+from .spectators import MAX_SPECTATORS
 from .token_utils import _token_key_bytes
 from .validation import validate_player_name
 
 logger = logging.getLogger(__name__)
 
-# Maximum allowed size for incoming websocket messages
-MAX_MESSAGE_SIZE = 4096
-
-__all__ = ["BangServer", "validate_player_name"]
-
-
-# Use slots to reduce memory footprint and prevent dynamic attribute assignment.
-@dataclass(slots=True)
-class Connection:
-    websocket: ServerConnection
-    player: Player
-    task_group: asyncio.TaskGroup = field(default_factory=asyncio.TaskGroup)
-
-
-def _serialize_players(players: Sequence[Player]) -> list[dict]:
-    """Return minimal player info for the UI."""
-    return [
-        {
-            "name": p.name,
-            "health": p.health,
-            "role": "" if p.role is None else p.role.card_name,
-            "character": getattr(p.character, "name", ""),
-            "equipment": [eq.card_name for eq in p.equipment.values()],
-        }
-        for p in players
-    ]
+# Seconds a finished or abandoned room is kept before it is torn down.
+ROOM_TTL = 300.0
+# Seconds between sweeps reaping idle rooms and refreshing per-room metrics.
+SWEEP_INTERVAL = 10.0
+# Rooms whose pickled game size is measured per sweep, taking turns.
+STATE_SAMPLES = 4
+
+__all__ = [
+    "BangServer",
+    "DEFAULT_MAX_WAITING",
+    "GameRoom",
+    "MAX_MESSAGE_SIZE",
+    "MAX_SPECTATORS",
+    "RECONNECT_GRACE",
+    "ROOM_TTL",
+    "TURN_TIMEOUT",
+    "WRITE_LIMIT",
+    "room_shard",
+    "validate_player_name",
+]
+
+
+def room_shard(code: str, shards: int) -> int:
+    """Return which of ``shards`` worker processes hosts room ``code``."""
+    return zlib.crc32(code.encode()) % shards
+
+
+def _parse_join_request(message: str) -> dict[str, object] | None:
+    """Return the JSON object sent in place of a plain name, if any."""
+    if not message.startswith("{"):
+        return None
+    try:
+        request = json.loads(message)
+    except json.JSONDecodeError:
+        return None
+    return request if isinstance(request, dict) else None
 
 
 class BangServer:
-    """Run a websocket server for a single Bang game and manage clients."""
+    """Run a websocket server hosting one or more Bang games.
+
+    Every game lives in a :class:`GameRoom` keyed by its room code. The room
+    passed to the constructor is created immediately and acts as the default
+    room exposed through :attr:`game` and :attr:`connections`.
+
+    Clients offering the :data:`~bang_py.network.compact.SUBPROTOCOL`
+    subprotocol receive compact state frames unless ``compact`` is disabled.
+    ``compression`` negotiates the permessage-deflate extension,
+    ``max_message_size`` bounds incoming messages and ``write_limit`` is the
+    number of bytes buffered per socket before sends wait for the client.
+    Clients with more than ``send_queue_size`` messages waiting, or whose
+    oldest waiting message is older than ``max_send_lag`` seconds, are
+    disconnected. With ``auto_start`` a room starts its game once it is full.
+    Clients that ask for a session keep their seat for ``reconnect_grace``
+    seconds after their connection drops. Up to ``max_spectators`` clients
+    per room may watch instead of taking a seat. A turn not ended within
+    ``turn_timeout`` seconds is ended by the room, after the
+    :mod:`~bang_py.simulation.bots` policy named ``turn_bot``, if any, played
+    it for the absent player.
+
+    Instead of a room code a client may ask for the lobby, the rooms it could
+    still join, or to be matched with other players. Up to ``max_waiting``
+    clients wait in the :class:`~bang_py.network.matchmaking.MatchQueue`; a
+    room with automatic start is opened for every table it completes.
+
+    Every room reports into :attr:`metrics`. They are served in the Prometheus
+    text format on ``metrics_port`` when given, and logged every
+    ``metrics_interval`` seconds when positive.
+
+    A room whose game is over, or that every client has left, is torn down
+    once it has been idle for ``room_ttl`` seconds; ``0`` keeps rooms
+    forever. The default room is replaced by an empty one under the same
+    code. The sweep doing this also reports the tasks, queued messages and
+    state size of every room.
+
+    With ``state_dir`` every room is persisted to a subdirectory of it (see
+    :mod:`bang_py.network.persistence`) and the rooms found there are restored
+    on startup. ``fsync`` and ``fsync_interval`` decide how often the journals
+    are forced to disk and ``snapshot_every`` how many commands are journaled
+    between snapshots. When ``room_code`` is omitted, the first restored room
+    becomes the default room.
+
+    A server running as worker ``index`` of ``count`` behind a
+    :class:`~bang_py.network.supervisor.Supervisor` is given
+    ``shard=(index, count)``. It then only generates and restores room codes
+    that :func:`room_shard` assigns to it.
+    """
 
     def __init__(
         self,
@@ -73,614 +140,363 @@ class BangServer:
         certfile: str | None = None,
         keyfile: str | None = None,
         token_key: bytes | str | None = None,
+        broadcast_window: float = 0.0,
+        compact: bool = True,
+        compression: bool = True,
+        max_message_size: int = MAX_MESSAGE_SIZE,
+        write_limit: int = WRITE_LIMIT,
+        send_queue_size: int = DEFAULT_QUEUE_SIZE,
+        max_send_lag: float = DEFAULT_MAX_LAG,
+        auto_start: bool = False,
+        metrics_port: int | None = None,
+        metrics_interval: float = 0.0,
+        reconnect_grace: float = RECONNECT_GRACE,
+        state_dir: str | Path | None = None,
+        fsync: str = DEFAULT_FSYNC,
+        fsync_interval: float = DEFAULT_FSYNC_INTERVAL,
+        snapshot_every: int = DEFAULT_SNAPSHOT_EVERY,
+        max_spectators: int = MAX_SPECTATORS,
+        shard: tuple[int, int] | None = None,
+        max_waiting: int = DEFAULT_MAX_WAITING,
+        turn_timeout: float = TURN_TIMEOUT,
+        turn_bot: str | None = None,
+        room_ttl: float = ROOM_TTL,
     ) -> None:
         self.host = host
         self.port = port
-        # Generate a random six-character room code using a cryptographically
-        # secure RNG to avoid predictable codes.
-        self.room_code = room_code or secrets.token_hex(3)
-        self.game: GameManagerProtocol = GameManager(expansions=expansions or [])
         self.token_key = _token_key_bytes(token_key)
-        self.connections: dict[ServerConnection, Connection] = {}
+        self.expansions = expansions or []
         self.max_players = max_players
+        self.broadcast_window = broadcast_window
+        self.compact = compact
+        self.compression = compression
+        self.max_message_size = max_message_size
+        self.write_limit = write_limit
+        self.send_queue_size = send_queue_size
+        self.max_send_lag = max_send_lag
+        self.auto_start = auto_start
+        self.reconnect_grace = reconnect_grace
+        self.max_spectators = max_spectators
+        self.turn_timeout = turn_timeout
+        self.turn_bot = turn_bot
+        self.room_ttl = room_ttl
+        # Position of the next room whose game size is sampled.
+        self._state_sampled = 0
+        self.shard = shard
+        self.matchmaking = MatchQueue(max_waiting)
+        self.metrics = ServerMetrics()
+        self.metrics_port = metrics_port
+        self.metrics_interval = metrics_interval
+        self.state_dir = Path(state_dir) if state_dir is not None else None
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self.snapshot_every = snapshot_every
         self.certfile = certfile
         self.keyfile = keyfile
         self.ssl_context: ssl.SSLContext | None = None
         if certfile:
             self.ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
             self.ssl_context.load_cert_chain(certfile, keyfile)
-        self._broadcast_group: asyncio.TaskGroup | None = None
-        self.game.player_damaged_listeners.append(self._on_player_damaged)
-        self.game.player_healed_listeners.append(self._on_player_healed)
-        self.game.game_over_listeners.append(self._on_game_over)
-        self.game.turn_started_listeners.append(self._on_turn_started)
+        self.rooms: dict[str, GameRoom] = {}
+        self._room_group: asyncio.TaskGroup | None = None
+        if self.state_dir is not None:
+            self._restore_rooms(self.state_dir)
+        if room_code is None and self.rooms:
+            room_code = next(iter(self.rooms))
+        if room_code is None or room_code not in self.rooms:
+            room_code = self.create_room(room_code).code
+        self.room_code = room_code
+
+    @property
+    def game(self) -> GameManagerProtocol:
+        """Game hosted in the default room."""
+        return self.rooms[self.room_code].game
+
+    @property
+    def connections(self) -> dict[ServerConnection, Connection]:
+        """Connections seated in the default room."""
+        return self.rooms[self.room_code].connections
+
+    def _room_settings(self) -> dict[str, Any]:
+        """Return the constructor arguments every room takes from the server."""
+        return {
+            "broadcast_window": self.broadcast_window,
+            "max_message_size": self.max_message_size,
+            "send_queue_size": self.send_queue_size,
+            "max_send_lag": self.max_send_lag,
+            "auto_start": self.auto_start,
+            "metrics": self.metrics,
+            "reconnect_grace": self.reconnect_grace,
+            "max_spectators": self.max_spectators,
+            "turn_timeout": self.turn_timeout,
+            "turn_bot": self.turn_bot,
+        }
 
-    def _create_send_task(self, conn: Connection, payload: str | Mapping[str, object]) -> None:
-        """Create a supervised task to send ``payload``.
+    def _store(self, state_dir: Path, code: str) -> RoomStore:
+        return RoomStore(state_dir / code, self.fsync, self.fsync_interval, self.snapshot_every)
 
-        ``payload`` may be a JSON string or a mapping that will be serialized.
+    def _restore_rooms(self, state_dir: Path) -> None:
+        """Bring back the rooms persisted in ``state_dir``."""
+        for store, checkpoint, commands in stored_rooms(
+            state_dir, self.fsync, self.fsync_interval, self.snapshot_every
+        ):
+            if not self._owns(checkpoint.code):
+                continue
+            room = GameRoom.restore(store, checkpoint, commands, **self._room_settings())
+            self.rooms[room.code] = room
+            logger.info("Restored room %s (%d commands replayed)", room.code, len(commands))
+        self.metrics.rooms.set(len(self.rooms))
+
+    def _owns(self, code: str) -> bool:
+        """Return ``True`` if room ``code`` belongs to this server's shard."""
+        return self.shard is None or room_shard(code, self.shard[1]) == self.shard[0]
+
+    def _new_room_code(self) -> str:
+        # Generate a random six-character room code using a cryptographically
+        # secure RNG to avoid predictable codes.
+        code = secrets.token_hex(3)
+        while code in self.rooms or not self._owns(code):
+            code = secrets.token_hex(3)
+        return code
+
+    def create_room(
+        self,
+        code: str | None = None,
+        expansions: list[str] | None = None,
+        max_players: int | None = None,
+    ) -> GameRoom:
+        """Register a new room and return it.
+
+        Missing settings fall back to the server defaults. A random code is
+        generated when ``code`` is omitted.
+
+        Raises:
+            ValueError: If ``code`` is already in use.
         """
 
-        payload_str = payload if isinstance(payload, str) else json.dumps(payload)
+        if code is None:
+            code = self._new_room_code()
+        elif code in self.rooms:
+            raise ValueError(f"Room {code!r} already exists")
+        room = GameRoom(
+            code,
+            expansions=list(self.expansions if expansions is None else expansions),
+            max_players=self.max_players if max_players is None else max_players,
+            store=None if self.state_dir is None else self._store(self.state_dir, code),
+            **self._room_settings(),
+        )
+        self.rooms[code] = room
+        self.metrics.rooms.set(len(self.rooms))
+        if self._room_group is not None:
+            self._room_group.create_task(room.run())
+        return room
+
+    def get_room(self, code: str) -> GameRoom | None:
+        """Return the room registered under ``code`` if any."""
+        return self.rooms.get(code)
+
+    def remove_room(self, code: str) -> GameRoom | None:
+        """Unregister the room ``code``, stop its background tasks and delete its files."""
+        room = self.rooms.pop(code, None)
+        if room is not None:
+            room.close()
+            if room.store is not None:
+                room.store.destroy()
+                room.store = None
+            self.metrics.rooms.set(len(self.rooms))
+            self.metrics.forget_room(code)
+        return room
+
+    def sweep_rooms(self) -> list[str]:
+        """Reap the rooms idle for ``room_ttl`` seconds and report the usage of the others.
+
+        Returns the codes of the reaped rooms.
+        """
+        now = time.monotonic()
+        reaped: list[str] = []
+        for code, room in list(self.rooms.items()):
+            idle = room.idle_since
+            if self.room_ttl > 0 and idle is not None and now - idle >= self.room_ttl:
+                reason = "game_over" if room.game_over else "abandoned"
+                logger.info("Reaping room %s (%s)", code, reason)
+                self.metrics.rooms_reaped.inc(reason=reason)
+                self.remove_room(code)
+                reaped.append(code)
+                continue
+            usage = room.usage()
+            self.metrics.room_tasks.set(usage.tasks, room=code)
+            self.metrics.room_queued.set(usage.queued_messages, room=code)
+        if self.room_code in reaped:
+            self.create_room(self.room_code)
+        self._sample_state_sizes()
+        self.metrics.idle_rooms.set(
+            sum(room.idle_since is not None for room in self.rooms.values())
+        )
+        return reaped
 
-        async def _send() -> None:
-            try:
-                await conn.websocket.send(payload_str)
-            except asyncio.CancelledError as exc:  # pragma: no cover - network
-                logger.warning("Send to %s cancelled", conn.player.name, exc_info=exc)
-                raise
-            except WebSocketException as exc:  # pragma: no cover - network
-                logger.exception("Send to %s failed", conn.player.name, exc_info=exc)
+    def _sample_state_sizes(self) -> None:
+        """Measure the game size of the next :data:`STATE_SAMPLES` rooms."""
+        codes = list(self.rooms)
+        if not codes:
+            return
+        start = self._state_sampled % len(codes)
+        for i in range(start, start + min(STATE_SAMPLES, len(codes))):
+            code = codes[i % len(codes)]
+            self.metrics.room_state_bytes.set(self.rooms[code].state_size(), room=code)
+        self._state_sampled = start + STATE_SAMPLES
+
+    async def _sweep(self) -> None:
+        """Call :meth:`sweep_rooms` every :data:`SWEEP_INTERVAL` seconds until cancelled."""
+        while True:
+            await asyncio.sleep(SWEEP_INTERVAL)
+            self.sweep_rooms()
+
+    def lobby(self) -> list[dict[str, object]]:
+        """Return the listing of every room whose game has not started and has free seats."""
+        return [room.listing() for room in self.rooms.values() if room.is_open]
+
+    def _open_table(self, key: TableKey, table: list[Ticket]) -> None:
+        """Open a room for the players of ``table`` and tell each of them its code."""
+        players, expansions = key
+        room = self.create_room(expansions=list(expansions), max_players=players)
+        room.auto_start = True
+        room.reserved = [ticket.name for ticket in table]
+        # Reaped like an abandoned room should none of the players arrive.
+        room.idle_since = time.monotonic()
+        for ticket in table:
+            ticket.seat.set_result(room.code)
+
+    async def _matchmake(self, websocket: ServerConnection, request: dict[str, object]) -> None:
+        """Queue ``websocket`` for the table ``request`` asks for and seat it once found."""
+        name = request.get("name")
+        if not isinstance(name, str) or not validate_player_name(name):
+            self.metrics.handshakes.inc(outcome="invalid_name")
+            await websocket.send("Invalid name")
+            return
+        key = table_key(
+            request.get("players", self.max_players), request.get("expansions", self.expansions)
+        )
+        if key is None:
+            self.metrics.handshakes.inc(outcome="invalid_table")
+            await websocket.send("Invalid table")
+            return
+        if self.matchmaking.is_full:
+            self.metrics.handshakes.inc(outcome="queue_full")
+            await websocket.send("Matchmaking queue full")
+            return
 
-        conn.task_group.create_task(_send())
+        ticket = Ticket(name.strip(), key, session=request.get("session") is True)
+        table = self.matchmaking.add(ticket)
+        waiting = key[0] if table else self.matchmaking.waiting(key)
+        self.metrics.matchmaking.set(len(self.matchmaking))
+        await websocket.send(json.dumps({"queued": {"players": key[0], "waiting": waiting}}))
+        if table:
+            self._open_table(key, table)
+        closed = asyncio.ensure_future(websocket.wait_closed())
+        try:
+            await asyncio.wait((ticket.seat, closed), return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            closed.cancel()
+            if not ticket.seat.done():
+                self.matchmaking.remove(ticket)
+                self.metrics.matchmaking.set(len(self.matchmaking))
+        if not ticket.seat.done():
+            self.metrics.handshakes.inc(outcome="match_abandoned")
+            return
+        room = self.rooms.get(ticket.seat.result())
+        if room is None or not room.admits(ticket.name):
+            # The room was reaped, or a client of the same name took the seat.
+            self.metrics.handshakes.inc(outcome="match_abandoned")
+            error = {"code": "match_abandoned", "message": "the matched room is gone"}
+            await websocket.send(json.dumps({"error": error}))
+            return
 
-    def _spawn_broadcast(self, coro: Coroutine[Any, Any, Any]) -> None:
-        if self._broadcast_group is not None:
-            self._broadcast_group.create_task(coro)
-        else:  # pragma: no cover - server not started
-            asyncio.create_task(coro)
+        self.metrics.handshakes.inc(outcome="matched")
+        await websocket.send(json.dumps({"matched": room.code}))
+        await room.join(websocket, ticket.name, session=ticket.session)
 
     async def handler(self, websocket: ServerConnection) -> None:
-        """Register a new client and process game commands sent over the socket."""
+        """Route a new client to its room and process commands sent over the socket.
+
+        In place of the room code the client may send ``{"lobby": true}`` to
+        receive the listing of open rooms, or ``{"match": true, "name": ...}``
+        with optional ``players``, ``expansions`` and ``session`` to wait for
+        a table of that size and be seated there.
+
+        After the room code the client sends its name, or a JSON object with
+        either ``name`` and ``session: true`` to be issued a session token,
+        ``resume`` holding a token to take back a held seat, or
+        ``spectate: true`` to watch the game without a seat.
+        """
 
         await websocket.send("Enter room code:")
         code = await websocket.recv()
-        if code != self.room_code:
+        request = _parse_join_request(code) if isinstance(code, str) else None
+        if request is not None:
+            if request.get("lobby") is True:
+                self.metrics.handshakes.inc(outcome="lobby")
+                await websocket.send(json.dumps({"rooms": self.lobby()}))
+                return
+            if request.get("match") is True:
+                await self._matchmake(websocket, request)
+                return
+        room = self.rooms.get(code) if isinstance(code, str) else None
+        if room is None:
+            self.metrics.handshakes.inc(outcome="invalid_code")
             await websocket.send("Invalid room code")
             return
 
         await websocket.send("Enter your name:")
         raw_name = await websocket.recv()
         name = raw_name.decode() if isinstance(raw_name, bytes) else raw_name
+        session = False
+        request = _parse_join_request(name)
+        if request is not None:
+            token = request.get("resume")
+            if isinstance(token, str):
+                if not room.has_session(token):
+                    self.metrics.handshakes.inc(outcome="invalid_session")
+                    await websocket.send("Invalid session")
+                    return
+                self.metrics.handshakes.inc(outcome="resumed")
+                await room.resume(websocket, token)
+                return
+            if request.get("spectate") is True:
+                if room.spectators.is_full:
+                    self.metrics.handshakes.inc(outcome="spectators_full")
+                    await websocket.send("Too many spectators")
+                    return
+                self.metrics.handshakes.inc(outcome="spectating")
+                await room.spectate(websocket)
+                return
+            requested = request.get("name")
+            name = requested if isinstance(requested, str) else ""
+            session = request.get("session") is True
         if not validate_player_name(name):
+            self.metrics.handshakes.inc(outcome="invalid_name")
             await websocket.send("Invalid name")
             return
         name = name.strip()
-        if len(self.game.players) >= self.max_players:
+        if room.is_full:
+            self.metrics.handshakes.inc(outcome="full")
             await websocket.send("Game full")
             return
-
-        player = Player(name)
-        player.metadata.auto_miss = True
-        conn = Connection(websocket, player)
-        self.connections[websocket] = conn
-
-        async def client_loop() -> None:
-            try:
-                async for message in websocket:
-                    if len(message) > MAX_MESSAGE_SIZE:
-                        await websocket.close(code=1009, reason="Message too large")
-                        break
-                    await self._process_message(websocket, message)
-            finally:
-                self.game.remove_player(player)
-                self.connections.pop(websocket, None)
-                await self.broadcast_state()
-
-        async with conn.task_group as tg:
-            self.game.add_player(player)
-            await websocket.send(f"Joined game as {player.name}")
-            await self.broadcast_state()
-            tg.create_task(client_loop())
-
-    def _parse_payload(self, payload: dict[str, object]) -> ClientPayload | ErrorPayload:
-        """Validate and coerce a raw ``payload`` from the client."""
-
-        action = payload.get("action")
-        if action == "draw":
-            num = payload.get("num", 1)
-            if not isinstance(num, int):
-                return {"error": {"code": "invalid_field", "message": "num must be int"}}
-            return cast(DrawPayload, {"action": "draw", "num": num})
-        if action == "discard":
-            idx = payload.get("card_index")
-            if not isinstance(idx, int):
-                return {
-                    "error": {
-                        "code": "invalid_field",
-                        "message": "card_index must be int",
-                    }
-                }
-            return cast(DiscardPayload, {"action": "discard", "card_index": idx})
-        if action == "play_card":
-            idx = payload.get("card_index")
-            target = payload.get("target")
-            if not isinstance(idx, int) or (target is not None and not isinstance(target, int)):
-                return {
-                    "error": {
-                        "code": "invalid_field",
-                        "message": "invalid card_index or target",
-                    }
-                }
-            play_parsed: PlayCardPayload = {"action": "play_card", "card_index": idx}
-            if isinstance(target, int):
-                play_parsed["target"] = target
-            return cast(PlayCardPayload, play_parsed)
-        if action == "use_ability":
-            ability = payload.get("ability")
-            if not isinstance(ability, str):
-                return {"error": {"code": "invalid_field", "message": "ability must be str"}}
-            ability_parsed: UseAbilityPayload = {"action": "use_ability", "ability": ability}
-            indices = payload.get("indices")
-            if indices is not None:
-                if not isinstance(indices, list) or not all(isinstance(v, int) for v in indices):
-                    return {
-                        "error": {
-                            "code": "invalid_field",
-                            "message": "indices must be list[int]",
-                        }
-                    }
-                ability_parsed["indices"] = indices
-            target = payload.get("target")
-            if target is not None:
-                if not isinstance(target, int):
-                    return {"error": {"code": "invalid_field", "message": "target must be int"}}
-                ability_parsed["target"] = target
-            card_index = payload.get("card_index")
-            if card_index is not None:
-                if not isinstance(card_index, int):
-                    return {
-                        "error": {
-                            "code": "invalid_field",
-                            "message": "card_index must be int",
-                        }
-                    }
-                ability_parsed["card_index"] = card_index
-            discard = payload.get("discard")
-            if discard is not None:
-                if not isinstance(discard, int):
-                    return {"error": {"code": "invalid_field", "message": "discard must be int"}}
-                ability_parsed["discard"] = discard
-            equipment = payload.get("equipment")
-            if equipment is not None:
-                if not isinstance(equipment, int):
-                    return {"error": {"code": "invalid_field", "message": "equipment must be int"}}
-                ability_parsed["equipment"] = equipment
-            card = payload.get("card")
-            if card is not None:
-                if not isinstance(card, int):
-                    return {"error": {"code": "invalid_field", "message": "card must be int"}}
-                ability_parsed["card"] = card
-            use_discard = payload.get("use_discard")
-            if use_discard is not None:
-                if not isinstance(use_discard, bool):
-                    return {
-                        "error": {
-                            "code": "invalid_field",
-                            "message": "use_discard must be bool",
-                        }
-                    }
-                ability_parsed["use_discard"] = use_discard
-            enabled = payload.get("enabled")
-            if enabled is not None:
-                if not isinstance(enabled, bool):
-                    return {"error": {"code": "invalid_field", "message": "enabled must be bool"}}
-                ability_parsed["enabled"] = enabled
-            return cast(UseAbilityPayload, ability_parsed)
-        if action == "set_auto_miss":
-            enabled = payload.get("enabled")
-            if not isinstance(enabled, bool):
-                return {"error": {"code": "invalid_field", "message": "enabled must be bool"}}
-            return cast(SetAutoMissPayload, {"action": "set_auto_miss", "enabled": enabled})
-        return {"error": {"code": "unknown_action", "message": "unknown action"}}
-
-    async def _process_message(self, websocket: ServerConnection, message: str | bytes) -> None:
-        """Parse and route a single message from ``websocket``."""
-
-        if message == "end_turn":
-            self.game.end_turn()
-            await self.broadcast_state()
-            return
-
-        try:
-            payload = json.loads(message)
-        except json.JSONDecodeError:
-            logger.warning("Malformed JSON from client: %r", message)
-            await websocket.send(
-                json.dumps({"error": {"code": "invalid_json", "message": "invalid json"}})
-            )
+        if not room.admits(name):
+            self.metrics.handshakes.inc(outcome="reserved")
+            await websocket.send("Seat reserved")
             return
 
-        if not isinstance(payload, dict):
-            logger.warning("Non-object payload received: %r", payload)
-            await websocket.send(
-                json.dumps(
-                    {
-                        "error": {
-                            "code": "invalid_message",
-                            "message": "payload must be object",
-                        }
-                    }
-                )
-            )
-            return
+        self.metrics.handshakes.inc(outcome="joined")
+        await room.join(websocket, name, session=session)
 
-        parsed = self._parse_payload(payload)
-        if "error" in parsed:
-            logger.warning("Invalid payload received: %r", payload)
-            await websocket.send(json.dumps(parsed))
-            return
-
-        action = parsed.get("action")
-        if action == "draw":
-            draw_payload = cast(DrawPayload, parsed)
-            await self._handle_draw(websocket, draw_payload)
-        elif action == "discard":
-            discard_payload = cast(DiscardPayload, parsed)
-            await self._handle_discard(websocket, discard_payload)
-        elif action == "play_card":
-            play_payload = cast(PlayCardPayload, parsed)
-            await self._handle_play_card(websocket, play_payload)
-        elif action == "use_ability":
-            ability_payload = cast(UseAbilityPayload, parsed)
-            await self._handle_use_ability(websocket, ability_payload)
-        elif action == "set_auto_miss":
-            auto_miss_payload = cast(SetAutoMissPayload, parsed)
-            await self._handle_set_auto_miss(websocket, auto_miss_payload)
-
-    async def _handle_draw(self, websocket: ServerConnection, payload: DrawPayload) -> None:
-        num = int(payload.get("num", 1))
-        player = self.connections[websocket].player
-        self.game.draw_card(player, num)
-        await self.broadcast_state()
-
-    async def _handle_discard(self, websocket: ServerConnection, payload: DiscardPayload) -> None:
-        idx = payload.get("card_index")
-        player = self.connections[websocket].player
-        if idx is not None and 0 <= idx < len(player.hand):
-            card = player.hand[idx]
-            self.game.discard_card(player, card)
-            await self.broadcast_state()
-
-    async def _handle_play_card(
-        self, websocket: ServerConnection, payload: PlayCardPayload
-    ) -> None:
-        idx = payload.get("card_index")
-        target_idx = payload.get("target")
-        player = self.connections[websocket].player
-        if idx is None or not 0 <= idx < len(player.hand):
-            return
-
-        target = None
-        if target_idx is not None:
-            target = self.game.get_player_by_index(target_idx)
-            if target is None:
-                return
-
-        card = player.hand[idx]
-        if isinstance(card, GeneralStoreCard):
-            player.hand.pop(idx)
-            self.game.discard_pile.append(card)
-            names = self.game.start_general_store(player)
-            desc = f"{player.name} played {card.__class__.__name__}"
-            await self.broadcast_state(desc)
-
-            order = self.game.general_store_order or []
-            if order:
-                first = order[0]
-                conn = self._find_connection(first)
-                if conn:
-                    message = json.dumps({"prompt": "general_store", "cards": names})
-                    self._create_send_task(conn, message)
-        else:
-            self.game.play_card(player, card, target)
-            desc = f"{player.name} played {card.__class__.__name__}"
-            if target:
-                desc += f" on {target.name}"
-            await self.broadcast_state(desc)
-
-    async def _handle_use_ability(
-        self, websocket: ServerConnection, payload: UseAbilityPayload
-    ) -> None:
-        ability = payload.get("ability")
-        player = self.connections[websocket].player
-        handler = getattr(self, f"_ability_{ability}", None)
-        if not handler:
-            return
-        skip = await handler(player, payload)
-        if not skip:
-            await self.broadcast_state()
-
-    async def _ability_sid_ketchum(self, player: Player, payload: UseAbilityPayload) -> bool:
-        idxs = payload.get("indices") or []
-        if player.character and hasattr(player.character, "use_ability"):
-            player.character.use_ability(self.game, player, indices=idxs)
-        return False
-
-    async def _ability_chuck_wengam(self, player: Player, _payload: UseAbilityPayload) -> bool:
-        self.game.chuck_wengam_ability(player)
-        return False
-
-    async def _ability_doc_holyday(self, player: Player, payload: UseAbilityPayload) -> bool:
-        idxs = payload.get("indices") or []
-        self.game.doc_holyday_ability(player, idxs)
-        return False
-
-    async def _ability_vera_custer(self, player: Player, payload: UseAbilityPayload) -> bool:
-        idx = payload.get("target")
-        target = None
-        if idx is not None:
-            target = self.game.get_player_by_index(idx)
-        if target is None:
-            return False
-        self.game.vera_custer_copy(player, target)
-        return False
-
-    async def _ability_jesse_jones(self, player: Player, payload: UseAbilityPayload) -> bool:
-        idx = payload.get("target")
-        card_idx = payload.get("card_index")
-        target = None
-        if idx is not None:
-            target = self.game.get_player_by_index(idx)
-            if target is None:
-                return False
-        self.game.draw_phase(player, jesse_target=target, jesse_card=card_idx)
-        return False
-
-    async def _ability_kit_carlson(self, player: Player, payload: UseAbilityPayload) -> bool:
-        discard = payload.get("discard")
-        cards = player.metadata.kit_cards
-        player.metadata.kit_cards = None
-        if isinstance(cards, list) and cards:
-            for i, card in enumerate(cards):
-                if i == discard:
-                    self.game.discard_pile.append(card)
-                else:
-                    player.hand.append(card)
-        else:
-            self.game.draw_phase(player, kit_back=discard)
-        return False
-
-    async def _ability_pedro_ramirez(self, player: Player, payload: UseAbilityPayload) -> bool:
-        use_discard = bool(payload.get("use_discard", True))
-        self.game.draw_phase(player, pedro_use_discard=use_discard)
-        return False
-
-    async def _ability_jose_delgado(self, player: Player, payload: UseAbilityPayload) -> bool:
-        eq_idx = payload.get("equipment")
-        self.game.draw_phase(player, jose_equipment=eq_idx)
-        return False
-
-    async def _ability_pat_brennan(self, player: Player, payload: UseAbilityPayload) -> bool:
-        idx = payload.get("target")
-        card = cast(str | None, payload.get("card"))
-        target = None
-        if idx is not None:
-            target = self.game.get_player_by_index(idx)
-            if target is None:
-                return False
-        self.game.draw_phase(player, pat_target=target, pat_card=card)
-        return False
-
-    async def _ability_lucky_duke(self, player: Player, payload: UseAbilityPayload) -> bool:
-        idx = payload.get("card_index", 0)
-        cards = player.metadata.lucky_cards or []
-        player.metadata.lucky_cards = []
-        if cards:
-            chosen = cards[idx] if idx < len(cards) else cards[0]
-            player.hand.append(chosen)
-            for c in cards:
-                if c is not chosen:
-                    self.game.discard_pile.append(c)
-            self.game.draw_card(player)
-        else:
-            self.game.draw_phase(player)
-        return False
-
-    async def _ability_uncle_will(self, player: Player, payload: UseAbilityPayload) -> bool:
-        cidx = payload.get("card_index")
-        if cidx is not None and 0 <= cidx < len(player.hand):
-            card = player.hand[cidx]
-            if self.game.uncle_will_ability(player, card):
-                await self.broadcast_state()
-                return True
-        return False
-
-    async def _handle_set_auto_miss(
-        self, websocket: ServerConnection, payload: SetAutoMissPayload
-    ) -> None:
-        enabled = bool(payload.get("enabled", True))
-        self.connections[websocket].player.metadata.auto_miss = enabled
-        await self.broadcast_state()
-
-    async def broadcast_state(self, message: str | None = None) -> None:
-        """Send updated game state to all connected clients."""
-
-        async def send_payload(
-            websocket: ServerConnection, conn: Connection, payload: dict
-        ) -> None:
-            try:
-                await conn.websocket.send(json.dumps(payload))
-            except (OSError, WebSocketException, asyncio.CancelledError) as exc:
-                logger.exception("Failed to send state to %s", conn.player.name, exc_info=exc)
-                # Remove the player from the game if their websocket is no
-                # longer reachable before dropping the connection entirely.
-                try:
-                    await conn.websocket.close()
-                except (OSError, WebSocketException) as close_exc:
-                    logger.exception(
-                        "Error closing websocket for %s",
-                        conn.player.name,
-                        exc_info=close_exc,
-                    )
-                self.game.remove_player(conn.player)
-                self.connections.pop(websocket, None)
-
-        async with asyncio.TaskGroup() as tg:
-            for websocket, conn in list(self.connections.items()):
-                payload = {
-                    "players": _serialize_players(self.game.players),
-                    "hand": [c.card_name for c in conn.player.hand],
-                    "character": getattr(conn.player.character, "name", ""),
-                    "event": getattr(self.game.current_event, "name", ""),
-                }
-                if message:
-                    payload["message"] = message
-                tg.create_task(send_payload(websocket, conn, payload))
-
-    def _find_connection(self, player: Player) -> Connection | None:
-        for conn in self.connections.values():
-            if conn.player is player:
-                return conn
+    def select_subprotocol(
+        self, _websocket: ServerConnection, subprotocols: Sequence[Subprotocol]
+    ) -> Subprotocol | None:
+        """Accept the compact encoding when offered and enabled, else plain JSON."""
+        if self.compact and SUBPROTOCOL in subprotocols:
+            return Subprotocol(SUBPROTOCOL)
         return None
 
-    def _on_turn_started(self, player: Player) -> None:
-        """Handle start-of-turn prompts for ``player``."""
-        conn = self._find_connection(player)
-        if not conn:
-            return
-
-        from ..characters.vera_custer import VeraCuster
-
-        if isinstance(player.character, VeraCuster):
-            self._start_vera_custer(conn, player)
-            return
-
-        if player.metadata.awaiting_draw:
-            player.metadata.awaiting_draw = False
-            self._handle_character_draw_start(conn, player)
-
-    def _start_vera_custer(self, conn: Connection, player: Player) -> None:
-        options = [
-            {"index": i, "name": p.character.name}
-            for i, p in enumerate(self.game.players)
-            if p is not player and p.is_alive() and p.character is not None
-        ]
-        if options:
-            payload = json.dumps({"prompt": "vera", "options": options})
-            self._create_send_task(conn, payload)
-
-    def _handle_character_draw_start(self, conn: Connection, player: Player) -> None:
-        handlers = [
-            self._start_jesse_jones,
-            self._start_kit_carlson,
-            self._start_pedro_ramirez,
-            self._start_jose_delgado,
-            self._start_pat_brennan,
-            self._start_lucky_duke,
-        ]
-        for handler in handlers:
-            if handler(conn, player):
-                return
-        self.game.draw_phase(player)
-        self._spawn_broadcast(self.broadcast_state())
-
-    def _start_jesse_jones(self, conn: Connection, player: Player) -> bool:
-        from ..characters.jesse_jones import JesseJones
-
-        if not isinstance(player.character, JesseJones):
-            return False
-        targets = [
-            {"index": i, "name": p.name}
-            for i, p in enumerate(self.game.players)
-            if p is not player and p.hand
-        ]
-        if targets:
-            payload = json.dumps({"prompt": "jesse_jones", "targets": targets})
-            self._create_send_task(conn, payload)
-        else:
-            self.game.draw_phase(player)
-            self._spawn_broadcast(self.broadcast_state())
-        return True
-
-    def _start_kit_carlson(self, conn: Connection, player: Player) -> bool:
-        from ..characters.kit_carlson import KitCarlson
-
-        if not isinstance(player.character, KitCarlson):
-            return False
-        deck = self.game.deck
-        if deck is None:
-            return False
-        cards = [deck.draw() for _ in range(3)]
-        player.metadata.kit_cards = [c for c in cards if c]
-        names = [c.card_name for c in player.metadata.kit_cards or []]
-        payload = json.dumps({"prompt": "kit_carlson", "cards": names})
-        self._create_send_task(conn, payload)
-        return True
-
-    def _start_pedro_ramirez(self, conn: Connection, player: Player) -> bool:
-        from ..characters.pedro_ramirez import PedroRamirez
-
-        if not isinstance(player.character, PedroRamirez):
-            return False
-        if self.game.discard_pile:
-            payload = json.dumps({"prompt": "pedro_ramirez"})
-            self._create_send_task(conn, payload)
-        else:
-            self.game.draw_phase(player, pedro_use_discard=False)
-            self._spawn_broadcast(self.broadcast_state())
-        return True
-
-    def _start_jose_delgado(self, conn: Connection, player: Player) -> bool:
-        from ..characters.jose_delgado import JoseDelgado
-
-        if not isinstance(player.character, JoseDelgado):
-            return False
-        equips = [
-            {"index": i, "name": c.card_name}
-            for i, c in enumerate(player.hand)
-            if hasattr(c, "slot")
-        ]
-        if equips:
-            payload = json.dumps({"prompt": "jose_delgado", "equipment": equips})
-            self._create_send_task(conn, payload)
-        else:
-            self.game.draw_phase(player)
-            self._spawn_broadcast(self.broadcast_state())
-        return True
-
-    def _start_pat_brennan(self, conn: Connection, player: Player) -> bool:
-        from ..characters.pat_brennan import PatBrennan
-
-        if not isinstance(player.character, PatBrennan):
-            return False
-        targets = []
-        for i, p in enumerate(self.game.players):
-            if p is player or not p.equipment:
-                continue
-            targets.append({"index": i, "cards": [c.card_name for c in p.equipment.values()]})
-        if targets:
-            payload = json.dumps({"prompt": "pat_brennan", "targets": targets})
-            self._create_send_task(conn, payload)
-        else:
-            self.game.draw_phase(player)
-            self._spawn_broadcast(self.broadcast_state())
-        return True
-
-    def _start_lucky_duke(self, conn: Connection, player: Player) -> bool:
-        from ..characters.lucky_duke import LuckyDuke
-
-        if not isinstance(player.character, LuckyDuke):
-            return False
-        deck = self.game.deck
-        if deck is None:
-            return False
-        cards = [deck.draw(), deck.draw()]
-        player.metadata.lucky_cards = [c for c in cards if c]
-        names = [c.card_name for c in player.metadata.lucky_cards or []]
-        if names:
-            payload = json.dumps({"prompt": "lucky_duke", "cards": names})
-            self._create_send_task(conn, payload)
-        else:
-            self.game.draw_phase(player)
-            self._spawn_broadcast(self.broadcast_state())
-        return True
-
-    def _on_player_damaged(self, player: Player, _src: Player | None = None) -> None:
-        msg = (
-            f"{player.name} was eliminated"
-            if not player.is_alive()
-            else f"{player.name} took damage ({player.health})"
-        )
-        self._spawn_broadcast(self.broadcast_state(msg))
-
-    def _on_player_healed(self, player: Player) -> None:
-        msg = f"{player.name} healed to {player.health}"
-        self._spawn_broadcast(self.broadcast_state(msg))
-
-    def _on_game_over(self, result: str) -> None:
-        self._spawn_broadcast(self.broadcast_state(result))
-
     async def start(self) -> None:
         """Start the websocket server and run until cancelled."""
         async with serve(
@@ -688,14 +504,27 @@ class BangServer:
             self.host,
             self.port,
             ssl=self.ssl_context,
-            max_size=MAX_MESSAGE_SIZE,
+            compression="deflate" if self.compression else None,
+            max_size=self.max_message_size,
+            write_limit=self.write_limit,
+            select_subprotocol=self.select_subprotocol,
         ):
             async with asyncio.TaskGroup() as tg:
-                self._broadcast_group = tg
+                self._room_group = tg
+                for room in self.rooms.values():
+                    tg.create_task(room.run())
+                tg.create_task(self._sweep())
+                if self.metrics_port is not None:
+                    metrics_server = await serve_metrics(self.metrics, self.host, self.metrics_port)
+                    tg.create_task(metrics_server.serve_forever())
+                    logger.info("Metrics served on %s:%s", self.host, self.metrics_port)
+                if self.metrics_interval > 0:
+                    tg.create_task(log_metrics(self.metrics, self.metrics_interval))
                 logger.info(
-                    "Server started on %s:%s (code: %s)",
+                    "Server started on %s:%s (code: %s, rooms: %d)",
                     self.host,
                     self.port,
                     self.room_code,
+                    len(self.rooms),
                 )
                 await asyncio.Future()  # run forever
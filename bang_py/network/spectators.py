@@ -0,0 +1,141 @@
+"""Read-only spectators of a room.
+
+Spectators are not seated and see only the public part of the state: the
+players and the current event, never a hand or the actions of a player.
+Since every spectator sees the same thing, a room keeps one
+:class:`SpectatorFeed` for all of them. Each update becomes a single frame,
+encoded once per wire format, and the same payload object is queued for
+every spectator, so the cost of a broadcast does not grow with the audience
+beyond appending to each outbox.
+
+Spectator frames are queued in order rather than replacing each other like
+the frames of players, because they are deltas of one shared sequence.
+A spectator that falls too far behind is disconnected like a slow player.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from .compact import CompactEncoder
+from .outbox import Outbox
+from .state import (
+    KEYFRAME_INTERVAL,
+    GameState,
+    PlayerState,
+    StateFrame,
+    delta,
+    is_empty_delta,
+    keyframe,
+)
+
+if TYPE_CHECKING:  # pragma: no cover - imported for type checking
+    from websockets.asyncio.server import ServerConnection
+
+# Spectators a room accepts at once.
+MAX_SPECTATORS = 1000
+
+
+@dataclass(slots=True)
+class Spectator:
+    """Connection of a client watching a room."""
+
+    websocket: ServerConnection
+    task_group: asyncio.TaskGroup = field(default_factory=asyncio.TaskGroup)
+    # Whether frames go out in the compact binary encoding.
+    compact: bool = False
+    outbox: Outbox = field(default_factory=Outbox)
+    # Shown in place of a player name when logging about the connection.
+    name: str = "spectator"
+
+
+def public_state(players: list[PlayerState], event: str) -> GameState:
+    """Return the state shown to spectators."""
+    return {"players": players, "hand": [], "character": "", "event": event}
+
+
+class SpectatorFeed:
+    """Public state stream shared by every spectator of one room."""
+
+    def __init__(self, max_spectators: int = MAX_SPECTATORS) -> None:
+        self.max_spectators = max_spectators
+        self.spectators: dict[ServerConnection, Spectator] = {}
+        # Last state sent to spectators, its version and the version of the
+        # last keyframe, in the same roles as on a player's connection.
+        self.sent_state: GameState | None = None
+        self.sent_version = 0
+        self.keyframe_version = 0
+        # Keyframe of ``sent_state`` per encoding, for spectators joining or
+        # resyncing before the next update.
+        self._keyframes: dict[bool, str | bytes] = {}
+
+    def __len__(self) -> int:
+        return len(self.spectators)
+
+    @property
+    def is_full(self) -> bool:
+        """Return ``True`` when no further spectators may join."""
+        return len(self.spectators) >= self.max_spectators
+
+    def add(self, spectator: Spectator) -> None:
+        """Start feeding ``spectator``."""
+        self.spectators[spectator.websocket] = spectator
+
+    def remove(self, spectator: Spectator) -> None:
+        """Stop feeding ``spectator``, forgetting the stream once nobody watches."""
+        if self.spectators.get(spectator.websocket) is spectator:
+            del self.spectators[spectator.websocket]
+        if not self.spectators:
+            self.sent_state = None
+            self._keyframes.clear()
+
+    def update(
+        self, state: GameState, version: int, messages: list[str] | None = None
+    ) -> StateFrame | None:
+        """Return the frame bringing spectators to ``state`` and record it as sent.
+
+        ``None`` is returned when there is nothing to tell them.
+        """
+        frame: StateFrame
+        if self.sent_state is None or version - self.keyframe_version >= KEYFRAME_INTERVAL:
+            frame = keyframe(version, state)
+            self.keyframe_version = version
+        else:
+            frame = delta(version, self.sent_version, self.sent_state, state)
+            if not messages and is_empty_delta(frame):
+                return None
+        if messages:
+            frame["messages"] = messages
+        self.sent_state = state
+        self.sent_version = version
+        self._keyframes.clear()
+        return frame
+
+    def keyframe(self, compact: bool) -> str | bytes | None:
+        """Return the encoded keyframe of the last state sent, if any."""
+        if self.sent_state is None:
+            return None
+        payload = self._keyframes.get(compact)
+        if payload is None:
+            frame = keyframe(self.sent_version, self.sent_state)
+            payload = CompactEncoder().encode(frame) if compact else json.dumps(frame)
+            self._keyframes[compact] = payload
+        return payload
+
+    def fan_out(self, frame: StateFrame) -> list[tuple[Spectator, str | bytes]]:
+        """Return ``frame`` paired with each spectator, encoded once per format."""
+        encoded: dict[bool, str | bytes] = {}
+        payloads: list[tuple[Spectator, str | bytes]] = []
+        for spectator in self.spectators.values():
+            payload = encoded.get(spectator.compact)
+            if payload is None:
+                payload = CompactEncoder().encode(frame) if spectator.compact else json.dumps(frame)
+                encoded[spectator.compact] = payload
+            payloads.append((spectator, payload))
+        return payloads
+
+
+__all__ = ["MAX_SPECTATORS", "Spectator", "SpectatorFeed", "public_state"]
@@ -0,0 +1,308 @@
+"""Versioned game state frames exchanged between the server and clients.
+
+The server sends each connection a *keyframe* containing the full state the
+player can see, followed by *delta* frames that only describe what changed
+since the previous frame written to that connection. Clients keep the latest
+state in a :class:`StateTracker` and ask for a fresh keyframe if a delta does
+not match the state they hold. Websocket delivery is ordered, so the last
+frame written is the base of the next delta and no acknowledgement is needed.
+
+This module has no websocket dependency so the UI can reuse it.
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Callable
+from typing import NotRequired, TypedDict, cast
+
+from .messages import ActionPayload
+
+# Number of versions after which a connection receives a full keyframe again.
+KEYFRAME_INTERVAL = 20
+
+# Fields describing a single player in the public state.
+PLAYER_FIELDS = ("name", "health", "role", "character", "equipment")
+
+# Frame keys whose values are identical for every recipient of a broadcast.
+SHARED_KEYS = frozenset({"players", "players_diff", "event", "messages"})
+
+
+class PlayerState(TypedDict):
+    """Public information about a seated player."""
+
+    name: str
+    health: int
+    role: str
+    character: str
+    equipment: list[str]
+
+
+class GameState(TypedDict):
+    """Full state visible to a single connection.
+
+    ``actions`` lists the messages the player may send right now, as
+    produced by ``GameManager.legal_actions``.
+    """
+
+    players: list[PlayerState]
+    hand: list[str]
+    character: str
+    event: str
+    actions: NotRequired[list[ActionPayload]]
+
+
+class StateFrame(TypedDict, total=False):
+    """Keyframe or delta frame sent to a client.
+
+    Keyframes carry ``players``, ``hand``, ``character``, ``event`` and
+    ``actions`` in full.
+    Deltas reference the ``base`` version they were computed against and only
+    include the fields that changed:
+
+    ``players_diff``
+        Mapping of player index (as a string) to the changed player fields.
+    ``hand_splice``
+        ``[index, delete_count, inserted_cards]`` applied to the hand list.
+    """
+
+    type: str
+    version: int
+    keyframe: NotRequired[bool]
+    base: NotRequired[int]
+    players: NotRequired[list[PlayerState]]
+    players_diff: NotRequired[dict[str, dict[str, object]]]
+    hand: NotRequired[list[str]]
+    hand_splice: NotRequired[list[object]]
+    character: NotRequired[str]
+    event: NotRequired[str]
+    actions: NotRequired[list[ActionPayload]]
+    messages: NotRequired[list[str]]
+
+
+def keyframe(version: int, state: GameState) -> StateFrame:
+    """Return a keyframe carrying ``state`` in full."""
+    frame: StateFrame = {
+        "type": "state",
+        "version": version,
+        "keyframe": True,
+        "players": state["players"],
+        "hand": state["hand"],
+        "character": state["character"],
+        "event": state["event"],
+    }
+    if "actions" in state:
+        frame["actions"] = state["actions"]
+    return frame
+
+
+def diff_players(
+    old: list[PlayerState], new: list[PlayerState]
+) -> dict[str, dict[str, object]] | None:
+    """Return changed fields per player index or ``None`` if seating changed."""
+    if len(old) != len(new):
+        return None
+    changes: dict[str, dict[str, object]] = {}
+    for idx, (before, after) in enumerate(zip(old, new)):
+        if before["name"] != after["name"]:
+            return None
+        old_fields = cast(dict[str, object], before)
+        new_fields = cast(dict[str, object], after)
+        fields = {
+            key: new_fields[key] for key in PLAYER_FIELDS if old_fields[key] != new_fields[key]
+        }
+        if fields:
+            changes[str(idx)] = fields
+    return changes
+
+
+def hand_splice(old: list[str], new: list[str]) -> list[object] | None:
+    """Return ``[index, delete_count, inserted]`` turning ``old`` into ``new``.
+
+    ``None`` is returned when both hands are identical.
+    """
+    if old == new:
+        return None
+    limit = min(len(old), len(new))
+    start = 0
+    while start < limit and old[start] == new[start]:
+        start += 1
+    end = 0
+    while end < limit - start and old[-1 - end] == new[-1 - end]:
+        end += 1
+    stop = len(new) - end
+    return [start, len(old) - start - end, new[start:stop]]
+
+
+def delta(
+    version: int,
+    base: int,
+    old: GameState,
+    new: GameState,
+    *,
+    players_diff: Callable[
+        [list[PlayerState], list[PlayerState]], dict[str, dict[str, object]] | None
+    ] = diff_players,
+) -> StateFrame:
+    """Return a frame describing the changes from ``old`` to ``new``.
+
+    ``players_diff`` computes the public player changes and may be replaced by
+    a caching implementation such as :meth:`FrameEncoder.diff_players`.
+    """
+    frame: StateFrame = {"type": "state", "version": version, "base": base}
+    players = players_diff(old["players"], new["players"])
+    if players is None:
+        frame["players"] = new["players"]
+    elif players:
+        frame["players_diff"] = players
+    splice = hand_splice(old["hand"], new["hand"])
+    if splice is not None:
+        frame["hand_splice"] = splice
+    if old["character"] != new["character"]:
+        frame["character"] = new["character"]
+    if old["event"] != new["event"]:
+        frame["event"] = new["event"]
+    actions = new.get("actions", [])
+    if old.get("actions", []) != actions:
+        frame["actions"] = actions
+    return frame
+
+
+def is_empty_delta(frame: StateFrame) -> bool:
+    """Return ``True`` if ``frame`` is a delta without any changes."""
+    return not frame.get("keyframe") and frame.keys() <= {"type", "version", "base"}
+
+
+def _copy_players(players: list[PlayerState]) -> list[PlayerState]:
+    return [cast(PlayerState, dict(p)) for p in players]
+
+
+def apply_frame(state: GameState | None, frame: StateFrame) -> GameState | None:
+    """Return the state after applying ``frame`` to ``state``.
+
+    ``None`` is returned when a delta cannot be applied because no base state
+    is available.
+    """
+    new_state: GameState
+    if frame.get("keyframe"):
+        new_state = {
+            "players": _copy_players(frame.get("players", [])),
+            "hand": list(frame.get("hand", [])),
+            "character": frame.get("character", ""),
+            "event": frame.get("event", ""),
+        }
+        if "actions" in frame:
+            new_state["actions"] = list(frame["actions"])
+        return new_state
+    if state is None:
+        return None
+    players: list[PlayerState]
+    if "players" in frame:
+        players = _copy_players(frame["players"])
+    else:
+        players = _copy_players(state["players"])
+        for key, fields in frame.get("players_diff", {}).items():
+            idx = int(key)
+            if not 0 <= idx < len(players):
+                return None
+            cast(dict[str, object], players[idx]).update(fields)
+    hand = list(state["hand"])
+    splice = frame.get("hand_splice")
+    if splice is not None:
+        at, count, inserted = cast(tuple[int, int, list[str]], splice)
+        stop = at + count
+        hand[at:stop] = inserted
+    new_state = {
+        "players": players,
+        "hand": hand,
+        "character": frame.get("character", state["character"]),
+        "event": frame.get("event", state["event"]),
+    }
+    actions = frame.get("actions", state.get("actions"))
+    if actions is not None:
+        new_state["actions"] = list(actions)
+    return new_state
+
+
+class FrameEncoder:
+    """Encode the frames of one broadcast, serializing shared values once.
+
+    Recipients of a broadcast share the same ``players`` list object and
+    usually the same previous state, so their public sections are identical.
+    The encoder caches the JSON of the shared section by the identity of its
+    values and only encodes private fields such as the hand per recipient.
+    """
+
+    def __init__(self) -> None:
+        # Values are kept alongside their encoding so ids are not reused.
+        self._encoded: dict[tuple[object, ...], tuple[list[object], str]] = {}
+        self._diffs: dict[int, tuple[list[PlayerState], dict[str, dict[str, object]] | None]] = {}
+
+    def diff_players(
+        self, old: list[PlayerState], new: list[PlayerState]
+    ) -> dict[str, dict[str, object]] | None:
+        """Return :func:`diff_players` for ``old``, computing it once per base."""
+        cached = self._diffs.get(id(old))
+        if cached is None:
+            cached = (old, diff_players(old, new))
+            self._diffs[id(old)] = cached
+        return cached[1]
+
+    def encode(self, frame: StateFrame) -> str:
+        """Return ``frame`` encoded as a JSON object."""
+        private: dict[str, object] = {}
+        shared: list[tuple[str, object]] = []
+        for key, value in frame.items():
+            if key in SHARED_KEYS:
+                shared.append((key, value))
+            else:
+                private[key] = value
+        encoded = json.dumps(private)
+        if not shared:
+            return encoded
+        cache_key = tuple((key, id(value)) for key, value in shared)
+        cached = self._encoded.get(cache_key)
+        if cached is None:
+            section = ",".join(f"{json.dumps(key)}:{json.dumps(value)}" for key, value in shared)
+            cached = ([value for _, value in shared], section)
+            self._encoded[cache_key] = cached
+        return f"{encoded[:-1]},{cached[1]}}}"
+
+
+class StateTracker:
+    """Client-side holder of the latest game state received from the server."""
+
+    def __init__(self) -> None:
+        self.version = 0
+        self.state: GameState | None = None
+
+    def apply(self, frame: StateFrame) -> GameState | None:
+        """Apply ``frame`` and return the new state.
+
+        Returns ``None`` if the frame does not match the held state, in which
+        case the client should request a resync.
+        """
+        if not frame.get("keyframe") and frame.get("base") != self.version:
+            return None
+        state = apply_frame(self.state, frame)
+        if state is None:
+            return None
+        self.state = state
+        self.version = int(frame.get("version", self.version))
+        return state
+
+
+__all__ = [
+    "KEYFRAME_INTERVAL",
+    "FrameEncoder",
+    "GameState",
+    "PlayerState",
+    "StateFrame",
+    "StateTracker",
+    "apply_frame",
+    "delta",
+    "diff_players",
+    "hand_splice",
+    "is_empty_delta",
+    "keyframe",
+]
@@ -0,0 +1,351 @@
+"""Host rooms in several worker processes behind one listening port.
+
+One Python process runs every room on a single core. :class:`Supervisor`
+starts ``workers`` processes, each a :class:`~bang_py.network.server.BangServer`
+listening on a local port and hosting the rooms that
+:func:`~bang_py.network.server.room_shard` assigns to it. The supervisor
+accepts every client on the public port and asks for the room code as a
+single server would. It then connects to the worker owning that room on the
+client's behalf and relays messages both ways until either side closes.
+A lobby request is sent to every worker and the listings are merged, and
+matchmaking requests are routed by the table they ask for, so players
+waiting for the same kind of table meet in the same worker's queue.
+
+The relay passes messages through without decoding them. Validation, game
+logic and state encoding all run in the workers, so they spread over the
+cores. TLS and compression towards clients are handled by the supervisor;
+the local links to the workers use neither. A worker that exits is started
+again. With ``state_dir`` it restores its rooms from disk, because every
+worker shares that directory.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import logging
+import multiprocessing
+import secrets
+import socket
+import ssl
+from collections.abc import Sequence
+from dataclasses import dataclass
+from multiprocessing.process import BaseProcess
+from pathlib import Path
+from typing import Any
+
+from websockets.asyncio.client import ClientConnection, connect
+from websockets.asyncio.server import ServerConnection, serve
+from websockets.exceptions import ConnectionClosed, WebSocketException
+from websockets.typing import Subprotocol
+
+from .compact import SUBPROTOCOL
+from .matchmaking import table_key
+from .persistence import SNAPSHOT_FILE
+from .server import MAX_MESSAGE_SIZE, WRITE_LIMIT, BangServer, _parse_join_request, room_shard
+from .token_utils import _token_key_bytes
+
+logger = logging.getLogger(__name__)
+
+# Address the workers listen on; only the supervisor connects to them.
+WORKER_HOST = "127.0.0.1"
+# Seconds between checks that every worker process is still running.
+CHECK_INTERVAL = 1.0
+# Seconds to wait for a started worker to accept connections.
+START_TIMEOUT = 30.0
+
+# Close codes that may not be sent in a close frame.
+_RESERVED_CLOSE_CODES = frozenset({1005, 1006, 1015})
+
+
+@dataclass(slots=True)
+class Worker:
+    """A worker process and the rooms it was started with."""
+
+    index: int
+    port: int
+    codes: list[str]
+    process: BaseProcess | None = None
+
+    @property
+    def uri(self) -> str:
+        """Websocket address of the worker."""
+        return f"ws://{WORKER_HOST}:{self.port}"
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind((WORKER_HOST, 0))
+        return int(sock.getsockname()[1])
+
+
+def _run_worker(
+    index: int, count: int, port: int, codes: Sequence[str], options: dict[str, Any]
+) -> None:
+    """Run worker ``index`` of ``count`` until the process is terminated."""
+    server = BangServer(
+        host=WORKER_HOST,
+        port=port,
+        room_code=codes[0] if codes else None,
+        shard=(index, count),
+        **options,
+    )
+    for code in codes[1:]:
+        if code not in server.rooms:
+            server.create_room(code)
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(server.start())
+
+
+async def _wait_for_port(port: int, timeout: float = START_TIMEOUT) -> None:
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while True:
+        try:
+            _reader, writer = await asyncio.open_connection(WORKER_HOST, port)
+        except OSError:
+            if loop.time() > deadline:
+                raise
+            await asyncio.sleep(0.05)
+        else:
+            writer.close()
+            await writer.wait_closed()
+            return
+
+
+async def _forward(
+    source: ServerConnection | ClientConnection, target: ServerConnection | ClientConnection
+) -> None:
+    """Send every message from ``source`` to ``target``, then close ``target`` alike."""
+    try:
+        async for message in source:
+            await target.send(message)
+    except ConnectionClosed:
+        pass
+    finally:
+        code = source.close_code
+        if code is None or code in _RESERVED_CLOSE_CODES:
+            await target.close()
+        else:
+            await target.close(code, source.close_reason or "")
+
+
+def _route(code: str, max_players: int = 7, expansions: list[str] | None = None) -> str:
+    """Return the key deciding which worker handles what a client sent as room code.
+
+    Match requests leaving out the table size or expansions get the
+    workers' ``max_players`` and ``expansions``, as the worker would give
+    them.
+    """
+    request = _parse_join_request(code)
+    if request is None or request.get("match") is not True:
+        return code
+    key = table_key(
+        request.get("players", max_players), request.get("expansions", expansions or [])
+    )
+    return repr(key)
+
+
+class Supervisor:
+    """Accept clients on one port and relay each to the worker hosting its room.
+
+    ``rooms`` rooms are hosted from the start, the first one named
+    ``room_code`` when given, and spread over the workers by code. Rooms
+    stored in ``state_dir`` count towards them. A worker left without any
+    of them hosts one room of its own. ``certfile``, ``keyfile``,
+    ``compact``, ``compression``, ``max_message_size`` and ``write_limit``
+    apply to the public listener as they do for :class:`BangServer`. Worker
+    ``i`` serves its metrics on ``metrics_port + i`` when ``metrics_port`` is
+    given. Any other keyword argument is passed on to every worker's
+    :class:`BangServer`.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        host: str = "localhost",
+        port: int = 8765,
+        rooms: int = 1,
+        room_code: str | None = None,
+        certfile: str | None = None,
+        keyfile: str | None = None,
+        token_key: bytes | str | None = None,
+        compact: bool = True,
+        compression: bool = True,
+        max_message_size: int = MAX_MESSAGE_SIZE,
+        write_limit: int = WRITE_LIMIT,
+        metrics_port: int | None = None,
+        **server_options: Any,
+    ) -> None:
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.host = host
+        self.port = port
+        self.token_key = _token_key_bytes(token_key)
+        self.compact = compact
+        self.compression = compression
+        self.max_message_size = max_message_size
+        self.write_limit = write_limit
+        self.metrics_port = metrics_port
+        self.ssl_context: ssl.SSLContext | None = None
+        if certfile:
+            self.ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            self.ssl_context.load_cert_chain(certfile, keyfile)
+        self.server_options = dict(
+            server_options,
+            token_key=self.token_key,
+            compact=compact,
+            max_message_size=max_message_size,
+        )
+        self.codes: list[str] = [] if room_code is None else [room_code]
+        state_dir = server_options.get("state_dir")
+        if state_dir is not None and Path(state_dir).is_dir():
+            stored = sorted(
+                p.name for p in Path(state_dir).iterdir() if (p / SNAPSHOT_FILE).exists()
+            )
+            self.codes += [code for code in stored if code != room_code]
+        while len(self.codes) < rooms:
+            code = secrets.token_hex(3)
+            if code not in self.codes:
+                self.codes.append(code)
+        self.workers = [
+            Worker(i, 0, [code for code in self.codes if room_shard(code, workers) == i])
+            for i in range(workers)
+        ]
+        self._stopping = False
+
+    def worker_for(self, code: str) -> Worker:
+        """Return the worker hosting room ``code``."""
+        return self.workers[room_shard(code, len(self.workers))]
+
+    async def _listing(self, worker: Worker, request: str) -> list[Any]:
+        """Return the lobby of ``worker``, empty when it cannot be reached."""
+        try:
+            async with connect(worker.uri, compression=None, max_size=None) as upstream:
+                await upstream.recv()
+                await upstream.send(request)
+                reply = json.loads(await upstream.recv())
+        except (OSError, WebSocketException, ValueError) as exc:
+            logger.warning("Worker %d lobby unavailable: %s", worker.index, exc)
+            return []
+        rooms = reply.get("rooms") if isinstance(reply, dict) else None
+        return rooms if isinstance(rooms, list) else []
+
+    async def lobby(self, request: str) -> list[Any]:
+        """Return the open rooms of every worker, asking them all with ``request``."""
+        listings = await asyncio.gather(*(self._listing(w, request) for w in self.workers))
+        return [room for listing in listings for room in listing]
+
+    def _spawn(self, worker: Worker) -> None:
+        options = dict(self.server_options)
+        if self.metrics_port is not None:
+            options["metrics_port"] = self.metrics_port + worker.index
+        ctx = multiprocessing.get_context("spawn")
+        worker.process = ctx.Process(
+            target=_run_worker,
+            args=(worker.index, len(self.workers), worker.port, worker.codes, options),
+            name=f"bang-worker-{worker.index}",
+            daemon=True,
+        )
+        worker.process.start()
+
+    async def _supervise(self) -> None:
+        """Start again every worker process that exits."""
+        while True:
+            await asyncio.sleep(CHECK_INTERVAL)
+            for worker in self.workers:
+                process = worker.process
+                if self._stopping or process is None or process.is_alive():
+                    continue
+                logger.warning(
+                    "Worker %d exited with code %s, restarting", worker.index, process.exitcode
+                )
+                self._spawn(worker)
+
+    def stop(self) -> None:
+        """Terminate every worker process."""
+        self._stopping = True
+        for worker in self.workers:
+            if worker.process is not None:
+                worker.process.terminate()
+        for worker in self.workers:
+            if worker.process is not None:
+                worker.process.join()
+
+    async def handler(self, websocket: ServerConnection) -> None:
+        """Ask ``websocket`` for its room code and relay it to the room's worker."""
+        await websocket.send("Enter room code:")
+        code = await websocket.recv()
+        if not isinstance(code, str):
+            await websocket.send("Invalid room code")
+            return
+        request = _parse_join_request(code)
+        if request is not None and request.get("lobby") is True:
+            await websocket.send(json.dumps({"rooms": await self.lobby(code)}))
+            return
+        worker = self.worker_for(
+            _route(
+                code,
+                self.server_options.get("max_players", 7),
+                self.server_options.get("expansions"),
+            )
+        )
+        subprotocol = websocket.subprotocol
+        try:
+            upstream = await connect(
+                worker.uri,
+                subprotocols=[subprotocol] if subprotocol else None,
+                compression=None,
+                max_size=None,
+            )
+        except (OSError, WebSocketException) as exc:
+            logger.warning("Worker %d unavailable: %s", worker.index, exc)
+            await websocket.send("Server unavailable")
+            return
+        async with upstream:
+            # The worker prompts for the room code the client already sent.
+            await upstream.recv()
+            await upstream.send(code)
+            async with asyncio.TaskGroup() as tg:
+                tg.create_task(_forward(websocket, upstream))
+                tg.create_task(_forward(upstream, websocket))
+
+    def select_subprotocol(
+        self, _websocket: ServerConnection, subprotocols: Sequence[Subprotocol]
+    ) -> Subprotocol | None:
+        """Accept the compact encoding when offered and enabled, else plain JSON."""
+        if self.compact and SUBPROTOCOL in subprotocols:
+            return Subprotocol(SUBPROTOCOL)
+        return None
+
+    async def start(self) -> None:
+        """Start the workers and the public listener and run until cancelled."""
+        for worker in self.workers:
+            worker.port = _free_port()
+            self._spawn(worker)
+        try:
+            await asyncio.gather(*(_wait_for_port(worker.port) for worker in self.workers))
+            async with serve(
+                self.handler,
+                self.host,
+                self.port,
+                ssl=self.ssl_context,
+                compression="deflate" if self.compression else None,
+                max_size=self.max_message_size,
+                write_limit=self.write_limit,
+                select_subprotocol=self.select_subprotocol,
+            ):
+                logger.info(
+                    "Supervisor started on %s:%s (workers: %d, rooms: %s)",
+                    self.host,
+                    self.port,
+                    len(self.workers),
+                    ", ".join(self.codes),
+                )
+                await self._supervise()
+        finally:
+            self.stop()
+
+
+__all__ = ["Supervisor", "Worker"]
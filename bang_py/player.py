@@ -13,7 +13,6 @@ from .cards.roles import (
     SheriffRoleCard,
 )
 
-
 if TYPE_CHECKING:  # pragma: no cover - for type hints only
     from .characters.base import BaseCharacter
     from .cards.card import BaseCard
@@ -90,7 +89,16 @@ class Player:
     @health.setter
     def health(self, value: int) -> None:
         """Set current health clamping between 0 and ``max_health``."""
-        self._health = max(0, min(value, self.max_health))
+        health = max(0, min(value, self.max_health))
+        if (health > 0) != (getattr(self, "_health", 0) > 0):
+            self._invalidate_distances()
+        self._health = health
+
+    def _invalidate_distances(self) -> None:
+        """Tell the game that distances involving this player changed."""
+        game = self._metadata.game
+        if game is not None:
+            game.invalidate_distances()
 
     def reset_stats(self) -> None:
         """Recalculate health and abilities after assigning role or character."""
@@ -104,6 +112,7 @@ class Player:
         self.metadata.abilities.clear()
         if self.character is not None:
             self.metadata.abilities.add(self.character.__class__)
+        self._invalidate_distances()
 
     def _apply_health_modifier(self, amount: int) -> None:
         """Adjust max and current health by a modifier."""
@@ -133,6 +142,7 @@ class Player:
             modifier = int(getattr(card, "max_health_modifier", 0))
             if modifier:
                 self._apply_health_modifier(modifier)
+        self._invalidate_distances()
 
     def unequip(self, card_name: str) -> "BaseCard | None":
         """Remove equipment by name and adjust health if needed."""
@@ -141,6 +151,7 @@ class Player:
             modifier = int(getattr(card, "max_health_modifier", 0))
             if modifier and getattr(card, "active", True):
                 self._apply_health_modifier(-modifier)
+            self._invalidate_distances()
         return card
 
     @property
@@ -194,33 +205,17 @@ class Player:
         return rng
 
     def distance_to(self, other: "Player") -> int:
-        """Return distance to another player considering equipment and abilities."""
+        """Return distance to another player considering equipment and abilities.
+
+        Seated players read the distance from the game's cached matrix.
+        Players outside a game are treated as neighbours.
+        """
         game = self.metadata.game
-        players = getattr(game, "players", None)
-
-        base = 1
-        if players and self in players and other in players:
-            base = self._seated_distance(self, other, players)
-        if getattr(game, "event_flags", {}).get("ambush"):
-            base = 1
-
-        ignore_other_bonus = False
-        if game and game.turn_order:
-            current = game.players[game.turn_order[game.current_turn % len(game.turn_order)]]
-            if current is self and current.metadata.ignore_others_equipment:
-                ignore_other_bonus = True
-
-        distance = base + (0 if ignore_other_bonus else other.distance_bonus) - self.range_bonus
-        return max(1, distance)
-
-    @staticmethod
-    def _seated_distance(player: "Player", other: "Player", players: list["Player"]) -> int:
-        """Return the seat distance between two players counting only the living."""
-        alive = [p for p in players if p.is_alive()]
-        p_index = alive.index(player)
-        o_index = alive.index(other)
-        diff = abs(p_index - o_index)
-        return min(diff, len(alive) - diff)
+        if game is not None:
+            distance = game._distances.distance(game, self, other)
+            if distance is not None:
+                return distance
+        return max(1, 1 + other.distance_bonus - self.range_bonus)
 
     def take_damage(self, amount: int) -> None:
         """Decrease health but not below zero."""
@@ -0,0 +1,34 @@
+"""Headless simulation of complete games driven by bot policies."""
+
+from __future__ import annotations
+
+from .bots import AggressiveBot, BotPolicy, POLICIES, RandomBot, create_policy, register_policy
+from .engine import (
+    DEFAULT_MAX_TURNS,
+    GameResult,
+    SimulationStats,
+    iter_games,
+    play_out,
+    run_simulations,
+    simulate_game,
+)
+from .parallel import DEFAULT_SHARD_SIZE, iter_parallel, run_parallel
+
+__all__ = [
+    "AggressiveBot",
+    "BotPolicy",
+    "DEFAULT_MAX_TURNS",
+    "DEFAULT_SHARD_SIZE",
+    "GameResult",
+    "POLICIES",
+    "RandomBot",
+    "SimulationStats",
+    "create_policy",
+    "iter_games",
+    "iter_parallel",
+    "play_out",
+    "register_policy",
+    "run_parallel",
+    "run_simulations",
+    "simulate_game",
+]
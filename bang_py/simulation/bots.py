@@ -0,0 +1,137 @@
+"""Bot policies that play turns for headless simulations."""
+
+from __future__ import annotations
+
+import random
+from collections.abc import Callable
+from typing import Protocol
+
+from ..cards import BeerCard
+from ..cards.card import BaseCard
+from ..game_manager import GameManager
+from ..legal_actions import LegalAction
+from ..player import Player
+
+# Upper bound on plays in a single turn so a misbehaving policy cannot stall a game.
+MAX_PLAYS_PER_TURN = 50
+
+
+class BotPolicy(Protocol):
+    """Decide which cards a player plays during their turn."""
+
+    name: str
+
+    def play_turn(self, gm: GameManager, player: Player) -> None:
+        """Play cards for ``player`` after the draw phase has been resolved."""
+        ...
+
+
+def _try_play(gm: GameManager, player: Player, card: BaseCard, target: Player | None) -> bool:
+    """Play ``card`` and return ``True`` if the game accepted it."""
+    gm.play_card(player, card, target)
+    return card not in player.hand
+
+
+def _card_plays(gm: GameManager, player: Player) -> list[LegalAction]:
+    """Return the legal card plays of ``player``, leaving out ability uses."""
+    return [a for a in gm.legal_actions(player) if a.ability is None]
+
+
+class AggressiveBot:
+    """Equip everything, heal when hurt and shoot whoever is in range.
+
+    Only plays listed by :meth:`GameManager.legal_actions` are considered.
+    The first card in hand with a legal play is used against a random one
+    of its legal targets.
+    """
+
+    name = "aggressive"
+
+    def __init__(self, rng: random.Random) -> None:
+        self.rng = rng
+
+    def _choose(
+        self, gm: GameManager, player: Player, rejected: set[int]
+    ) -> tuple[BaseCard, Player | None] | None:
+        targets: dict[int, list[Player | None]] = {}
+        for action in _card_plays(gm, player):
+            targets.setdefault(id(action.card), []).append(action.target)
+        for card in player.hand:
+            options = targets.get(id(card))
+            if not options or id(card) in rejected:
+                continue
+            if isinstance(card, BeerCard):
+                alive = [p for p in gm.players if p.is_alive()]
+                if player.health >= player.max_health or len(alive) <= 2:
+                    continue
+            return card, self.rng.choice(options)
+        return None
+
+    def play_turn(self, gm: GameManager, player: Player) -> None:
+        """Play the first useful card until nothing more can be played."""
+        rejected: set[int] = set()
+        for _ in range(MAX_PLAYS_PER_TURN):
+            if not player.is_alive():
+                return
+            choice = self._choose(gm, player, rejected)
+            if choice is None:
+                return
+            card, target = choice
+            if not _try_play(gm, player, card, target):
+                rejected.add(id(card))
+
+
+class RandomBot:
+    """Make uniformly random legal card plays until none is left."""
+
+    name = "random"
+
+    def __init__(self, rng: random.Random) -> None:
+        self.rng = rng
+
+    def play_turn(self, gm: GameManager, player: Player) -> None:
+        """Play random legal cards while ``player`` is alive and has any."""
+        for _ in range(MAX_PLAYS_PER_TURN):
+            if not player.is_alive():
+                return
+            actions = _card_plays(gm, player)
+            if not actions:
+                return
+            action = self.rng.choice(actions)
+            if action.card is not None:
+                gm.play_card(player, action.card, action.target)
+
+
+POLICIES: dict[str, Callable[[random.Random], BotPolicy]] = {
+    AggressiveBot.name: AggressiveBot,
+    RandomBot.name: RandomBot,
+}
+
+
+def register_policy(name: str, factory: Callable[[random.Random], BotPolicy]) -> None:
+    """Make ``factory`` available to the simulator under ``name``."""
+    POLICIES[name] = factory
+
+
+def create_policy(name: str, rng: random.Random) -> BotPolicy:
+    """Instantiate the policy registered as ``name``.
+
+    Raises:
+        ValueError: If no policy is registered under ``name``.
+    """
+    try:
+        factory = POLICIES[name]
+    except KeyError:
+        raise ValueError(f"Unknown bot policy {name!r}") from None
+    return factory(rng)
+
+
+__all__ = [
+    "AggressiveBot",
+    "BotPolicy",
+    "MAX_PLAYS_PER_TURN",
+    "POLICIES",
+    "RandomBot",
+    "create_policy",
+    "register_policy",
+]
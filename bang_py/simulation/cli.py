@@ -0,0 +1,74 @@
+"""Command-line interface for running batches of simulated games."""
+
+from __future__ import annotations
+
+import argparse
+from collections.abc import Sequence
+
+from .bots import POLICIES
+from .engine import DEFAULT_MAX_TURNS, run_simulations
+from .parallel import run_parallel
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    """Parse ``argv``, simulate the requested games and print a summary.
+
+    Seats are assigned the ``--policy`` values in rotation, so passing
+    ``--policy aggressive --policy random`` alternates the two bots.
+    """
+
+    parser = argparse.ArgumentParser(description="Simulate Bang games headless")
+    parser.add_argument("--games", type=int, default=100, help="Number of games to play")
+    parser.add_argument("--players", type=int, default=5, help="Seats per game (3-8)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the first game")
+    parser.add_argument(
+        "--policy",
+        action="append",
+        choices=sorted(POLICIES),
+        help="Bot policy for the seats; repeat to rotate several policies",
+    )
+    parser.add_argument(
+        "--expansion",
+        action="append",
+        default=[],
+        help="Enable an expansion; may be repeated",
+    )
+    parser.add_argument(
+        "--max-turns",
+        type=int,
+        default=DEFAULT_MAX_TURNS,
+        help="Abandon games that have not finished after this many turns",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes; 0 uses every core and 1 runs in-process",
+    )
+    args = parser.parse_args(argv)
+
+    policies = args.policy or ["aggressive"]
+    if args.workers == 1:
+        stats = run_simulations(
+            args.games,
+            args.players,
+            policies,
+            seed=args.seed,
+            expansions=args.expansion,
+            max_turns=args.max_turns,
+        )
+    else:
+        stats = run_parallel(
+            args.games,
+            args.players,
+            policies,
+            seed=args.seed,
+            expansions=args.expansion,
+            max_turns=args.max_turns,
+            workers=args.workers or None,
+        )
+    print(stats.report())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+"""Run complete Bang games without a network or UI."""
+
+from __future__ import annotations
+
+import random
+from collections import Counter
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass, field
+from time import perf_counter
+
+from ..game_manager import GameManager
+from ..player import Player
+from .bots import BotPolicy, create_policy
+
+# Turns after which an unfinished game is abandoned.
+DEFAULT_MAX_TURNS = 500
+
+
+@dataclass(slots=True, frozen=True)
+class GameResult:
+    """Outcome of a single simulated game."""
+
+    seed: int
+    num_players: int
+    winner: str | None
+    roles: tuple[str, ...]
+    winning_roles: tuple[str, ...]
+    turns: int
+    duration: float
+
+    @property
+    def finished(self) -> bool:
+        """Return ``True`` if the game ended with a winner."""
+        return self.winner is not None
+
+
+@dataclass(slots=True)
+class SimulationStats:
+    """Aggregate statistics over many :class:`GameResult` objects."""
+
+    games: int = 0
+    finished: int = 0
+    turns: int = 0
+    min_turns: int | None = None
+    max_turns: int = 0
+    game_time: float = 0.0
+    wall_time: float = 0.0
+    outcomes: Counter[str] = field(default_factory=Counter)
+    role_games: Counter[str] = field(default_factory=Counter)
+    role_wins: Counter[str] = field(default_factory=Counter)
+
+    def add(self, result: GameResult) -> None:
+        """Fold ``result`` into the totals."""
+        self.games += 1
+        self.turns += result.turns
+        self.game_time += result.duration
+        self.max_turns = max(self.max_turns, result.turns)
+        if self.min_turns is None or result.turns < self.min_turns:
+            self.min_turns = result.turns
+        self.role_games.update(set(result.roles))
+        if result.winner is None:
+            self.outcomes["unfinished"] += 1
+            return
+        self.finished += 1
+        self.outcomes[result.winner] += 1
+        self.role_wins.update(set(result.winning_roles))
+
+    def merge(self, other: SimulationStats) -> None:
+        """Add the totals of ``other`` to these statistics."""
+        self.games += other.games
+        self.finished += other.finished
+        self.turns += other.turns
+        self.game_time += other.game_time
+        self.wall_time += other.wall_time
+        self.max_turns = max(self.max_turns, other.max_turns)
+        if other.min_turns is not None and (
+            self.min_turns is None or other.min_turns < self.min_turns
+        ):
+            self.min_turns = other.min_turns
+        self.outcomes.update(other.outcomes)
+        self.role_games.update(other.role_games)
+        self.role_wins.update(other.role_wins)
+
+    @property
+    def mean_turns(self) -> float:
+        """Average number of turns per game."""
+        return self.turns / self.games if self.games else 0.0
+
+    @property
+    def games_per_second(self) -> float:
+        """Throughput based on wall time, or on game time if none was recorded."""
+        elapsed = self.wall_time or self.game_time
+        return self.games / elapsed if elapsed else 0.0
+
+    def win_rates(self) -> dict[str, float]:
+        """Return the share of games won by each role it took part in."""
+        return {
+            role: self.role_wins[role] / count
+            for role, count in sorted(self.role_games.items())
+            if count
+        }
+
+    def report(self) -> str:
+        """Return a human readable summary."""
+        lines = [
+            f"games: {self.games} ({self.finished} finished)",
+            f"games/sec: {self.games_per_second:.1f}",
+            f"turns: mean {self.mean_turns:.1f}, min {self.min_turns or 0}, max {self.max_turns}",
+            "win rates:",
+        ]
+        lines.extend(f"  {role}: {rate:.1%}" for role, rate in self.win_rates().items())
+        lines.append("outcomes:")
+        lines.extend(f"  {name}: {count}" for name, count in self.outcomes.most_common())
+        return "\n".join(lines)
+
+
+def play_out(
+    gm: GameManager, bots: Sequence[BotPolicy], max_turns: int = DEFAULT_MAX_TURNS
+) -> tuple[str | None, int]:
+    """Let ``bots`` play ``gm`` from its current position until the game ends.
+
+    ``bots`` holds one policy per seat. Returns the victory message, or
+    ``None`` if ``max_turns`` turns passed first, and the number of turns
+    played.
+    """
+    outcome: list[str] = []
+    record = outcome.append
+    gm.game_over_listeners.append(record)
+    turns = 0
+    try:
+        while not outcome and gm.turn_order and turns < max_turns:
+            idx = gm.turn_order[gm.current_turn]
+            player = gm.players[idx]
+            if player.is_alive():
+                if player.metadata.awaiting_draw:
+                    gm.draw_phase(player)
+                bots[idx].play_turn(gm, player)
+            if outcome or not gm.turn_order:
+                break
+            gm.end_turn()
+            turns += 1
+    finally:
+        gm.game_over_listeners.remove(record)
+    return (outcome[0] if outcome else None), turns
+
+
+def simulate_game(
+    seed: int,
+    num_players: int = 5,
+    policies: Sequence[str] = ("aggressive",),
+    *,
+    expansions: Iterable[str] = (),
+    max_turns: int = DEFAULT_MAX_TURNS,
+) -> GameResult:
+    """Play one game to completion and return its result.
+
+    Parameters
+    ----------
+    seed:
+        Seed for the game's random generator. The bots draw from their own
+        generator derived from it, so the game's shuffles depend only on the
+        commands played and a recorded game replays exactly.
+    num_players:
+        Number of seats at the table.
+    policies:
+        Names of registered bot policies assigned to the seats in rotation.
+    expansions:
+        Expansion names passed to :class:`GameManager`.
+    max_turns:
+        Turns after which the game is abandoned without a winner.
+    """
+    start = perf_counter()
+    gm = GameManager(expansions=list(expansions), seed=seed)
+    for i in range(num_players):
+        gm.add_player(Player(f"Bot{i}"))
+    bot_rng = random.Random(f"bots:{seed}")
+    bots: list[BotPolicy] = [
+        create_policy(policies[i % len(policies)], bot_rng) for i in range(num_players)
+    ]
+
+    gm.start_game()
+    winner, turns = play_out(gm, bots, max_turns)
+    roles = tuple(p.role.card_name for p in gm.players if p.role)
+    winning_roles = tuple(
+        p.role.card_name for p in gm.players if p.role and p.role.victory_message == winner
+    )
+    return GameResult(
+        seed=seed,
+        num_players=num_players,
+        winner=winner,
+        roles=roles,
+        winning_roles=winning_roles,
+        turns=turns,
+        duration=perf_counter() - start,
+    )
+
+
+def iter_games(
+    games: int,
+    num_players: int = 5,
+    policies: Sequence[str] = ("aggressive",),
+    *,
+    seed: int = 0,
+    expansions: Iterable[str] = (),
+    max_turns: int = DEFAULT_MAX_TURNS,
+) -> Iterator[GameResult]:
+    """Yield the results of ``games`` games seeded ``seed``, ``seed + 1``, ..."""
+    expansions = tuple(expansions)
+    for offset in range(games):
+        yield simulate_game(
+            seed + offset,
+            num_players,
+            policies,
+            expansions=expansions,
+            max_turns=max_turns,
+        )
+
+
+def run_simulations(
+    games: int,
+    num_players: int = 5,
+    policies: Sequence[str] = ("aggressive",),
+    *,
+    seed: int = 0,
+    expansions: Iterable[str] = (),
+    max_turns: int = DEFAULT_MAX_TURNS,
+) -> SimulationStats:
+    """Play ``games`` games sequentially and return their aggregate statistics."""
+    stats = SimulationStats()
+    start = perf_counter()
+    for result in iter_games(
+        games,
+        num_players,
+        policies,
+        seed=seed,
+        expansions=expansions,
+        max_turns=max_turns,
+    ):
+        stats.add(result)
+    stats.wall_time = perf_counter() - start
+    return stats
+
+
+__all__ = [
+    "DEFAULT_MAX_TURNS",
+    "GameResult",
+    "SimulationStats",
+    "iter_games",
+    "play_out",
+    "run_simulations",
+    "simulate_game",
+]
@@ -0,0 +1,116 @@
+"""Spread simulated games across worker processes."""
+
+from __future__ import annotations
+
+import os
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, as_completed, wait
+from time import perf_counter
+
+from .engine import DEFAULT_MAX_TURNS, GameResult, SimulationStats, iter_games
+
+# Games handed to a worker at once. Small shards keep results streaming back
+# while amortizing the cost of pickling the arguments and results.
+DEFAULT_SHARD_SIZE = 32
+
+
+def _run_shard(
+    seed: int,
+    games: int,
+    num_players: int,
+    policies: tuple[str, ...],
+    expansions: tuple[str, ...],
+    max_turns: int,
+) -> list[GameResult]:
+    return list(
+        iter_games(
+            games,
+            num_players,
+            policies,
+            seed=seed,
+            expansions=expansions,
+            max_turns=max_turns,
+        )
+    )
+
+
+def iter_parallel(
+    games: int,
+    num_players: int = 5,
+    policies: Sequence[str] = ("aggressive",),
+    *,
+    seed: int = 0,
+    expansions: Iterable[str] = (),
+    max_turns: int = DEFAULT_MAX_TURNS,
+    workers: int | None = None,
+    shard_size: int = DEFAULT_SHARD_SIZE,
+) -> Iterator[GameResult]:
+    """Yield game results from a process pool as shards complete.
+
+    Seeds ``seed`` to ``seed + games - 1`` are split into shards of
+    ``shard_size`` games. At most two shards per worker are queued at a time
+    so memory stays flat for very large batches. Results arrive in completion
+    order, not seed order.
+
+    Policies registered with :func:`~bang_py.simulation.register_policy` are
+    only visible to workers that import the registering module, which is the
+    case with the ``fork`` start method or when registration happens at
+    import time.
+    """
+    workers = workers or os.cpu_count() or 1
+    args = (num_players, tuple(policies), tuple(expansions), max_turns)
+    shards = (
+        (start, min(shard_size, seed + games - start))
+        for start in range(seed, seed + games, shard_size)
+    )
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: set[Future[list[GameResult]]] = set()
+        for start, count in shards:
+            pending.add(pool.submit(_run_shard, start, count, *args))
+            if len(pending) < workers * 2:
+                continue
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
+        for future in as_completed(pending):
+            yield from future.result()
+
+
+def run_parallel(
+    games: int,
+    num_players: int = 5,
+    policies: Sequence[str] = ("aggressive",),
+    *,
+    seed: int = 0,
+    expansions: Iterable[str] = (),
+    max_turns: int = DEFAULT_MAX_TURNS,
+    workers: int | None = None,
+    shard_size: int = DEFAULT_SHARD_SIZE,
+    on_result: Callable[[GameResult, SimulationStats], None] | None = None,
+) -> SimulationStats:
+    """Play ``games`` games on a process pool and return merged statistics.
+
+    ``on_result`` is called in the parent process after each result has been
+    added, receiving the running totals for progress reporting.
+    """
+    stats = SimulationStats()
+    start = perf_counter()
+    for result in iter_parallel(
+        games,
+        num_players,
+        policies,
+        seed=seed,
+        expansions=expansions,
+        max_turns=max_turns,
+        workers=workers,
+        shard_size=shard_size,
+    ):
+        stats.add(result)
+        stats.wall_time = perf_counter() - start
+        if on_result is not None:
+            on_result(result, stats)
+    stats.wall_time = perf_counter() - start
+    return stats
+
+
+__all__ = ["DEFAULT_SHARD_SIZE", "iter_parallel", "run_parallel"]
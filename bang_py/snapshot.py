@@ -0,0 +1,255 @@
+"""Capture and rehydrate complete game states.
+
+A :class:`GameSnapshot` stores the mutable state of a :class:`GameManager`
+as plain values: card classes with their attribute dictionaries, seat
+indices instead of player references and the random generator state. It
+keeps no listeners, bound handlers or live card objects, so it is cheap to
+take, is unaffected by further play and can be restored any number of times,
+for example to run Monte Carlo rollouts from the same position.
+"""
+
+from __future__ import annotations
+
+import random
+from collections import deque
+from operator import attrgetter
+from dataclasses import MISSING, dataclass, fields
+from typing import TYPE_CHECKING, Any, cast
+
+from .cards.card import BaseCard
+from .cards.roles import BaseRole
+from .characters.base import BaseCharacter
+from .deck import Deck
+from .event_flags import EventFlags
+from .events.event_decks import EventCard
+from .player import Player, PlayerMetadata
+
+if TYPE_CHECKING:  # pragma: no cover - imported for type checking
+    from .game_manager import GameManager
+
+CardState = tuple[type[BaseCard], dict[str, Any]]
+
+# Player metadata is stored as a tuple of field values in this order. The game
+# back-reference is set again when the player is seated.
+_METADATA_FIELDS = tuple(f.name for f in fields(PlayerMetadata) if f.name != "game")
+_get_metadata = attrgetter(*_METADATA_FIELDS)
+# Fields holding mutable containers that must not be shared with the snapshot.
+_CONTAINER_METADATA = tuple(
+    _METADATA_FIELDS.index(f.name)
+    for f in fields(PlayerMetadata)
+    if f.default_factory is not MISSING
+)
+_CARD_METADATA = tuple(_METADATA_FIELDS.index(n) for n in ("kit_cards", "lucky_cards"))
+_CHARACTER_METADATA = _METADATA_FIELDS.index("unused_character")
+
+
+@dataclass(slots=True, frozen=True)
+class PlayerSnapshot:
+    """State of a single seat."""
+
+    name: str
+    role: type[BaseRole] | None
+    character: type[BaseCharacter] | None
+    max_health: int
+    health: int
+    hand: tuple[CardState, ...]
+    equipment: tuple[tuple[str, CardState], ...]
+    metadata: tuple[Any, ...]
+
+
+@dataclass(slots=True, frozen=True)
+class GameSnapshot:
+    """State of a whole game as returned by :func:`snapshot`."""
+
+    players: tuple[PlayerSnapshot, ...]
+    expansions: tuple[str, ...]
+    deck: tuple[CardState, ...] | None
+    discard_pile: tuple[CardState, ...]
+    current_turn: int
+    turn_order: tuple[int, ...]
+    event_deck: tuple[EventCard, ...] | None
+    current_event: EventCard | None
+    event_flags: tuple[tuple[str, Any], ...]
+    first_eliminated: int | None
+    sheriff_turns: int
+    phase: str
+    general_store_cards: tuple[CardState, ...] | None
+    general_store_order: tuple[int, ...] | None
+    general_store_index: int
+    duel_counts: tuple[tuple[str, int], ...] | None
+    seed: int | None
+    rng_state: tuple[Any, ...]
+
+
+class _SeatRef(int):
+    """Seat index standing in for a player reference inside event flags."""
+
+
+def _card_state(card: BaseCard) -> CardState:
+    return type(card), card.__dict__.copy()
+
+
+def _cards(cards: Any) -> tuple[CardState, ...]:
+    return tuple([(type(c), c.__dict__.copy()) for c in cards])
+
+
+def _rebuild_card(state: CardState) -> BaseCard:
+    cls, attrs = state
+    card = cls.__new__(cls)
+    card.__dict__.update(attrs)
+    return card
+
+
+def _rebuild_cards(states: tuple[CardState, ...]) -> list[BaseCard]:
+    return [_rebuild_card(s) for s in states]
+
+
+def _encode_flag(value: Any, seats: dict[int, int]) -> Any:
+    if isinstance(value, Player):
+        return _SeatRef(seats[id(value)])
+    if isinstance(value, set):
+        return frozenset(_encode_flag(v, seats) for v in value)
+    return value
+
+
+def _decode_flag(value: Any, players: list[Player]) -> Any:
+    if isinstance(value, _SeatRef):
+        return players[value]
+    if isinstance(value, frozenset):
+        return {_decode_flag(v, players) for v in value}
+    return value
+
+
+def _snapshot_metadata(meta: PlayerMetadata) -> tuple[Any, ...]:
+    values = list(_get_metadata(meta))
+    for idx in _CONTAINER_METADATA:
+        values[idx] = values[idx].copy()
+    for idx in _CARD_METADATA:
+        if values[idx] is not None:
+            values[idx] = _cards(values[idx])
+    if values[_CHARACTER_METADATA] is not None:
+        values[_CHARACTER_METADATA] = type(values[_CHARACTER_METADATA])
+    return tuple(values)
+
+
+def _restore_metadata(meta: PlayerMetadata, stored: tuple[Any, ...]) -> None:
+    values = list(stored)
+    for idx in _CONTAINER_METADATA:
+        values[idx] = values[idx].copy()
+    for idx in _CARD_METADATA:
+        if values[idx] is not None:
+            values[idx] = _rebuild_cards(values[idx])
+    if values[_CHARACTER_METADATA] is not None:
+        values[_CHARACTER_METADATA] = values[_CHARACTER_METADATA]()
+    for name, value in zip(_METADATA_FIELDS, values):
+        setattr(meta, name, value)
+
+
+def _snapshot_player(player: Player) -> PlayerSnapshot:
+    return PlayerSnapshot(
+        name=player.name,
+        role=type(player.role) if player.role else None,
+        character=type(player.character) if player.character else None,
+        max_health=player.max_health,
+        health=player.health,
+        hand=_cards(player.hand),
+        equipment=tuple((slot, _card_state(c)) for slot, c in player.equipment.items()),
+        metadata=_snapshot_metadata(player.metadata),
+    )
+
+
+def snapshot(gm: GameManager) -> GameSnapshot:
+    """Return a snapshot of ``gm`` that later play does not affect."""
+    players = list(gm.players)
+    seats = {id(p): i for i, p in enumerate(players)}
+    order = gm.general_store_order
+    duel_counts = gm._duel_counts
+    return GameSnapshot(
+        players=tuple(_snapshot_player(p) for p in players),
+        expansions=tuple(gm.expansions),
+        deck=_cards(gm.deck.cards) if gm.deck is not None else None,
+        discard_pile=_cards(gm.discard_pile),
+        current_turn=gm.current_turn,
+        turn_order=tuple(gm.turn_order),
+        event_deck=tuple(gm.event_deck) if gm.event_deck is not None else None,
+        current_event=gm.current_event,
+        event_flags=tuple(
+            (key, _encode_flag(value, seats)) for key, value in gm.event_flags.items()
+        ),
+        first_eliminated=(
+            seats[id(gm.first_eliminated)] if gm.first_eliminated is not None else None
+        ),
+        sheriff_turns=gm.sheriff_turns,
+        phase=gm.phase,
+        general_store_cards=(
+            _cards(gm.general_store_cards) if gm.general_store_cards is not None else None
+        ),
+        general_store_order=tuple(seats[id(p)] for p in order) if order is not None else None,
+        general_store_index=gm.general_store_index,
+        duel_counts=tuple(duel_counts.items()) if duel_counts is not None else None,
+        seed=gm.seed,
+        rng_state=gm.rng.getstate(),
+    )
+
+
+def restore(snap: GameSnapshot) -> GameManager:
+    """Return a new :class:`GameManager` in the state captured by ``snap``.
+
+    Character abilities are re-run while seating the players so their
+    listeners are registered on the new game. Listeners added by other code,
+    such as a server room, are not part of the snapshot and must be attached
+    again by the caller.
+    """
+    from .game_manager import GameManager
+
+    rng = random.Random()
+    rng.setstate(snap.rng_state)
+    # Start without expansions so no event deck is built only to be replaced.
+    gm = GameManager(deck=Deck(rng=rng), rng=rng)
+    gm.expansions = list(snap.expansions)
+    gm.seed = snap.seed
+    if snap.deck is None:
+        gm.deck = None
+    else:
+        cast(Deck, gm.deck).cards = deque(_rebuild_cards(snap.deck))
+
+    players: list[Player] = []
+    for ps in snap.players:
+        player = Player(
+            ps.name,
+            role=ps.role() if ps.role else None,  # type: ignore[abstract]
+            character=ps.character() if ps.character else None,  # type: ignore[abstract]
+        )
+        gm.add_player(player)
+        player.max_health = ps.max_health
+        player.health = ps.health
+        player.hand = _rebuild_cards(ps.hand)
+        for slot, state in ps.equipment:
+            player._equipment[slot] = _rebuild_card(state)
+        _restore_metadata(player.metadata, ps.metadata)
+        players.append(player)
+
+    gm.discard_pile = _rebuild_cards(snap.discard_pile)
+    gm.current_turn = snap.current_turn
+    gm.turn_order = list(snap.turn_order)
+    gm.event_deck = deque(snap.event_deck) if snap.event_deck is not None else None
+    gm.current_event = snap.current_event
+    gm.event_flags = cast(
+        EventFlags, {key: _decode_flag(value, players) for key, value in snap.event_flags}
+    )
+    if snap.first_eliminated is not None:
+        gm.first_eliminated = players[snap.first_eliminated]
+    gm.sheriff_turns = snap.sheriff_turns
+    gm.phase = snap.phase
+    if snap.general_store_cards is not None:
+        gm.general_store_cards = _rebuild_cards(snap.general_store_cards)
+    if snap.general_store_order is not None:
+        gm.general_store_order = [players[i] for i in snap.general_store_order]
+    gm.general_store_index = snap.general_store_index
+    if snap.duel_counts is not None:
+        gm._duel_counts = dict(snap.duel_counts)
+    gm.invalidate_distances()
+    return gm
+
+
+__all__ = ["CardState", "GameSnapshot", "PlayerSnapshot", "restore", "snapshot"]
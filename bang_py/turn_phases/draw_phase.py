@@ -77,6 +77,7 @@ class DrawPhaseMixin:
         blood_target: "Player" | None = None,
     ) -> None:
         """Execute the draw phase for ``player``."""
+        player.metadata.awaiting_draw = False
         if self._draw_pre_checks(player, skip_heal=skip_heal, blood_target=blood_target):
             return
 
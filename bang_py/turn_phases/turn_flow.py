@@ -4,11 +4,7 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-from ..characters.jesse_jones import JesseJones
-from ..characters.jose_delgado import JoseDelgado
-from ..characters.kit_carlson import KitCarlson
-from ..characters.pat_brennan import PatBrennan
-from ..characters.pedro_ramirez import PedroRamirez
+from ..characters.base import DRAW_PROMPTS
 from ..deck import Deck
 from ..event_flags import EventFlags
 from ..game_manager_protocol import GameManagerProtocol
@@ -53,6 +49,7 @@ class TurnFlowMixin:
                 modifier = int(getattr(eq, "max_health_modifier", 0))
                 if modifier:
                     player._apply_health_modifier(modifier)
+                self.invalidate_distances()
 
     def _resolve_dynamite(self: GameManagerProtocol, player: "Player") -> bool:
         """Handle Dynamite at turn start. Returns ``False`` if the player dies."""
@@ -87,14 +84,7 @@ class TurnFlowMixin:
 
     def _handle_character_draw_abilities(self: GameManagerProtocol, player: "Player") -> bool:
         """Trigger characters that modify the draw phase."""
-        ability_chars = (
-            JesseJones,
-            KitCarlson,
-            PedroRamirez,
-            JoseDelgado,
-            PatBrennan,
-        )
-        if isinstance(player.character, ability_chars):
+        if type(player.character) in DRAW_PROMPTS:
             player.metadata.awaiting_draw = True
             for cb in self.turn_started_listeners:
                 cb(player)
@@ -135,6 +125,7 @@ class TurnFlowMixin:
         """Finish the current player's turn and advance to the next."""
         if not self.turn_order:
             return
+        self.current_turn %= len(self.turn_order)
         idx = self.turn_order[self.current_turn]
         player = self._players[idx]
         self.phase = "discard"
@@ -156,6 +147,7 @@ class TurnFlowMixin:
                 modifier = int(getattr(eq, "max_health_modifier", 0))
                 if modifier:
                     player._apply_health_modifier(modifier)
+                self.invalidate_distances()
 
     def _advance_turn(self: GameManagerProtocol) -> None:
         """Move the turn pointer and start the next turn."""
@@ -16,9 +16,11 @@ from websockets import (
     connect,
 )  # type: ignore[import-not-found]
 from websockets.protocol import State  # type: ignore[import-not-found]
+from websockets.typing import Subprotocol  # type: ignore[import-not-found]
 
-from ...network.server import BangServer
-
+from ...network.client import RECONNECT_DELAY
+from ...network.compact import SUBPROTOCOL, decode_frame
+from ...network.server import MAX_MESSAGE_SIZE, WRITE_LIMIT, BangServer
 
 if TYPE_CHECKING:
 
@@ -41,6 +43,9 @@ class ServerThread(_QThread):
         max_players: int,
         certfile: str | None = None,
         keyfile: str | None = None,
+        compression: bool = True,
+        max_message_size: int = MAX_MESSAGE_SIZE,
+        write_limit: int = WRITE_LIMIT,
     ) -> None:
         super().__init__()
         self.host = host
@@ -50,6 +55,9 @@ class ServerThread(_QThread):
         self.max_players = max_players
         self.certfile = certfile
         self.keyfile = keyfile
+        self.compression = compression
+        self.max_message_size = max_message_size
+        self.write_limit = write_limit
         self.loop = asyncio.new_event_loop()
         self.server_task: asyncio.Task | None = None
 
@@ -64,6 +72,9 @@ class ServerThread(_QThread):
             self.max_players,
             self.certfile,
             self.keyfile,
+            compression=self.compression,
+            max_message_size=self.max_message_size,
+            write_limit=self.write_limit,
         )
         self.server_task = self.loop.create_task(server.start())
         try:
@@ -82,7 +93,13 @@ class ServerThread(_QThread):
 
 
 class ClientThread(_QThread):
-    """Manage a websocket client connection in a background thread."""
+    """Manage a websocket client connection in a background thread.
+
+    The compact state encoding is offered to the server and binary state
+    frames are decoded here, so :attr:`message_received` always carries text.
+    The thread joins with a session and, when the connection drops, keeps
+    trying to resume the seat until the server's grace period runs out.
+    """
 
     message_received = QtCore.Signal(str)
 
@@ -94,6 +111,9 @@ class ClientThread(_QThread):
         self.cafile = cafile
         self.loop = asyncio.new_event_loop()
         self.websocket: ClientConnection | None = None
+        self.session: str | None = None
+        self.grace = 0.0
+        self._stopping = False
 
     @override
     def run(self) -> None:
@@ -102,6 +122,7 @@ class ClientThread(_QThread):
         self.loop.close()
 
     def stop(self) -> None:
+        self._stopping = True
         if self.websocket and self.websocket.state is State.OPEN:
             fut = asyncio.run_coroutine_threadsafe(self.websocket.close(), self.loop)
             try:
@@ -112,32 +133,68 @@ class ClientThread(_QThread):
             self.loop.call_soon_threadsafe(self.loop.stop)
 
     async def _run(self) -> None:
-        try:
-            ssl_ctx: ssl.SSLContext | None = None
-            if self.uri.startswith("wss://") or self.cafile:
-                ssl_ctx = ssl.create_default_context()
-                if self.cafile:
-                    ssl_ctx.load_verify_locations(self.cafile)
-
-            self.websocket = await connect(self.uri, ssl=ssl_ctx)
-            await self.websocket.recv()
-            await self.websocket.send(self.room_code)
-            response = await self.websocket.recv()
-            if response != "Enter your name:":
-                self.message_received.emit(response)
+        ssl_ctx: ssl.SSLContext | None = None
+        if self.uri.startswith("wss://") or self.cafile:
+            ssl_ctx = ssl.create_default_context()
+            if self.cafile:
+                ssl_ctx.load_verify_locations(self.cafile)
+
+        deadline: float | None = None
+        while True:
+            try:
+                self.websocket = await connect(
+                    self.uri, ssl=ssl_ctx, subprotocols=[Subprotocol(SUBPROTOCOL)]
+                )
+                if not await self._handshake(self.websocket):
+                    return
+                deadline = None
+                async for message in self.websocket:
+                    if isinstance(message, bytes):
+                        message = json.dumps(decode_frame(message))
+                    self.message_received.emit(message)
                 return
-            await self.websocket.send(self.name)
-            join_msg = await self.websocket.recv()
-            self.message_received.emit(join_msg)
-            async for message in self.websocket:
-                self.message_received.emit(message)
-        except (OSError, WebSocketException) as exc:
-            logging.exception("Connection error: %s", exc)
-            self.message_received.emit(f"Connection error: {exc}")
-        finally:
-            if self.websocket:
-                await self.websocket.close()
-                self.websocket = None
+            except (OSError, WebSocketException) as exc:
+                loop = asyncio.get_running_loop()
+                if self.session is not None and not self._stopping:
+                    if deadline is None:
+                        deadline = loop.time() + self.grace
+                        notice = {"messages": ["Connection lost, reconnecting..."]}
+                        self.message_received.emit(json.dumps(notice))
+                    if loop.time() < deadline:
+                        await asyncio.sleep(RECONNECT_DELAY)
+                        continue
+                logging.exception("Connection error: %s", exc)
+                self.message_received.emit(f"Connection error: {exc}")
+                return
+            finally:
+                if self.websocket:
+                    await self.websocket.close()
+                    self.websocket = None
+
+    async def _handshake(self, websocket: ClientConnection) -> bool:
+        """Join, or resume the held seat, and return ``True`` when seated."""
+        await websocket.recv()
+        await websocket.send(self.room_code)
+        response = await websocket.recv()
+        if response != "Enter your name:":
+            self.message_received.emit(response)
+            return False
+        if self.session is not None:
+            await websocket.send(json.dumps({"resume": self.session}))
+            resumed = await websocket.recv()
+            if not isinstance(resumed, str) or not resumed.startswith("Resumed"):
+                self.message_received.emit(resumed)
+                return False
+            return True
+        await websocket.send(json.dumps({"name": self.name, "session": True}))
+        join_msg = await websocket.recv()
+        self.message_received.emit(join_msg)
+        if not isinstance(join_msg, str) or not join_msg.startswith("Joined"):
+            return False
+        session = json.loads(await websocket.recv())
+        self.session = session["session"]
+        self.grace = float(session["grace"])
+        return True
 
     def send_end_turn(self) -> None:
         if self.loop.is_running():
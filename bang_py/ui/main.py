@@ -13,6 +13,9 @@ from PySide6 import QtCore, QtWidgets, QtQuick, QtQml  # type: ignore[import-not
 from .components import ClientThread, ServerThread
 from .components.card_images import get_loader
 from .theme import get_current_theme
+from ..network.messages import ActionPayload, PlayCardPayload
+from ..network.server import MAX_MESSAGE_SIZE, WRITE_LIMIT
+from ..network.state import GameState, StateFrame, StateTracker
 from ..network.token_utils import parse_join_token
 from ..network.validation import validate_player_name
 from cryptography.fernet import InvalidToken  # type: ignore[import-not-found]
@@ -41,9 +44,7 @@ class BangUI(QtCore.QObject):
             root.drawCard.connect(lambda: self._send_action({"action": "draw"}))
             root.discardCard.connect(lambda: self._send_action({"action": "discard"}))
             root.endTurn.connect(self._end_turn)
-            root.playCard.connect(
-                lambda i: self._send_action({"action": "play_card", "card_index": int(i)})
-            )
+            root.playCard.connect(lambda i: self._play_card(int(i)))
             root.discardFromHand.connect(
                 lambda i: self._send_action({"action": "discard", "card_index": int(i)})
             )
@@ -53,6 +54,10 @@ class BangUI(QtCore.QObject):
         self.local_name = ""
         self.game_root: QtCore.QObject | None = None
         self._prompt_queue: list[Callable[[], None]] = []
+        self.state_tracker = StateTracker()
+        # Actions the server currently accepts from this client and the seat names.
+        self.legal_actions: list[ActionPayload] = []
+        self.player_names: list[str] = []
 
     # Menu callbacks --------------------------------------------------
     def _host_menu(
@@ -62,6 +67,9 @@ class BangUI(QtCore.QObject):
         max_players_text: str,
         cert: str,
         key: str,
+        compression: bool = True,
+        max_size_text: str = str(MAX_MESSAGE_SIZE),
+        write_limit_text: str = str(WRITE_LIMIT),
     ) -> None:
         name = name.strip()
         if not validate_player_name(name):
@@ -70,13 +78,23 @@ class BangUI(QtCore.QObject):
         try:
             port = int(port_text)
             max_players = int(max_players_text)
+            max_message_size = int(max_size_text)
+            write_limit = int(write_limit_text)
         except ValueError:
             QtWidgets.QMessageBox.critical(None, "Error", "Invalid settings")
             return
         certfile = cert.strip() or None
         keyfile = key.strip() or None
         self.local_name = name
-        self._start_host(port, max_players, certfile, keyfile)
+        self._start_host(
+            port,
+            max_players,
+            certfile,
+            keyfile,
+            compression=compression,
+            max_message_size=max_message_size,
+            write_limit=write_limit,
+        )
 
     def _join_menu(
         self,
@@ -125,6 +143,9 @@ class BangUI(QtCore.QObject):
         max_players: int,
         certfile: str | None = None,
         keyfile: str | None = None,
+        compression: bool = True,
+        max_message_size: int = MAX_MESSAGE_SIZE,
+        write_limit: int = WRITE_LIMIT,
     ) -> None:
         room_code = secrets.token_hex(3)
         self.server_thread = ServerThread(
@@ -135,6 +156,9 @@ class BangUI(QtCore.QObject):
             max_players,
             certfile,
             keyfile,
+            compression=compression,
+            max_message_size=max_message_size,
+            write_limit=write_limit,
         )
         self.server_thread.start()
         scheme = "wss" if certfile else "ws"
@@ -148,6 +172,7 @@ class BangUI(QtCore.QObject):
 
     def _start_client(self, uri: str, code: str, cafile: str | None = None) -> None:
         self.room_code = code
+        self.state_tracker = StateTracker()
         self.client = ClientThread(uri, code, self.local_name, cafile)
         self.client.message_received.connect(self._append_message)
         self.client.start()
@@ -323,22 +348,29 @@ class BangUI(QtCore.QObject):
                     lambda: self._message_dialog(str(data["result"]), False, lambda: None)
                 )
                 return
-            if "message" in data and self.game_root is not None:
-                cur = self.game_root.property("logText") or ""
-                text = str(data["message"])
-                self.game_root.setProperty("logText", cur + text + "\n")
-                if "BangCard" in text:
-                    QtCore.QMetaObject.invokeMethod(self.game_root, b"playBang")
-                if "GatlingCard" in text:
-                    QtCore.QMetaObject.invokeMethod(self.game_root, b"playManyBangs")
-                if "IndiansCard" in text:
-                    QtCore.QMetaObject.invokeMethod(self.game_root, b"playIndians")
-                if "MissedCard" in text:
-                    QtCore.QMetaObject.invokeMethod(self.game_root, b"playMissed")
-            if "players" in data:
-                self._update_players(data["players"])
-            if "hand" in data:
-                self._update_hand(data["hand"])
+            if self.game_root is not None:
+                for text in map(str, data.get("messages", [])):
+                    cur = self.game_root.property("logText") or ""
+                    self.game_root.setProperty("logText", cur + text + "\n")
+                    if "BangCard" in text:
+                        QtCore.QMetaObject.invokeMethod(self.game_root, b"playBang")
+                    if "GatlingCard" in text:
+                        QtCore.QMetaObject.invokeMethod(self.game_root, b"playManyBangs")
+                    if "IndiansCard" in text:
+                        QtCore.QMetaObject.invokeMethod(self.game_root, b"playIndians")
+                    if "MissedCard" in text:
+                        QtCore.QMetaObject.invokeMethod(self.game_root, b"playMissed")
+            if data.get("type") == "state":
+                state = self._apply_state(cast(StateFrame, data))
+                if state is not None:
+                    self.legal_actions = list(state.get("actions", []))
+                    self._update_players(cast(list[dict], state["players"]))
+                    self._update_hand(list(state["hand"]))
+            else:
+                if "players" in data:
+                    self._update_players(data["players"])
+                if "hand" in data:
+                    self._update_hand(data["hand"])
             if "prompt" in data:
                 self._show_prompt(data["prompt"], data)
         else:
@@ -346,6 +378,34 @@ class BangUI(QtCore.QObject):
                 cur = self.game_root.property("logText") or ""
                 self.game_root.setProperty("logText", cur + str(data) + "\n")
 
+    def _apply_state(self, frame: StateFrame) -> GameState | None:
+        """Apply a state frame, requesting a resync if it does not match."""
+        state = self.state_tracker.apply(frame)
+        if state is None:
+            self._send_action({"action": "resync"})
+        return state
+
+    def _play_card(self, index: int) -> None:
+        """Play the card at ``index`` if the server lists a legal play for it."""
+        plays = [
+            cast(PlayCardPayload, a)
+            for a in self.legal_actions
+            if a.get("action") == "play_card" and a.get("card_index") == index
+        ]
+        if not plays:
+            self._message_dialog("That card cannot be played right now", True, lambda: None)
+            return
+        if len(plays) == 1:
+            self._send_action(cast(dict, plays[0]))
+            return
+        names = [self.player_names[a["target"]] if "target" in a else "No target" for a in plays]
+
+        def _chosen(choice: int | None) -> None:
+            if choice is not None:
+                self._send_action(cast(dict, plays[choice]))
+
+        self._option_prompt("Choose a target", names, _chosen)
+
     def _end_turn(self) -> None:
         if self.client:
             self.client.send_end_turn()
@@ -355,6 +415,7 @@ class BangUI(QtCore.QObject):
             self.client.send_json(payload)
 
     def _update_players(self, players: list[dict]) -> None:
+        self.player_names = [str(pl.get("name", "")) for pl in players]
         if self.game_root is None:
             return
         updated: list[dict[str, object]] = []
@@ -11,7 +11,8 @@ Item {
     property string theme: "light"
     property string page: "menu"
 
-    signal hostRequested(string name, int port, int maxPlayers, string cert, string key)
+    signal hostRequested(string name, int port, int maxPlayers, string cert, string key,
+                         bool compression, int maxSize, int writeLimit)
     signal joinRequested(string name, string addr, int port, string code, string cafile)
     signal settingsChanged(string theme)
 
@@ -108,9 +109,37 @@ Item {
                 color: "red"
                 visible: keyField.text !== "" && !keyField.acceptableInput
             }
+            CheckBox {
+                id: compressionBox
+                text: qsTr("Compress messages")
+                checked: true
+            }
+            TextField {
+                id: maxSizeField
+                placeholderText: qsTr("Max Message Size (bytes)")
+                text: "4096"
+                validator: IntValidator { bottom: 512; top: 1048576 }
+            }
+            Label {
+                text: qsTr("Message size must be 512-1048576")
+                color: "red"
+                visible: maxSizeField.text !== "" && !maxSizeField.acceptableInput
+            }
+            TextField {
+                id: writeLimitField
+                placeholderText: qsTr("Write Buffer Limit (bytes)")
+                text: "32768"
+                validator: IntValidator { bottom: 1024; top: 16777216 }
+            }
+            Label {
+                text: qsTr("Buffer limit must be 1024-16777216")
+                color: "red"
+                visible: writeLimitField.text !== "" && !writeLimitField.acceptableInput
+            }
         }
         onAccepted: {
-            if (!portField.acceptableInput || !maxField.acceptableInput) {
+            if (!portField.acceptableInput || !maxField.acceptableInput
+                    || !maxSizeField.acceptableInput || !writeLimitField.acceptableInput) {
                 hostDialog.open()
                 return
             }
@@ -120,6 +149,9 @@ Item {
                 maxField.text,
                 certField.text,
                 keyField.text,
+                compressionBox.checked,
+                maxSizeField.text,
+                writeLimitField.text,
             )
         }
     }
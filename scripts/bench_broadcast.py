@@ -0,0 +1,102 @@
+"""Benchmark state broadcast encoding for different table sizes."""
+
+from __future__ import annotations
+
+import json
+from time import perf_counter
+from typing import Any, cast
+
+from bang_py.network.compact import decode_frame
+from bang_py.network.room import Connection, GameRoom, _serialize_players
+from bang_py.player import Player
+
+ROUNDS = 2000
+
+
+def _room(num_players: int, compact: bool = False) -> GameRoom:
+    room = GameRoom(f"bench{num_players}")
+    for i in range(num_players):
+        player = Player(f"P{i}")
+        room.game.add_player(player)
+        room.connections[cast(Any, i)] = Connection(cast(Any, None), player, compact=compact)
+    room.game.start_game(deal_roles=False)
+    return room
+
+
+def _per_connection(room: GameRoom) -> None:
+    """Encode full snapshots per connection like the original broadcast."""
+    for conn in room.connections.values():
+        json.dumps(
+            {
+                "players": _serialize_players(room.game.players),
+                "hand": [c.card_name for c in conn.player.hand],
+                "character": getattr(conn.player.character, "name", ""),
+                "event": getattr(room.game.current_event, "name", ""),
+                "message": "benchmark",
+            }
+        )
+
+
+def _shared_keyframes(room: GameRoom) -> None:
+    for conn in room.connections.values():
+        conn.sent_state = None
+    room.prepare_broadcast(["benchmark"])
+
+
+def _shared_deltas(room: GameRoom) -> None:
+    room.game.players[0].health ^= 1
+    room.prepare_broadcast(["benchmark"])
+
+
+def _time(func: Any, room: GameRoom) -> float:
+    start = perf_counter()
+    for _ in range(ROUNDS):
+        func(room)
+    return (perf_counter() - start) / ROUNDS * 1e6
+
+
+def _keyframe_payloads(room: GameRoom) -> list[str | bytes]:
+    for conn in room.connections.values():
+        conn.sent_state = None
+    return [payload for _, payload in room.prepare_broadcast(["benchmark"])]
+
+
+def _decode_time(payloads: list[str | bytes]) -> float:
+    decode = decode_frame if isinstance(payloads[0], bytes) else json.loads
+    start = perf_counter()
+    for _ in range(ROUNDS):
+        for payload in payloads:
+            decode(payload)
+    return (perf_counter() - start) / ROUNDS / len(payloads) * 1e6
+
+
+def main() -> None:
+    """Print the encode cost per broadcast in microseconds for 2-8 players.
+
+    The second table compares the keyframe size in bytes and the client
+    decode time per frame of the JSON and compact encodings.
+    """
+    print(f"{'players':>7} {'per-conn':>10} {'shared kf':>10} {'shared delta':>13}")
+    for num_players in range(2, 9):
+        room = _room(num_players)
+        naive = _time(_per_connection, room)
+        keyframes = _time(_shared_keyframes, room)
+        deltas = _time(_shared_deltas, room)
+        print(f"{num_players:>7} {naive:>9.1f}us {keyframes:>9.1f}us {deltas:>12.1f}us")
+    print()
+    print(
+        f"{'players':>7} {'json kf':>8} {'compact kf':>11} {'json parse':>11} {'compact parse':>14}"
+    )
+    for num_players in range(2, 9):
+        plain = _keyframe_payloads(_room(num_players))
+        compact = _keyframe_payloads(_room(num_players, compact=True))
+        plain_size = sum(len(p) for p in plain) // len(plain)
+        compact_size = sum(len(p) for p in compact) // len(compact)
+        print(
+            f"{num_players:>7} {plain_size:>7}B {compact_size:>10}B "
+            f"{_decode_time(plain):>9.1f}us {_decode_time(compact):>12.1f}us"
+        )
+
+
+if __name__ == "__main__":
+    main()
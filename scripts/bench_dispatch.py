@@ -0,0 +1,81 @@
+"""Benchmark validating and dispatching client messages in a room.
+
+A mix of the messages clients send during play is fed through
+``GameRoom._parse_payload`` on decoded payloads and through
+``GameRoom._process_message`` on the raw text, which adds JSON decoding,
+dispatch to the handler and the handler itself. The handlers chosen leave the
+game unchanged so every round does the same work.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from time import perf_counter
+from typing import Any, cast
+
+from bang_py.network.room import Connection, GameRoom
+from bang_py.player import Player
+
+ROUNDS = 20000
+
+MESSAGES: dict[str, dict[str, object]] = {
+    "set_auto_miss": {"action": "set_auto_miss", "enabled": True},
+    "play_card": {"action": "play_card", "card_index": 99, "target": 1},
+    "use_ability": {
+        "action": "use_ability",
+        "ability": "unknown",
+        "target": 1,
+        "card_index": 0,
+        "use_discard": False,
+    },
+    "end_turn": {"action": "end_turn"},
+}
+
+
+class _Socket:
+    async def send(self, _payload: str | bytes) -> None:
+        return None
+
+
+def _room() -> tuple[GameRoom, Any]:
+    room = GameRoom("bench")
+    socket = _Socket()
+    for name in ("A", "B"):
+        player = Player(name)
+        room.game.add_player(player)
+    # Seat the second player so end_turn is rejected and the turn never moves.
+    room.connections[cast(Any, socket)] = Connection(cast(Any, socket), room.game.players[1])
+    return room, socket
+
+
+def _parse_time(room: GameRoom, payload: dict[str, object]) -> float:
+    start = perf_counter()
+    for _ in range(ROUNDS):
+        room._parse_payload(payload)
+    return (perf_counter() - start) / ROUNDS * 1e6
+
+
+async def _process_time(room: GameRoom, socket: Any, message: str) -> float:
+    start = perf_counter()
+    for _ in range(ROUNDS):
+        await room._process_message(socket, message)
+    return (perf_counter() - start) / ROUNDS * 1e6
+
+
+def main() -> None:
+    """Print the cost per message in microseconds and the overall throughput."""
+    room, socket = _room()
+    room.game.start_game(deal_roles=False)
+    print(f"{'message':<14} {'parse':>8} {'process':>9}")
+    total = 0.0
+    for name, payload in MESSAGES.items():
+        parse = _parse_time(room, payload)
+        process = asyncio.run(_process_time(room, socket, json.dumps(payload)))
+        total += process
+        print(f"{name:<14} {parse:>7.2f}us {process:>8.2f}us")
+    print(f"throughput     {len(MESSAGES) / total * 1e6:,.0f} messages/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Benchmark target enumeration with and without the cached distance matrix."""
+
+from __future__ import annotations
+
+from time import perf_counter
+from typing import Any
+
+from bang_py.cards.mustang import MustangCard
+from bang_py.cards.scope import ScopeCard
+from bang_py.game_manager import GameManager
+from bang_py.player import Player
+
+ROUNDS = 2000
+
+
+def _game(num_players: int) -> GameManager:
+    gm = GameManager(seed=num_players)
+    for i in range(num_players):
+        gm.add_player(Player(f"P{i}"))
+    gm.start_game()
+    gm.players[1].equip(MustangCard())
+    gm.players[0].equip(ScopeCard())
+    return gm
+
+
+def _uncached_distance(gm: GameManager, player: Player, other: Player) -> int:
+    """Distance computed like the engine did before the cache existed."""
+    players = gm.players
+    base = 1
+    if player in players and other in players:
+        alive = [p for p in players if p.is_alive()]
+        diff = abs(alive.index(player) - alive.index(other))
+        base = min(diff, len(alive) - diff)
+    if gm.event_flags.get("ambush"):
+        base = 1
+    return max(1, base + other.distance_bonus - player.range_bonus)
+
+
+def _uncached(gm: GameManager) -> None:
+    for player in gm.players:
+        reach = player.attack_range
+        [
+            t
+            for t in gm.players
+            if t is not player and t.is_alive() and _uncached_distance(gm, player, t) <= reach
+        ]
+
+
+def _cached(gm: GameManager) -> None:
+    for player in gm.players:
+        gm.players_in_range(player)
+
+
+def _invalidated(gm: GameManager) -> None:
+    gm.invalidate_distances()
+    _cached(gm)
+
+
+def _time(func: Any, gm: GameManager) -> float:
+    start = perf_counter()
+    for _ in range(ROUNDS):
+        func(gm)
+    return (perf_counter() - start) / ROUNDS * 1e6
+
+
+def main() -> None:
+    """Print the cost of enumerating every player's targets in microseconds."""
+    print(f"{'players':>7} {'uncached':>10} {'cached':>10} {'rebuilt':>10}")
+    for num_players in range(3, 9):
+        gm = _game(num_players)
+        before = _time(_uncached, gm)
+        after = _time(_cached, gm)
+        rebuilt = _time(_invalidated, gm)
+        print(f"{num_players:>7} {before:>9.1f}us {after:>9.1f}us {rebuilt:>9.1f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Measure the bytes sent to clients over whole games.
+
+Bot games are played in a :class:`GameRoom` whose connections record every
+state frame instead of sending it. A broadcast is prepared after each draw
+phase, card play and turn end, the points where a server broadcasts during
+real play. The recorded frames are then sized as websocket frames with and
+without permessage-deflate, using the settings :func:`websockets.serve`
+negotiates by default and one compression context per connection.
+"""
+
+from __future__ import annotations
+
+import argparse
+from typing import Any, cast
+
+from websockets.extensions.permessage_deflate import PerMessageDeflate
+from websockets.frames import Frame, Opcode
+
+from bang_py.game_manager import GameManager
+from bang_py.network.room import Connection, GameRoom
+from bang_py.player import Player
+from bang_py.simulation.bots import create_policy
+
+MAX_TURNS = 500
+
+
+def _frame_size(payload: bytes | bytearray | memoryview) -> int:
+    """Return the size of an unmasked server frame carrying ``payload``."""
+    length = len(payload)
+    if length < 126:
+        return 2 + length
+    return (4 if length < 2**16 else 10) + length
+
+
+def _play(seed: int, num_players: int, compact: bool) -> list[list[str | bytes]]:
+    """Play one bot game and return the frames sent to each seat."""
+    room = GameRoom(f"wire{seed}", seed=seed)
+    game = cast(GameManager, room.game)
+    # The bots answer their own draw choices, so the room sends no prompts.
+    game.turn_started_listeners.remove(room._on_turn_started)
+    sent: list[list[str | bytes]] = [[] for _ in range(num_players)]
+    for i in range(num_players):
+        player = Player(f"Bot{i}")
+        game.add_player(player)
+        room.connections[cast(Any, i)] = Connection(cast(Any, i), player, compact=compact)
+
+    def broadcast(*_args: object) -> None:
+        messages, room._pending_messages = room._pending_messages, []
+        for conn, payload in room.prepare_broadcast(messages):
+            sent[cast(int, conn.websocket)].append(payload)
+
+    game.play_phase_listeners.append(broadcast)
+    game.card_played_listeners.append(broadcast)
+    game.start_game()
+    bots = [create_policy("aggressive", game.rng) for _ in range(num_players)]
+    outcome: list[str] = []
+    game.game_over_listeners.append(outcome.append)
+    broadcast()
+    for _ in range(MAX_TURNS):
+        if outcome or not game.turn_order:
+            break
+        idx = game.turn_order[game.current_turn]
+        player = game.players[idx]
+        if player.is_alive():
+            if player.metadata.awaiting_draw:
+                game.draw_phase(player)
+                player.metadata.awaiting_draw = False
+            bots[idx].play_turn(game, player)
+        if outcome or not game.turn_order:
+            break
+        game.current_turn %= len(game.turn_order)
+        game.end_turn()
+        broadcast()
+    broadcast()
+    return sent
+
+
+def _wire_bytes(frames: list[str | bytes], compress: bool) -> int:
+    """Return the bytes needed to send ``frames`` over one connection."""
+    deflate = PerMessageDeflate(False, False, 12, 12, {"memLevel": 5}) if compress else None
+    total = 0
+    for payload in frames:
+        if isinstance(payload, str):
+            frame = Frame(Opcode.TEXT, payload.encode())
+        else:
+            frame = Frame(Opcode.BINARY, payload)
+        if deflate is not None:
+            frame = deflate.encode(frame)
+        total += _frame_size(frame.data)
+    return total
+
+
+def main() -> None:
+    """Print the mean bytes sent per game for each encoding."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--games", type=int, default=20)
+    parser.add_argument("--players", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'encoding':<10} {'frames':>7} {'raw':>10} {'deflate':>10} {'ratio':>6}")
+    for compact in (False, True):
+        frames = raw = compressed = 0
+        for seed in range(args.games):
+            for seat in _play(seed, args.players, compact):
+                frames += len(seat)
+                raw += _wire_bytes(seat, compress=False)
+                compressed += _wire_bytes(seat, compress=True)
+        name = "compact" if compact else "json"
+        print(
+            f"{name:<10} {frames // args.games:>7} {raw // args.games:>9}B "
+            f"{compressed // args.games:>9}B {compressed / raw:>6.1%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
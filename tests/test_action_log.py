@@ -0,0 +1,81 @@
+import random
+
+from bang_py.action_log import ActionLog, iter_replay, replay
+from bang_py.cards.bang import BangCard
+from bang_py.game_manager import GameManager
+from bang_py.player import Player
+from bang_py.simulation import AggressiveBot, RandomBot, play_out
+
+
+def _recorded_game(seed: int) -> GameManager:
+    gm = GameManager(expansions=["high_noon"], seed=seed, action_log=ActionLog())
+    for i in range(5):
+        gm.add_player(Player(f"P{i}"))
+    gm.start_game()
+    return gm
+
+
+def _bots(gm: GameManager, seed: int) -> list[AggressiveBot | RandomBot]:
+    rng = random.Random(seed)
+    return [RandomBot(rng) if i % 2 else AggressiveBot(rng) for i in range(len(gm.players))]
+
+
+def _describe(gm: GameManager) -> list[object]:
+    assert gm.deck is not None
+    return [
+        [(p.name, p.health, [c.card_name for c in p.hand], list(p.equipment)) for p in gm.players],
+        [(c.card_name, c.suit, c.rank) for c in gm.deck.cards],
+        [c.card_name for c in gm.discard_pile],
+        [c.name for c in gm.event_deck or ()],
+        gm.turn_order,
+        gm.current_turn,
+        gm.phase,
+        gm.rng.getstate(),
+    ]
+
+
+def test_only_outer_commands_are_logged() -> None:
+    gm = _recorded_game(1)
+    log = gm.action_log
+    assert log is not None and log.seed == 1
+    assert [name for name, _args, _kwargs in log.commands] == ["add_player"] * 5 + ["start_game"]
+    gm.end_turn()
+    assert log.commands[-1] == ("end_turn", [], {})
+
+
+def test_replay_reproduces_a_played_game() -> None:
+    gm = _recorded_game(3)
+    play_out(gm, _bots(gm, 3), max_turns=60)
+    assert gm.action_log is not None
+    text = gm.action_log.dumps()
+
+    copy = replay(ActionLog.loads(text))
+    assert _describe(copy) == _describe(gm)
+    assert copy.action_log is not None
+    assert copy.action_log.dumps() == text
+
+
+def test_replay_stops_after_until_commands() -> None:
+    gm = _recorded_game(5)
+    player = gm.players[gm.turn_order[gm.current_turn]]
+    gm.play_card(player, player.hand[0])
+    gm.end_turn()
+    assert gm.action_log is not None
+    states = [_describe(game) for game in iter_replay(gm.action_log)]
+    assert len(states) == 8
+    assert _describe(replay(gm.action_log, until=6)) == states[5]
+    assert _describe(replay(gm.action_log)) == states[-1] == _describe(gm)
+
+
+def test_cards_from_outside_the_game_are_rebuilt() -> None:
+    gm = GameManager(action_log=ActionLog())
+    shooter, target = Player("A"), Player("B")
+    gm.add_player(shooter)
+    gm.add_player(target)
+    gm.start_game(deal_roles=False)
+    gm.play_card(shooter, BangCard("Spades", 5), target)
+    assert gm.action_log is not None and gm.action_log.seed is not None
+
+    copy = replay(ActionLog.loads(gm.action_log.dumps()))
+    assert copy.players[1].health == gm.players[1].health
+    assert _describe(copy) == _describe(gm)
@@ -1,5 +1,7 @@
-from bang_py.characters.base import BaseCharacter
 from bang_py.game_manager import GameManager
+from bang_py.characters import base
+from bang_py.characters.base import DRAW_PROMPTS, BaseCharacter
+from bang_py.characters.jesse_jones import JesseJones
 from bang_py.game_manager_protocol import GameManagerProtocol
 from bang_py.player import Player
 import pytest
@@ -28,3 +30,32 @@ def test_simple_character_ability_returns_false() -> None:
     gm.add_player(player)
     assert player.character is not None
     assert player.character.ability(gm, player) is False
+
+
+class PromptChar(BaseCharacter):
+    def ability(self, gm: GameManagerProtocol, player: Player, **_: object) -> bool:
+        return True
+
+
+def test_draw_prompt_registers_character_class(monkeypatch: pytest.MonkeyPatch) -> None:
+    registry = dict(DRAW_PROMPTS)
+    monkeypatch.setattr(base, "DRAW_PROMPTS", registry)
+
+    class DeclaredChar(PromptChar):
+        draw_prompt = "declared_char"
+
+    assert registry[DeclaredChar] == "declared_char"
+    assert DeclaredChar not in DRAW_PROMPTS
+    assert DRAW_PROMPTS[JesseJones] == "jesse_jones"
+    assert Dummy not in DRAW_PROMPTS
+
+
+def test_engine_waits_for_declared_draw_prompt(monkeypatch: pytest.MonkeyPatch) -> None:
+    prompt_char: type[BaseCharacter] = PromptChar
+    monkeypatch.setitem(DRAW_PROMPTS, prompt_char, "prompt_char")
+    gm = GameManager()
+    prompted = Player("Prompted", character=PromptChar())
+    gm.add_player(prompted)
+    gm.add_player(Player("Other", character=NullChar()))
+    gm.start_game(deal_roles=False)
+    assert prompted.metadata.awaiting_draw
@@ -0,0 +1,133 @@
+import asyncio
+import json
+from typing import Any, cast
+
+import pytest
+
+from bang_py.cards.bang import BangCard
+from bang_py.network.compact import NAMES, SUBPROTOCOL, CompactEncoder, decode_frame, encode_frame
+from bang_py.network.state import GameState, StateFrame, apply_frame, delta, keyframe
+from bang_py.player import Player
+
+
+def _state(health: int = 4, hand: list[str] | None = None) -> GameState:
+    return {
+        "players": [
+            {
+                "name": "A",
+                "health": health,
+                "role": "Sheriff",
+                "character": "Bart Cassidy",
+                "equipment": ["Volcanic"],
+            },
+            {"name": "B", "health": 4, "role": "", "character": "", "equipment": ["Barrel"]},
+        ],
+        "hand": hand if hand is not None else ["Bang!", "Missed!", "Beer"],
+        "character": "Bart Cassidy",
+        "event": "",
+        "actions": [
+            {"action": "play_card", "card_index": 0, "target": 1},
+            {"action": "play_card", "card_index": 2},
+            {"action": "use_ability", "ability": "uncle_will", "card_index": 1},
+            {"action": "use_ability", "ability": "vera_custer", "target": 1},
+            {"action": "end_turn"},
+        ],
+    }
+
+
+def test_registry_covers_cards_characters_and_events() -> None:
+    for name in ("Bang!", "Sheriff", "Bart Cassidy", "Volcanic", "High Noon"):
+        assert name in NAMES
+    assert SUBPROTOCOL.startswith("bang.compact.")
+
+
+def test_keyframe_round_trips_and_is_smaller() -> None:
+    frame = keyframe(1, _state())
+    frame["messages"] = ["hello"]
+    encoded = encode_frame(frame)
+    assert isinstance(encoded, bytes)
+    assert decode_frame(encoded) == frame
+    assert len(encoded) < len(json.dumps(frame)) // 2
+
+
+def test_delta_round_trips() -> None:
+    old = _state()
+    new = _state(health=2, hand=["Bang!", "Panic!", "Beer", "Unknown Card"])
+    new["players"][1]["equipment"] = ["Barrel", "Mustang"]
+    new["actions"] = []
+    frame = delta(2, 1, old, new)
+    assert "players_diff" in frame and "hand_splice" in frame
+    decoded = decode_frame(encode_frame(frame))
+    assert decoded == json.loads(json.dumps(frame))
+    assert apply_frame(old, decoded) == new
+
+
+def test_encoder_reuses_shared_players() -> None:
+    encoder = CompactEncoder()
+    state = _state()
+    first = cast(StateFrame, dict(keyframe(1, state), hand=["Bang!"]))
+    second = cast(StateFrame, dict(keyframe(1, state), hand=[]))
+    assert json.loads(encoder.encode(first))["p"] == json.loads(encoder.encode(second))["p"]
+    assert len(encoder._packed) == 1
+
+
+def test_prepare_broadcast_encodes_compact_connections_as_bytes() -> None:
+    pytest.importorskip("websockets")
+    from bang_py.network.room import Connection, GameRoom
+
+    room = GameRoom("compact")
+    for name, compact in (("A", True), ("B", False)):
+        player = Player(name)
+        room.game.add_player(player)
+        room.connections[cast(Any, name)] = Connection(cast(Any, name), player, compact=compact)
+    room.game.players[0].hand.append(BangCard())
+    frames = {conn.player.name: payload for conn, payload in room.prepare_broadcast(["go"])}
+    assert isinstance(frames["A"], bytes) and isinstance(frames["B"], str)
+    decoded = decode_frame(frames["A"])
+    plain = json.loads(frames["B"])
+    assert decoded["hand"] == ["Bang!"]
+    assert decoded["players"] == plain["players"]
+    assert decoded["messages"] == plain["messages"] == ["go"]
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("offer,enabled,binary", [(True, True, True), (False, True, False)])
+def test_server_negotiates_compact_frames(offer: bool, enabled: bool, binary: bool) -> None:
+    pytest.importorskip("websockets")
+    from websockets import connect, serve
+    from websockets.typing import Subprotocol
+
+    from bang_py.network.server import BangServer
+
+    async def run() -> None:
+        server = BangServer(host="localhost", port=0, room_code="2222", compact=enabled)
+        async with serve(
+            server.handler,
+            server.host,
+            server.port,
+            select_subprotocol=server.select_subprotocol,
+        ) as ws_server:
+            port = next(iter(ws_server.sockets)).getsockname()[1]
+            subprotocols = [Subprotocol(SUBPROTOCOL)] if offer else None
+            async with connect(f"ws://localhost:{port}", subprotocols=subprotocols) as ws:
+                await ws.recv()
+                await ws.send("2222")
+                await ws.recv()
+                await ws.send("Alice")
+                assert await ws.recv() == "Joined game as Alice"
+                message = await ws.recv()
+                assert isinstance(message, bytes) is binary
+                frame = decode_frame(message) if binary else json.loads(message)
+                assert frame["keyframe"] and frame["players"][0]["name"] == "Alice"
+
+    asyncio.run(run())
+
+
+def test_server_ignores_offer_when_compact_disabled() -> None:
+    pytest.importorskip("websockets")
+    from bang_py.network.server import BangServer
+
+    server = BangServer(room_code="3333", compact=False)
+    assert server.select_subprotocol(cast(Any, None), [cast(Any, SUBPROTOCOL)]) is None
+    server.compact = True
+    assert server.select_subprotocol(cast(Any, None), [cast(Any, SUBPROTOCOL)]) == SUBPROTOCOL
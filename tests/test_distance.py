@@ -0,0 +1,40 @@
+from bang_py.cards.mustang import MustangCard
+from bang_py.cards.scope import ScopeCard
+from bang_py.game_manager import GameManager
+from bang_py.player import Player
+
+
+def _table(count: int) -> tuple[GameManager, list[Player]]:
+    gm = GameManager()
+    players = [Player(f"P{i}") for i in range(count)]
+    for player in players:
+        gm.add_player(player)
+    return gm, players
+
+
+def test_distances_follow_deaths_and_revivals() -> None:
+    gm, (p0, p1, p2, p3, p4) = _table(5)
+    assert p0.distance_to(p2) == 2
+    p1.health = 0
+    assert p0.distance_to(p2) == 1
+    assert p0.distance_to(p3) == 2
+    p1.health = 1
+    assert p0.distance_to(p2) == 2
+    gm.remove_player(p4)
+    assert p0.distance_to(p3) == 1
+
+
+def test_distances_follow_equipment_and_event_flags() -> None:
+    gm, (p0, p1, p2, p3) = _table(4)
+    assert gm.players_in_range(p0) == [p1, p3]
+    p1.equip(MustangCard())
+    assert p0.distance_to(p1) == 2
+    assert gm.players_in_range(p0) == [p3]
+    p0.equip(ScopeCard())
+    assert gm.players_in_range(p0, 2) == [p1, p2, p3]
+    gm.event_flags["lasso"] = True
+    assert p0.distance_to(p1) == 1
+    assert p0.distance_to(p2) == 2
+    gm.event_flags["ambush"] = True
+    assert p0.distance_to(p2) == 1
+    assert gm.players_in_range(p2, 1) == [p0, p1, p3]
@@ -170,7 +170,7 @@ def auto_turn(gm: GameManager) -> None:
 
 def simulate_game(num_players: int) -> str:
     random.seed(100 + num_players)
-    gm = GameManager()
+    gm = GameManager(seed=100 + num_players)
     roles = ROLE_MAP[num_players][:]
     random.shuffle(roles)
     chars = CHAR_CLASSES[:]
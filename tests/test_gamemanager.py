@@ -87,3 +87,25 @@ def test_get_player_by_index_returns_expected_player():
     assert gm.get_player_by_index(1) is p2
     assert gm.get_player_by_index(2) is None
     assert gm.get_player_by_index(-1) is None
+
+
+def _deal(seed: int) -> tuple[list[str], list[tuple[str, str]]]:
+    gm = GameManager(expansions=["high_noon"], seed=seed)
+    for name in ("A", "B", "C", "D"):
+        gm.add_player(Player(name))
+    gm.start_game()
+    assert gm.deck is not None and gm.event_deck is not None
+    order = [f"{c.card_name}:{c.suit}:{c.rank}" for c in gm.deck.cards]
+    order += [e.name for e in gm.event_deck]
+    seats = [(p.role.card_name, p.character.name) for p in gm.players]  # type: ignore[union-attr]
+    return order, seats
+
+
+def test_seeded_games_are_reproducible_without_global_random() -> None:
+    import random
+
+    random.seed(1)
+    first = _deal(42)
+    random.seed(2)
+    assert _deal(42) == first
+    assert _deal(43) != first
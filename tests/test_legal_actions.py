@@ -0,0 +1,192 @@
+import asyncio
+import json
+from typing import Any, cast
+
+import pytest
+
+from bang_py.cards.bang import BangCard
+from bang_py.cards.barrel import BarrelCard
+from bang_py.cards.jail import JailCard
+from bang_py.cards.panic import PanicCard
+from bang_py.cards.roles import OutlawRoleCard, SheriffRoleCard
+from bang_py.characters.apache_kid import ApacheKid
+from bang_py.characters.chuck_wengam import ChuckWengam
+from bang_py.game_manager import GameManager
+from bang_py.player import Player
+
+
+def _table() -> tuple[GameManager, list[Player]]:
+    gm = GameManager()
+    players = [
+        Player("Sheriff", role=SheriffRoleCard()),
+        Player("A", role=OutlawRoleCard()),
+        Player("B", role=OutlawRoleCard()),
+        Player("C", role=OutlawRoleCard()),
+    ]
+    for player in players:
+        gm.add_player(player)
+    return gm, players
+
+
+def _plays(gm: GameManager, player: Player) -> set[tuple[str, str | None]]:
+    return {
+        (a.card.card_name, a.target.name if a.target else None)
+        for a in gm.legal_actions(player)
+        if a.card is not None and a.ability is None
+    }
+
+
+def test_legal_actions_apply_range_jail_and_event_checks() -> None:
+    gm, (sheriff, a, b, c) = _table()
+    a.hand = [BangCard(), PanicCard(), JailCard(), BarrelCard()]
+    b.hand.append(BangCard())
+    assert _plays(gm, a) == {
+        ("Bang!", "Sheriff"),
+        ("Bang!", "B"),
+        ("Panic!", "B"),
+        ("Jail", "B"),
+        ("Jail", "C"),
+        ("Barrel", "A"),
+    }
+    a.metadata.bangs_played = 1
+    gm.event_flags["judge"] = True
+    assert _plays(gm, a) == {("Panic!", "B")}
+
+
+def test_every_listed_action_is_accepted() -> None:
+    gm = GameManager(seed=11, expansions=["dodge_city"])
+    for name in "ABCDE":
+        gm.add_player(Player(name))
+    gm.start_game()
+    player = gm.players[gm.turn_order[gm.current_turn]]
+    snap = gm.snapshot()
+    actions = gm.legal_actions(player)
+    assert actions
+    for action in actions:
+        if action.ability is not None:
+            continue
+        game = GameManager.restore(snap)
+        clone = game.players[gm.players.index(player)]
+        card = clone.hand[cast(int, action.card_index)]
+        target = None if action.target is None else game.players[gm.players.index(action.target)]
+        game.play_card(clone, card, target)
+        assert card not in clone.hand
+
+
+def test_abilities_are_listed() -> None:
+    gm, (sheriff, *_) = _table()
+    sheriff.character = ChuckWengam()
+    sheriff.reset_stats()
+    assert [a.ability for a in gm.legal_actions(sheriff)] == ["chuck_wengam"]
+    sheriff.health = 1
+    assert gm.legal_actions(sheriff) == []
+
+
+def test_room_sends_actions_to_the_active_player() -> None:
+    pytest.importorskip("websockets")
+    from bang_py.network.room import Connection, GameRoom
+
+    room = GameRoom("actions")
+    for name in ("A", "B"):
+        player = Player(name)
+        room.game.add_player(player)
+        room.connections[cast(Any, name)] = Connection(cast(Any, name), player)
+
+    async def start() -> None:
+        room.game.start_game(deal_roles=False)
+
+    asyncio.run(start())
+    active = room.game.players[0]
+    active.hand = [BangCard()]
+    frames = {conn.player.name: json.loads(p) for conn, p in room.prepare_broadcast()}
+    assert frames["A"]["actions"] == [
+        {"action": "play_card", "card_index": 0, "target": 1},
+        {"action": "end_turn"},
+    ]
+    assert frames["B"]["actions"] == []
+
+
+def test_legal_actions_leave_apache_kid_checks_without_effect() -> None:
+    gm, (sheriff, a, _b, _c) = _table()
+    sheriff.character = ApacheKid()
+    sheriff.character.ability(gm, sheriff)
+    bang = BangCard(suit="Diamonds")
+    a.hand = [bang]
+    assert ("Bang!", "Sheriff") not in _plays(gm, a)
+    assert a.hand == [bang] and bang not in gm.discard_pile
+
+
+def test_draw_prompt_answer_opens_play_phase() -> None:
+    pytest.importorskip("websockets")
+    from bang_py.characters.kit_carlson import KitCarlson
+    from bang_py.network.room import Connection, GameRoom
+
+    room = GameRoom("kit")
+    for name in ("A", "B"):
+        player = Player(name)
+        room.game.add_player(player)
+        room.connections[cast(Any, name)] = Connection(cast(Any, name), player)
+    kit = room.game.players[0]
+    kit.character = KitCarlson()
+
+    async def run() -> None:
+        room.game.start_game(deal_roles=False)
+        assert room.game.phase == "draw"
+        await room._ability_kit_carlson(kit, {"action": "use_ability", "discard": 0})
+
+    asyncio.run(run())
+    assert room.game.phase == "play"
+    assert room._legal_actions(kit)[-1] == {"action": "end_turn"}
+
+
+def test_draw_prompt_answers_out_of_turn_are_ignored() -> None:
+    pytest.importorskip("websockets")
+    from bang_py.characters.kit_carlson import KitCarlson
+    from bang_py.characters.pedro_ramirez import PedroRamirez
+    from bang_py.network.room import GameRoom
+
+    room = GameRoom("kit")
+    for name in ("A", "B"):
+        room.game.add_player(Player(name))
+    kit, pedro = room.game.players
+    kit.character = KitCarlson()
+    pedro.character = PedroRamirez()
+
+    async def run() -> None:
+        room.game.start_game(deal_roles=False)
+        assert kit.metadata.awaiting_draw
+        hands = [len(kit.hand), len(pedro.hand)]
+        assert await room._ability_pedro_ramirez(pedro, {"action": "use_ability"})
+        assert [len(kit.hand), len(pedro.hand)] == hands and room.game.phase == "draw"
+
+        await room._ability_kit_carlson(kit, {"action": "use_ability", "discard": 0})
+        drawn = len(kit.hand)
+        assert drawn == hands[0] + 2
+        assert await room._ability_kit_carlson(kit, {"action": "use_ability", "discard": 0})
+        assert len(kit.hand) == drawn
+
+    asyncio.run(run())
+
+
+def test_only_the_current_player_ends_the_turn() -> None:
+    pytest.importorskip("websockets")
+    from bang_py.network.room import Connection, GameRoom
+
+    room = GameRoom("turns")
+    for name in ("A", "B", "C"):
+        player = Player(name)
+        room.game.add_player(player)
+        room.connections[cast(Any, name)] = Connection(cast(Any, name), player)
+
+    async def run() -> None:
+        room.game.start_game(deal_roles=False)
+        current = room.game._current_player_obj()
+        assert current is not None
+        other = next(p for p in room.game.players if p is not current)
+        for message in ("end_turn", json.dumps({"action": "end_turn"})):
+            await room._process_message(cast(Any, other.name), message)
+            assert room.game._current_player_obj() is current
+        await room._process_message(cast(Any, current.name), "end_turn")
+        assert room.game._current_player_obj() is not current
+
+    asyncio.run(run())
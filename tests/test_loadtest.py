@@ -0,0 +1,36 @@
+import random
+
+import pytest
+
+pytest.importorskip("websockets")
+
+from bang_py.network.loadtest import (  # noqa: E402
+    END_TURN,
+    MAX_PLAYS_PER_TURN,
+    LoadTestStats,
+    choose_action,
+    run_loadtest,
+)
+
+
+def test_choose_action_ends_turn_when_nothing_else_is_legal() -> None:
+    play = {"action": "play_card", "card_index": 0}
+    rng = random.Random(0)
+    assert choose_action([END_TURN], "random", rng, 0) == END_TURN
+    assert choose_action([play, END_TURN], "first", rng, 0) == play
+    assert choose_action([play, END_TURN], "first", rng, MAX_PLAYS_PER_TURN) == END_TURN
+
+
+def test_percentile_picks_from_sorted_latencies() -> None:
+    stats = LoadTestStats(latencies=[0.3, 0.1, 0.2, 0.4])
+    assert stats.percentile(0.5) == 0.3
+    assert stats.percentile(0.99) == 0.4
+    assert LoadTestStats().percentile(0.5) == 0.0
+
+
+@pytest.mark.slow
+def test_loadtest_plays_a_room_and_reports_latency() -> None:
+    stats = run_loadtest(rooms=1, players=3, duration=3.0, seed=0)
+    assert stats.connected == 3 and not stats.errors
+    assert stats.actions > 0 and stats.latencies
+    assert "latency p99" in stats.report()
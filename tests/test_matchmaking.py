@@ -0,0 +1,184 @@
+import asyncio
+import json
+from typing import Any, cast
+
+import pytest
+
+pytest.importorskip("websockets")
+
+from bang_py.network.matchmaking import MatchQueue, Ticket, table_key  # noqa: E402
+from bang_py.network.server import BangServer  # noqa: E402
+from bang_py.player import Player  # noqa: E402
+
+
+def test_table_key_validates_size_and_expansions() -> None:
+    assert table_key(4, ["high_noon", "dodge_city", "high_noon"]) == (
+        4,
+        ("dodge_city", "high_noon"),
+    )
+    assert table_key(3, []) == (3, ())
+    for players, expansions in ((2, []), (8, []), (True, []), ("4", []), (4, ["nope"]), (4, "")):
+        assert table_key(players, expansions) is None
+
+
+def test_queue_seats_full_tables_first_come_first_served() -> None:
+    async def run() -> None:
+        queue = MatchQueue(max_waiting=5)
+        key, other = (3, ()), (3, ("dodge_city",))
+        tickets = [Ticket(f"p{i}", key) for i in range(4)]
+        stranger = Ticket("s", other)
+        assert queue.add(tickets[0]) is None
+        assert queue.add(stranger) is None
+        assert queue.add(tickets[1]) is None
+        queue.remove(tickets[1])
+        queue.remove(tickets[1])
+        assert len(queue) == 2 and queue.waiting(key) == 1
+        assert queue.add(tickets[2]) is None
+        assert queue.add(tickets[3]) == [tickets[0], tickets[2], tickets[3]]
+        assert queue.waiting(key) == 0 and len(queue) == 1
+        assert queue.add(tickets[1]) is None
+
+        for i in range(3):
+            queue.add(Ticket(f"q{i}", (4, ())))
+        assert queue.is_full
+        with pytest.raises(OverflowError):
+            queue.add(Ticket("late", key))
+
+    asyncio.run(run())
+
+
+def test_lobby_lists_open_rooms_only() -> None:
+    server = BangServer(room_code="main", max_players=2)
+    full = server.create_room("full", max_players=1)
+    full.game.add_player(Player("A"))
+    server.create_room("noon", expansions=["high_noon"], max_players=3)
+    server.create_room("matched", max_players=3).reserved = ["C", "D", "E"]
+    server.rooms["main"].game.add_player(Player("B"))
+    assert server.lobby() == [
+        {
+            "code": "main",
+            "players": 1,
+            "max_players": 2,
+            "expansions": ["dodge_city"],
+            "spectators": 0,
+        },
+        {
+            "code": "noon",
+            "players": 0,
+            "max_players": 3,
+            "expansions": ["high_noon"],
+            "spectators": 0,
+        },
+    ]
+
+
+class _Waiting:
+    """Socket of a client that waits for its table without disconnecting."""
+
+    def __init__(self) -> None:
+        self.sent: list[str] = []
+
+    async def send(self, message: str) -> None:
+        self.sent.append(message)
+
+    async def wait_closed(self) -> None:
+        await asyncio.Future()
+
+
+def test_players_are_told_when_their_matched_room_is_gone() -> None:
+    async def run() -> None:
+        server = BangServer(room_code="main")
+        sockets = [_Waiting(), _Waiting()]
+        waiting = [
+            asyncio.create_task(
+                server._matchmake(cast(Any, ws), {"match": True, "name": name, "players": 3})
+            )
+            for ws, name in zip(sockets, ("Alice", "Bob"))
+        ]
+        while len(server.matchmaking) < 2:
+            await asyncio.sleep(0)
+        table = server.matchmaking.add(Ticket("Cleo", (3, ())))
+        assert table is not None
+        server._open_table((3, ()), table)
+        server.remove_room(table[0].seat.result())
+        await asyncio.gather(*waiting)
+        for ws in sockets:
+            assert json.loads(ws.sent[-1])["error"]["code"] == "match_abandoned"
+        assert server.metrics.handshakes.value(outcome="match_abandoned") == 2
+
+    asyncio.run(run())
+
+
+@pytest.mark.slow
+def test_matched_room_refuses_players_who_were_not_matched() -> None:
+    from websockets.asyncio.client import connect
+    from websockets.asyncio.server import serve
+
+    async def join(uri: str, code: str, name: str) -> str:
+        async with connect(uri) as ws:
+            await ws.recv()
+            await ws.send(code)
+            await ws.recv()
+            await ws.send(name)
+            return str(await ws.recv())
+
+    async def run() -> None:
+        server = BangServer(host="localhost", port=0, room_code="main")
+        async with serve(server.handler, server.host, server.port) as ws_server:
+            uri = f"ws://localhost:{next(iter(ws_server.sockets)).getsockname()[1]}"
+            table = [Ticket(name, (3, ())) for name in ("Alice", "Bob", "Cleo")]
+            server._open_table((3, ()), table)
+            code = table[0].seat.result()
+            assert [r["code"] for r in server.lobby()] == ["main"]
+
+            assert await join(uri, code, "Mallory") == "Seat reserved"
+            assert await join(uri, code, "Bob") == "Joined game as Bob"
+            # Joining uses up Bob's reservation; Alice's and Cleo's seats are still kept.
+            assert server.rooms[code].reserved == ["Alice", "Cleo"]
+            assert await join(uri, code, "Bob") == "Seat reserved"
+            assert server.metrics.handshakes.value(outcome="reserved") == 2
+
+    asyncio.run(run())
+
+
+@pytest.mark.slow
+def test_matchmaking_seats_waiting_players_in_a_new_room() -> None:
+    from websockets.asyncio.client import connect
+    from websockets.asyncio.server import serve
+
+    async def queue(ws: Any, name: str) -> dict[str, Any]:
+        await ws.recv()
+        request = {"match": True, "name": name, "players": 3, "expansions": ["dodge_city"]}
+        await ws.send(json.dumps(request))
+        return dict(json.loads(await ws.recv()))
+
+    async def run() -> None:
+        server = BangServer(host="localhost", port=0, room_code="main")
+        async with serve(server.handler, server.host, server.port) as ws_server:
+            uri = f"ws://localhost:{next(iter(ws_server.sockets)).getsockname()[1]}"
+            async with connect(uri) as gone:
+                assert (await queue(gone, "Gone"))["queued"] == {"players": 3, "waiting": 1}
+            while len(server.matchmaking):
+                await asyncio.sleep(0.01)
+
+            async with connect(uri) as a, connect(uri) as b, connect(uri) as c:
+                assert (await queue(a, "Alice"))["queued"]["waiting"] == 1
+                assert (await queue(b, "Bob"))["queued"]["waiting"] == 2
+                assert (await queue(c, "Cleo"))["queued"]["waiting"] == 3
+                codes = set()
+                for ws, name in ((a, "Alice"), (b, "Bob"), (c, "Cleo")):
+                    codes.add(json.loads(await ws.recv())["matched"])
+                    assert await ws.recv() == f"Joined game as {name}"
+                (code,) = codes
+                room = server.rooms[code]
+                assert room.max_players == 3 and room.auto_start
+                assert list(room.game.expansions) == ["dodge_city"]
+                assert len(server.matchmaking) == 0
+
+                async with connect(uri) as browser:
+                    await browser.recv()
+                    await browser.send(json.dumps({"lobby": True}))
+                    listing = json.loads(await browser.recv())["rooms"]
+                    assert [r["code"] for r in listing] == ["main"]
+
+    asyncio.run(run())
@@ -0,0 +1,67 @@
+import asyncio
+from typing import Any, cast
+
+import pytest
+
+from bang_py.network.metrics import Histogram, ServerMetrics, serve_metrics
+
+
+def test_render_uses_text_exposition_format() -> None:
+    metrics = ServerMetrics()
+    metrics.messages.inc(action="play_card")
+    metrics.messages.inc(action="play_card")
+    hist = Histogram("bang_test_seconds", "Test", buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 5.0):
+        hist.observe(value)
+    text = metrics.render()
+    assert "# TYPE bang_messages_processed_total counter" in text
+    assert 'bang_messages_processed_total{action="play_card"} 2' in text
+    assert "bang_connections 0" in text
+    assert hist.samples() == [
+        'bang_test_seconds_bucket{le="0.1"} 1',
+        'bang_test_seconds_bucket{le="1"} 2',
+        'bang_test_seconds_bucket{le="+Inf"} 3',
+        "bang_test_seconds_sum 5.55",
+        "bang_test_seconds_count 3",
+    ]
+
+
+def test_metrics_are_scraped_over_http() -> None:
+    metrics = ServerMetrics()
+    metrics.games_started.inc()
+
+    async def scrape(path: str) -> bytes:
+        server = await serve_metrics(metrics, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(f"GET {path} HTTP/1.1\r\nHost: x\r\n\r\n".encode())
+            response = await reader.read()
+            writer.close()
+            return response
+
+    response = asyncio.run(scrape("/metrics"))
+    assert response.startswith(b"HTTP/1.1 200 OK")
+    assert b"bang_games_started_total 1" in response
+    assert asyncio.run(scrape("/other")).startswith(b"HTTP/1.1 404")
+
+
+def test_room_records_messages_and_broadcasts() -> None:
+    pytest.importorskip("websockets")
+    from bang_py.network.room import Connection, GameRoom
+    from bang_py.player import Player
+
+    room = GameRoom("metrics")
+    player = Player("A")
+    room.game.add_player(player)
+    room.connections[cast(Any, "A")] = Connection(cast(Any, "A"), player)
+
+    async def run() -> None:
+        await room._process_message(cast(Any, "A"), '{"action": "set_auto_miss", "enabled": false}')
+        await room.broadcast_state()
+
+    asyncio.run(run())
+    metrics = room.metrics
+    assert metrics.messages.value(action="set_auto_miss") == 1
+    assert metrics.message_seconds.count == 1
+    assert metrics.broadcasts.total() == 1 and metrics.broadcast_seconds.count == 1
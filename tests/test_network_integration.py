@@ -50,9 +50,8 @@ def test_server_client_play_flow() -> None:
 
                 await ws2.send(json.dumps({"action": "play_card", "card_index": 0, "target": 0}))
                 data = json.loads(await ws2.recv())
-                assert "Bob played" in data["message"]
-                data = json.loads(await ws2.recv())
-                assert "eliminated" in data["message"]
+                assert "Bob played" in data["messages"][0]
+                assert any("eliminated" in msg for msg in data["messages"][1:])
                 assert not alice.is_alive()
 
     asyncio.run(run_flow())
@@ -0,0 +1,114 @@
+import asyncio
+import json
+from typing import Any, cast
+
+import pytest
+
+from bang_py.network.outbox import Outbox
+from bang_py.network.state import StateTracker
+
+
+def test_outbox_keeps_order_and_replaces_waiting_state() -> None:
+    async def run() -> list[str | bytes | None]:
+        outbox = Outbox(max_size=3)
+        assert outbox.put("prompt")
+        assert outbox.put_state("state 1")
+        assert outbox.put("error")
+        assert outbox.put_state("state 2")
+        assert len(outbox) == 3 and outbox.has_state
+        assert not outbox.put("overflow")
+        received = [await outbox.get() for _ in range(3)]
+        outbox.close()
+        received.append(await outbox.get())
+        return received
+
+    assert asyncio.run(run()) == ["prompt", "state 2", "error", None]
+
+
+def test_discard_state_removes_its_slot() -> None:
+    outbox = Outbox()
+    outbox.put_state("state")
+    outbox.put("prompt")
+    outbox.discard_state()
+    assert not outbox.has_state and len(outbox) == 1
+
+
+class _Socket:
+    """Websocket double that records sends, or blocks them when ``stalled``."""
+
+    def __init__(self, stalled: bool = False) -> None:
+        self.stalled = stalled
+        self.sent: list[str | bytes] = []
+        self.closed: int | None = None
+
+    async def send(self, payload: str | bytes) -> None:
+        if self.stalled:
+            await asyncio.Event().wait()
+        self.sent.append(payload)
+
+    async def close(self, code: int = 1000, reason: str = "") -> None:
+        self.closed = code
+
+
+def _seat(room: Any, name: str, socket: _Socket, queue_size: int = 64) -> Any:
+    from bang_py.network.room import Connection
+    from bang_py.player import Player
+
+    player = Player(name)
+    room.game.add_player(player)
+    conn = Connection(cast(Any, socket), player, outbox=Outbox(queue_size))
+    room.connections[cast(Any, socket)] = conn
+    return conn
+
+
+def test_waiting_state_frame_is_replaced_by_latest() -> None:
+    pytest.importorskip("websockets")
+    from bang_py.network.room import GameRoom
+
+    room = GameRoom("latest")
+    conn = _seat(room, "Alice", _Socket())
+    tracker = StateTracker()
+
+    async def run() -> None:
+        await room.broadcast_state("first")
+        tracker.apply(json.loads(cast(str, await conn.outbox.get())))
+        conn.player.health -= 1
+        await room.broadcast_state("hit")
+        conn.player.health -= 1
+        await room.broadcast_state("hit again")
+        assert len(conn.outbox) == 1
+        frame = json.loads(cast(str, await conn.outbox.get()))
+        assert frame["messages"] == ["hit", "hit again"]
+        state = tracker.apply(frame)
+        assert state is not None and state["players"][0]["health"] == conn.player.health
+
+    asyncio.run(run())
+
+
+def test_stalled_client_is_evicted_without_blocking_others() -> None:
+    pytest.importorskip("websockets")
+    from bang_py.network.room import GameRoom
+
+    room = GameRoom("stall")
+    slow = _seat(room, "Slow", _Socket(stalled=True), queue_size=2)
+    fast = _seat(room, "Fast", _Socket())
+
+    async def run() -> None:
+        async with slow.task_group, fast.task_group:
+            writers = [
+                slow.task_group.create_task(room._write_loop(slow)),
+                fast.task_group.create_task(room._write_loop(fast)),
+            ]
+            for i in range(4):
+                await asyncio.wait_for(room.broadcast_state(f"tick {i}"), 1)
+                room._send(slow, {"prompt": "general_store", "cards": []})
+                await asyncio.sleep(0)
+            assert slow.outbox.closed
+            for writer in writers:
+                writer.cancel()
+
+    asyncio.run(run())
+    assert slow.websocket.closed == 1008
+    assert fast.websocket.closed is None
+    messages = [m for payload in fast.websocket.sent for m in json.loads(payload)["messages"]]
+    assert messages == [f"tick {i}" for i in range(4)]
@@ -0,0 +1,166 @@
+import asyncio
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, cast
+
+import pytest
+
+pytest.importorskip("websockets")
+
+from bang_py.action_log import replay  # noqa: E402
+from bang_py.characters.pat_brennan import PatBrennan  # noqa: E402
+from bang_py.game_manager import GameManager  # noqa: E402
+from bang_py.network import persistence  # noqa: E402
+from bang_py.network.persistence import JOURNAL_FILE, RoomStore, stored_rooms  # noqa: E402
+from bang_py.network.room import Connection, GameRoom  # noqa: E402
+from bang_py.network.server import BangServer  # noqa: E402
+from bang_py.player import Player  # noqa: E402
+
+
+def _describe(game: Any) -> list[object]:
+    gm = cast(GameManager, game)
+    assert gm.deck is not None
+    return [
+        [(p.name, p.health, [c.card_name for c in p.hand], list(p.equipment)) for p in gm.players],
+        [(c.card_name, c.suit, c.rank) for c in gm.deck.cards],
+        [c.card_name for c in gm.discard_pile],
+        gm.turn_order,
+        gm.current_turn,
+        gm.phase,
+        gm.rng.getstate(),
+    ]
+
+
+def _room(directory: Path, snapshot_every: int = 256) -> GameRoom:
+    room = GameRoom("r1", seed=7, store=RoomStore(directory, snapshot_every=snapshot_every))
+    for name in ("A", "B", "C", "D"):
+        room.game.add_player(Player(name))
+    room.game.start_game()
+    return room
+
+
+def _restored(directory: Path) -> GameRoom:
+    ((store, checkpoint, commands),) = stored_rooms(directory.parent)
+    return GameRoom.restore(store, checkpoint, commands)
+
+
+def test_room_is_restored_from_snapshot_and_journal(tmp_path: Path) -> None:
+    room = _room(tmp_path / "r1", snapshot_every=3)
+    for _ in range(8):
+        room.game.end_turn()
+        room._checkpoint()
+    assert room.store is not None and room.store.pending == 1
+    room.store.close()
+
+    copy = _restored(tmp_path / "r1")
+    assert copy.code == "r1"
+    assert _describe(copy.game) == _describe(room.game)
+    copy.game.end_turn()
+    room.game.end_turn()
+    assert _describe(copy.game) == _describe(room.game)
+
+
+def test_incomplete_last_journal_line_is_dropped(tmp_path: Path) -> None:
+    room = _room(tmp_path / "r1")
+    room.game.end_turn()
+    assert room.store is not None
+    room.store.close()
+    expected = _describe(room.game)
+    with open(tmp_path / "r1" / JOURNAL_FILE, "a", encoding="utf-8") as handle:
+        handle.write('["end_tu')
+
+    assert _describe(_restored(tmp_path / "r1").game) == expected
+
+
+def test_journal_of_an_older_generation_is_ignored(tmp_path: Path) -> None:
+    room = _room(tmp_path / "r1")
+    room._checkpoint(force=True)
+    assert room.store is not None
+    journal = tmp_path / "r1" / JOURNAL_FILE
+    lines = journal.read_text().splitlines()
+    # As if the server died right after writing a newer snapshot.
+    lines[0] = json.dumps({"generation": room.store.generation - 1})
+    journal.write_text("\n".join([*lines, '["end_turn",[],{}]']) + "\n")
+    expected = _describe(room.game)
+
+    assert _describe(_restored(tmp_path / "r1").game) == expected
+
+
+def test_room_draws_are_logged_as_their_own_commands(tmp_path: Path) -> None:
+    room = GameRoom("r1", seed=3, store=RoomStore(tmp_path / "r1"))
+    room.game.add_player(Player("A"))
+    room.game.add_player(Player("B", character=PatBrennan()))
+    socket = cast(Any, object())
+    room.connections[socket] = Connection(socket, room.game.players[1])
+    room.game.start_game(deal_roles=False)
+    # Nobody has equipment in play, so the room draws for Pat Brennan.
+    room.game.end_turn()
+    log = room.game.action_log
+    assert log is not None
+    assert [name for name, _args, _kwargs in log.commands[-3:]] == [
+        "end_turn",
+        "draw_phase",
+        "play_phase",
+    ]
+    assert _describe(replay(log)) == _describe(room.game)
+    assert _describe(_restored(tmp_path / "r1").game) == _describe(room.game)
+
+
+def test_server_restores_rooms_and_sessions(tmp_path: Path) -> None:
+    server = BangServer(state_dir=tmp_path, room_code="keep", reconnect_grace=5)
+    room = server.rooms["keep"]
+    for name in ("A", "B", "C"):
+        room.game.add_player(Player(name))
+    room._sessions["token"] = room.game.players[1]
+    room._checkpoint(force=True)
+    room.game.start_game()
+    server.create_room("gone")
+    server.remove_room("gone")
+
+    restarted = BangServer(state_dir=tmp_path)
+    assert list(restarted.rooms) == ["keep"]
+    assert restarted.room_code == "keep"
+    assert _describe(restarted.game) == _describe(room.game)
+    assert restarted.rooms["keep"].has_session("token")
+    assert restarted.rooms["keep"]._sessions["token"].name == "B"
+    assert not (tmp_path / "gone").exists()
+
+
+def test_writes_run_off_the_loop_and_quiet_journals_are_synced(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    fsync = os.fsync
+    threads: list[str] = []
+
+    def recording_fsync(fd: int) -> None:
+        threads.append(threading.current_thread().name)
+        fsync(fd)
+
+    monkeypatch.setattr(os, "fsync", recording_fsync)
+    # A writer of this test's own, stopped before later tests fork.
+    writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="room-store")
+    monkeypatch.setattr(persistence, "_writer", writer)
+
+    async def run() -> GameRoom:
+        store = RoomStore(tmp_path / "r1", fsync_interval=0.02)
+        room = GameRoom("r1", seed=7, store=store)
+        for name in ("A", "B", "C"):
+            room.game.add_player(Player(name))
+        room.game.start_game()
+        assert store._last is not None
+        store._last.result()
+        synced = len(threads)
+        # Nothing follows the last command, so the timer syncs it.
+        assert store._sync_timer is not None
+        await asyncio.sleep(0.05)
+        store._last.result()
+        assert len(threads) == synced + 1
+        assert threads and all(t.startswith("room-store") for t in threads)
+        return room
+
+    room = asyncio.run(run())
+    writer.shutdown()
+    assert _describe(_restored(tmp_path / "r1").game) == _describe(room.game)
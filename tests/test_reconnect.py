@@ -0,0 +1,86 @@
+import asyncio
+import json
+
+import pytest
+
+pytestmark = pytest.mark.slow
+
+pytest.importorskip("cryptography")
+
+from bang_py.network.server import BangServer  # noqa: E402
+
+websockets = pytest.importorskip("websockets")
+from websockets.asyncio.client import ClientConnection, connect  # noqa: E402
+from websockets.asyncio.server import serve  # noqa: E402
+
+
+async def _handshake(ws: ClientConnection, code: str, request: dict[str, object]) -> str:
+    await ws.recv()
+    await ws.send(code)
+    await ws.recv()
+    await ws.send(json.dumps(request))
+    return str(await ws.recv())
+
+
+def test_resume_restores_held_seat_with_keyframe() -> None:
+    async def run_flow() -> None:
+        server = BangServer(host="localhost", port=0, room_code="r001")
+        async with serve(server.handler, server.host, server.port) as ws_server:
+            uri = f"ws://localhost:{next(iter(ws_server.sockets)).getsockname()[1]}"
+            async with connect(uri) as ws:
+                request = {"name": "Alice", "session": True}
+                assert await _handshake(ws, "r001", request) == "Joined game as Alice"
+                session = json.loads(await ws.recv())
+                assert session["grace"] == server.reconnect_grace
+                first = json.loads(await ws.recv())
+            await asyncio.sleep(0.05)
+            assert not server.connections
+            assert [p.name for p in server.game.players] == ["Alice"]
+            async with connect(uri) as ws:
+                request = {"resume": session["session"]}
+                assert await _handshake(ws, "r001", request) == "Resumed game as Alice"
+                frame = json.loads(await ws.recv())
+                assert frame["keyframe"] and frame["version"] >= first["version"]
+                assert frame["players"][0]["name"] == "Alice"
+                assert len(server.game.players) == 1
+
+    asyncio.run(run_flow())
+
+
+def test_seat_is_freed_after_grace_period() -> None:
+    async def run_flow() -> None:
+        server = BangServer(host="localhost", port=0, room_code="r002", reconnect_grace=0.05)
+        async with serve(server.handler, server.host, server.port) as ws_server:
+            uri = f"ws://localhost:{next(iter(ws_server.sockets)).getsockname()[1]}"
+            async with connect(uri) as ws:
+                await _handshake(ws, "r002", {"name": "Bob", "session": True})
+                session = json.loads(await ws.recv())
+            await asyncio.sleep(0.2)
+            assert not server.game.players
+            async with connect(uri) as ws:
+                reply = await _handshake(ws, "r002", {"resume": session["session"]})
+                assert reply == "Invalid session"
+
+    asyncio.run(run_flow())
+
+
+def test_resume_replaces_a_stale_connection() -> None:
+    async def run_flow() -> None:
+        server = BangServer(host="localhost", port=0, room_code="r003")
+        async with serve(server.handler, server.host, server.port) as ws_server:
+            uri = f"ws://localhost:{next(iter(ws_server.sockets)).getsockname()[1]}"
+            async with connect(uri) as stale:
+                await _handshake(stale, "r003", {"name": "Cleo", "session": True})
+                session = json.loads(await stale.recv())
+                async with connect(uri) as ws:
+                    reply = await _handshake(ws, "r003", {"resume": session["session"]})
+                    assert reply == "Resumed game as Cleo"
+                    await ws.recv()
+                    with pytest.raises(websockets.exceptions.ConnectionClosed):
+                        while True:
+                            await stale.recv()
+                    await asyncio.sleep(0.05)
+                    assert len(server.connections) == 1
+                    assert [p.name for p in server.game.players] == ["Cleo"]
+
+    asyncio.run(run_flow())
@@ -0,0 +1,122 @@
+import asyncio
+import time
+from pathlib import Path
+from typing import Any, cast
+
+import pytest
+
+pytest.importorskip("websockets")
+
+from bang_py.network.room import GameRoom  # noqa: E402
+from bang_py.network.server import STATE_SAMPLES, BangServer  # noqa: E402
+from bang_py.player import Player  # noqa: E402
+
+
+class _Socket:
+    subprotocol = None
+
+
+def test_finished_and_abandoned_rooms_are_reaped_after_their_ttl(tmp_path: Path) -> None:
+    server = BangServer(room_code="main", room_ttl=0.01, state_dir=tmp_path)
+    finished = server.create_room("done")
+    abandoned = server.create_room("left")
+    unused = server.create_room("new")
+    for callback in finished.game.game_over_listeners:
+        callback("Sheriff wins")
+    for callback in server.rooms["main"].game.game_over_listeners:
+        callback("Outlaws win")
+    websocket = cast(Any, _Socket())
+    abandoned._connect(websocket, Player("A"))
+    assert abandoned.idle_since is None
+    del abandoned.connections[websocket]
+    abandoned._update_idle()
+
+    assert server.sweep_rooms() == []
+    assert server.metrics.idle_rooms.value() == 3
+    time.sleep(0.02)
+    assert sorted(server.sweep_rooms()) == ["done", "left", "main"]
+    assert server.metrics.rooms_reaped.value(reason="game_over") == 2
+    assert server.metrics.rooms_reaped.value(reason="abandoned") == 1
+    assert not (tmp_path / "done").exists() and finished.store is None
+    # The default room comes back empty; rooms nobody used yet are kept.
+    assert set(server.rooms) == {"main", "new"} and server.rooms["new"] is unused
+    assert not server.game.players and server.rooms["main"].idle_since is None
+
+
+def test_sweep_reports_room_usage_until_the_room_is_gone() -> None:
+    server = BangServer(room_code="main", room_ttl=0)
+    room = server.create_room("busy")
+    room.game.add_player(Player("A"))
+    for callback in room.game.game_over_listeners:
+        callback("Renegade wins")
+    assert server.sweep_rooms() == []
+
+    usage = room.usage()
+    assert usage.players == 1 and usage.tasks == 0 and usage.queued_messages == 0
+    assert server.metrics.room_state_bytes.value(room="busy") == room.state_size() > 0
+    assert server.metrics.room_tasks.value(room="busy") == 0
+    server.remove_room("busy")
+    assert 'room="busy"' not in server.metrics.render()
+
+
+def test_sweeps_take_turns_measuring_game_sizes() -> None:
+    server = BangServer(room_code="main", room_ttl=0)
+    for i in range(STATE_SAMPLES + 1):
+        server.create_room(f"r{i}")
+
+    def sampled() -> int:
+        return server.metrics.render().count("bang_room_state_bytes{")
+
+    server.sweep_rooms()
+    assert sampled() == STATE_SAMPLES
+    server.sweep_rooms()
+    assert sampled() == len(server.rooms)
+
+
+def test_seats_held_for_reconnecting_players_keep_the_room_in_use() -> None:
+    async def run() -> None:
+        room = GameRoom("held", reconnect_grace=0.01)
+        player = Player("A")
+        room.game.add_player(player)
+        room._sessions["token"] = player
+        room._leave(player)
+        room._update_idle()
+        assert room.idle_since is None
+        await asyncio.sleep(0.03)
+        assert not room.game.players and room.idle_since is not None
+
+    asyncio.run(run())
+
+
+@pytest.mark.slow
+def test_reaping_a_finished_room_disconnects_its_clients() -> None:
+    from websockets.asyncio.client import connect
+    from websockets.asyncio.server import serve
+    from websockets.exceptions import ConnectionClosed
+
+    async def run() -> None:
+        server = BangServer(host="localhost", port=0, room_code="main", room_ttl=0.01)
+        server.create_room("done")
+        async with serve(server.handler, server.host, server.port) as ws_server:
+            uri = f"ws://localhost:{next(iter(ws_server.sockets)).getsockname()[1]}"
+            async with connect(uri) as ws:
+                await ws.recv()
+                await ws.send("done")
+                await ws.recv()
+                await ws.send("Alice")
+                assert await ws.recv() == "Joined game as Alice"
+                room = server.rooms["done"]
+                assert room.usage().tasks >= 2
+                for callback in room.game.game_over_listeners:
+                    callback("Sheriff wins")
+                await asyncio.sleep(0.02)
+                assert server.sweep_rooms() == ["done"]
+                with pytest.raises(ConnectionClosed):
+                    while True:
+                        await ws.recv()
+                assert ws.close_code == 1001
+            while server.metrics.connections.value():
+                await asyncio.sleep(0.01)
+            assert not room.connections and room.usage().tasks == 0
+
+    asyncio.run(run())
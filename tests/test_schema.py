@@ -0,0 +1,71 @@
+from typing import Any
+
+import pytest
+
+from bang_py.network.schema import PAYLOAD_SCHEMAS, Field, compile_schema, parse_payload
+
+
+def test_parse_payload_builds_typed_payloads() -> None:
+    assert parse_payload({"action": "draw"}) == {"action": "draw", "num": 1}
+    payload: dict[str, Any] = {
+        "action": "use_ability",
+        "ability": "sid_ketchum",
+        "indices": [0, 1],
+        "target": None,
+        "extra": "ignored",
+    }
+    assert parse_payload(payload) == {
+        "action": "use_ability",
+        "ability": "sid_ketchum",
+        "indices": [0, 1],
+    }
+
+
+@pytest.mark.parametrize(
+    "payload,message",
+    [
+        ({"action": "discard"}, "card_index must be int"),
+        ({"action": "play_card", "card_index": 0, "target": "x"}, "invalid card_index or target"),
+        (
+            {"action": "use_ability", "ability": "x", "indices": [0, "1"]},
+            "indices must be list[int]",
+        ),
+        ({"action": "set_auto_miss", "enabled": 1}, "enabled must be bool"),
+    ],
+)
+def test_parse_payload_reports_invalid_fields(payload: dict[str, object], message: str) -> None:
+    assert parse_payload(payload) == {"error": {"code": "invalid_field", "message": message}}
+
+
+@pytest.mark.parametrize("action", ["fly", ["draw"], None, "ack_state"])
+def test_parse_payload_rejects_unknown_actions(action: object) -> None:
+    result: Any = parse_payload({"action": action})
+    assert result["error"]["code"] == "unknown_action"
+
+
+def test_compiled_schema_applies_defaults() -> None:
+    validate = compile_schema("x", [Field("n", int, default=3), Field("s", str, required=True)])
+    assert validate({"s": "a"}) == {"action": "x", "n": 3, "s": "a"}
+    assert validate({"n": 1}) == {"error": {"code": "invalid_field", "message": "s must be str"}}
+
+
+def test_every_action_has_a_room_handler() -> None:
+    pytest.importorskip("websockets")
+    from bang_py.network.room import GameRoom
+
+    room = GameRoom("schema")
+    assert set(room._action_handlers) == set(PAYLOAD_SCHEMAS)
+    assert "vera_custer" in room._ability_handlers
+    assert "kit_carlson" in room._prompt_starters
+
+
+def test_room_refuses_draw_prompts_without_a_handler(monkeypatch: pytest.MonkeyPatch) -> None:
+    pytest.importorskip("websockets")
+    from bang_py.network.room import GameRoom
+    from bang_py.characters.base import DRAW_PROMPTS, BaseCharacter
+    from bang_py.characters.kit_carlson import KitCarlson
+
+    character: type[BaseCharacter] = KitCarlson
+    monkeypatch.setitem(DRAW_PROMPTS, character, "kit_carslon")
+    with pytest.raises(RuntimeError, match="kit_carslon"):
+        GameRoom("typo")
@@ -0,0 +1,118 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("cryptography")
+pytest.importorskip("websockets")
+
+from bang_py.network.server import MAX_MESSAGE_SIZE, WRITE_LIMIT, BangServer  # noqa: E402
+from websockets.asyncio.client import connect  # noqa: E402
+from websockets.asyncio.server import serve  # noqa: E402
+
+
+def test_rooms_have_isolated_games() -> None:
+    server = BangServer(room_code="main")
+    other = server.create_room("side", max_players=3)
+    assert server.get_room("main") is not other
+    assert server.rooms["main"].game is not other.game
+    assert other.max_players == 3
+    assert server.rooms["main"].max_players == 7
+
+
+def test_create_room_rejects_duplicate_code() -> None:
+    server = BangServer(room_code="dup")
+    with pytest.raises(ValueError):
+        server.create_room("dup")
+
+
+def test_remove_room_unregisters_code() -> None:
+    server = BangServer(room_code="keep")
+    server.create_room("gone")
+    assert server.remove_room("gone") is not None
+    assert server.get_room("gone") is None
+    assert server.remove_room("gone") is None
+
+
+async def _join(port: int, code: str, name: str):
+    ws = await connect(f"ws://localhost:{port}")
+    await ws.recv()
+    await ws.send(code)
+    await ws.recv()
+    await ws.send(name)
+    await ws.recv()
+    await ws.recv()
+    return ws
+
+
+@pytest.mark.slow
+def test_handler_routes_clients_by_room_code() -> None:
+    async def run_flow() -> None:
+        server = BangServer(host="localhost", port=0, room_code="r001")
+        server.create_room("r002")
+        async with serve(server.handler, server.host, server.port) as ws_server:
+            port = next(iter(ws_server.sockets)).getsockname()[1]
+            ws1 = await _join(port, "r001", "Alice")
+            ws2 = await _join(port, "r002", "Bob")
+            try:
+                assert [p.name for p in server.rooms["r001"].game.players] == ["Alice"]
+                assert [p.name for p in server.rooms["r002"].game.players] == ["Bob"]
+                assert len(server.rooms["r002"].connections) == 1
+            finally:
+                await ws1.close()
+                await ws2.close()
+            await asyncio.sleep(0.05)
+            assert not server.rooms["r002"].connections
+
+    asyncio.run(run_flow())
+
+
+def test_start_passes_socket_settings(monkeypatch) -> None:
+    from bang_py.network import server as server_module
+
+    seen: dict[str, object] = {}
+
+    def fake_serve(*_args: object, **kwargs: object) -> object:
+        seen.update(kwargs)
+        raise RuntimeError("stop")
+
+    monkeypatch.setattr(server_module, "serve", fake_serve)
+    server = BangServer(
+        room_code="tune", compression=False, max_message_size=1024, write_limit=2048
+    )
+    with pytest.raises(RuntimeError):
+        asyncio.run(server.start())
+    assert seen["compression"] is None
+    assert seen["max_size"] == 1024
+    assert seen["write_limit"] == 2048
+    assert server.rooms["tune"].max_message_size == 1024
+    assert server.create_room("more").max_message_size == 1024
+
+
+def test_cli_forwards_socket_flags(monkeypatch) -> None:
+    from bang_py.network import cli
+
+    seen: dict[str, object] = {}
+
+    class FakeServer:
+        # The default room exists as soon as the server is created.
+        rooms: dict[str, object] = {"default": object()}
+
+        def __init__(self, **kwargs: object) -> None:
+            seen.update(kwargs)
+
+        async def start(self) -> None:
+            return None
+
+    monkeypatch.setattr(cli, "BangServer", FakeServer)
+    cli.main(["--no-compression", "--max-message-size", "8192", "--write-limit", "65536"])
+    assert seen["compression"] is False
+    assert seen["metrics_port"] is None
+    assert seen["max_message_size"] == 8192
+    assert seen["write_limit"] == 65536
+    cli.main([])
+    assert seen["compression"] is True
+    assert seen["max_message_size"] == MAX_MESSAGE_SIZE
+    assert seen["write_limit"] == WRITE_LIMIT
+    cli.main(["--metrics-port", "9100", "--metrics-interval", "30", "--reconnect-grace", "5"])
+    assert seen["metrics_port"] == 9100 and seen["metrics_interval"] == 30.0
+    assert seen["reconnect_grace"] == 5.0
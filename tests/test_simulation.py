@@ -0,0 +1,87 @@
+import pytest
+
+from bang_py.simulation import (
+    GameResult,
+    SimulationStats,
+    create_policy,
+    run_simulations,
+    simulate_game,
+)
+from bang_py.simulation.cli import main
+
+
+def _result(winner: str | None, roles: tuple[str, ...], winning: tuple[str, ...], turns: int):
+    return GameResult(
+        seed=0,
+        num_players=len(roles),
+        winner=winner,
+        roles=roles,
+        winning_roles=winning,
+        turns=turns,
+        duration=0.5,
+    )
+
+
+def test_simulate_game_is_reproducible() -> None:
+    first = simulate_game(3, 5, ("aggressive", "random"))
+    second = simulate_game(3, 5, ("aggressive", "random"))
+    assert first.winner == second.winner
+    assert first.turns == second.turns
+    assert first.roles == second.roles
+    assert sorted(first.roles) == ["Deputy", "Outlaw", "Outlaw", "Renegade", "Sheriff"]
+    if first.finished:
+        assert first.winning_roles
+
+
+def test_stats_track_turns_and_role_win_rates() -> None:
+    stats = SimulationStats()
+    stats.add(_result("Outlaws win!", ("Sheriff", "Outlaw", "Outlaw"), ("Outlaw",), 10))
+    stats.add(_result(None, ("Sheriff", "Outlaw", "Renegade"), (), 30))
+    assert stats.games == 2
+    assert stats.finished == 1
+    assert stats.mean_turns == 20
+    assert (stats.min_turns, stats.max_turns) == (10, 30)
+    assert stats.win_rates() == {"Outlaw": 0.5, "Renegade": 0.0, "Sheriff": 0.0}
+    assert stats.outcomes["unfinished"] == 1
+
+    merged = SimulationStats()
+    merged.add(_result("Renegade wins!", ("Sheriff", "Renegade"), ("Renegade",), 5))
+    merged.merge(stats)
+    assert merged.games == 3
+    assert merged.min_turns == 5
+    assert merged.win_rates()["Renegade"] == 0.5
+
+
+def test_run_simulations_counts_every_game() -> None:
+    stats = run_simulations(4, 4, seed=10)
+    assert stats.games == 4
+    assert stats.wall_time > 0
+    assert stats.games_per_second > 0
+
+
+def test_unknown_policy_is_rejected() -> None:
+    import random
+
+    with pytest.raises(ValueError):
+        create_policy("missing", random.Random(0))
+
+
+def test_cli_prints_summary(capsys) -> None:
+    main(["--games", "2", "--players", "4", "--policy", "random"])
+    out = capsys.readouterr().out
+    assert "games: 2" in out
+    assert "games/sec" in out
+
+
+def test_parallel_runner_matches_sequential_totals() -> None:
+    from bang_py.simulation import run_parallel
+
+    seen: list[int] = []
+    parallel = run_parallel(
+        5, 4, seed=20, workers=2, shard_size=2, on_result=lambda r, s: seen.append(s.games)
+    )
+    sequential = run_simulations(5, 4, seed=20)
+    assert seen == [1, 2, 3, 4, 5]
+    assert parallel.turns == sequential.turns
+    assert parallel.outcomes == sequential.outcomes
+    assert parallel.win_rates() == sequential.win_rates()
@@ -0,0 +1,69 @@
+from bang_py.cards.bang import BangCard
+from bang_py.cards.barrel import BarrelCard
+from bang_py.game_manager import GameManager
+from bang_py.player import Player
+from bang_py.simulation import AggressiveBot, play_out
+
+
+def _game(seed: int) -> GameManager:
+    gm = GameManager(expansions=["high_noon"], seed=seed)
+    for i in range(5):
+        gm.add_player(Player(f"P{i}"))
+    gm.start_game()
+    return gm
+
+
+def _bots(gm: GameManager) -> list[AggressiveBot]:
+    return [AggressiveBot(gm.rng) for _ in gm.players]
+
+
+def _describe(gm: GameManager) -> list[object]:
+    assert gm.deck is not None
+    return [
+        [
+            (p.name, p.health, [c.card_name for c in p.hand], dict(p.equipment).keys())
+            for p in gm.players
+        ],
+        [(c.card_name, c.suit, c.rank) for c in gm.deck.cards],
+        [c.card_name for c in gm.discard_pile],
+        gm.turn_order,
+        gm.current_turn,
+        gm.current_event.name if gm.current_event else None,
+    ]
+
+
+def test_restore_reproduces_state_and_rollouts() -> None:
+    gm = _game(5)
+    play_out(gm, _bots(gm), max_turns=12)
+    snap = gm.snapshot()
+
+    first = GameManager.restore(snap)
+    second = GameManager.restore(snap)
+    assert _describe(first) == _describe(gm)
+    assert first.players[0] is not gm.players[0]
+
+    expected = play_out(gm, _bots(gm))
+    assert play_out(first, _bots(first)) == expected
+    assert play_out(second, _bots(second)) == expected
+
+
+def test_snapshot_is_isolated_from_later_play() -> None:
+    gm = _game(7)
+    alice = gm.players[0]
+    barrel = BarrelCard(suit="Hearts", rank=3)
+    alice.equip(barrel)
+    alice.hand.append(BangCard(suit="Spades", rank=2))
+    gm.event_flags["dead_man_player"] = alice
+    snap = gm.snapshot()
+
+    alice.hand.clear()
+    barrel.active = False
+    alice.health = 1
+
+    restored = GameManager.restore(snap)
+    clone = restored.players[0]
+    assert clone.hand[-1].card_name == "Bang!"
+    assert clone.equipment["Barrel"].active
+    assert clone.health == clone.max_health
+    assert restored.event_flags["dead_man_player"] is clone
+    assert clone.metadata.game is restored
@@ -0,0 +1,113 @@
+import asyncio
+import json
+from typing import Any, cast
+
+import pytest
+
+pytest.importorskip("websockets")
+
+from bang_py.cards.bang import BangCard  # noqa: E402
+from bang_py.network.compact import decode_frame  # noqa: E402
+from bang_py.network.room import Connection, GameRoom  # noqa: E402
+from bang_py.network.spectators import Spectator  # noqa: E402
+from bang_py.network.state import StateTracker  # noqa: E402
+from bang_py.player import Player  # noqa: E402
+
+
+async def _drain(spectator: Spectator) -> list[str | bytes]:
+    payloads: list[str | bytes] = []
+    while len(spectator.outbox):
+        payload = await spectator.outbox.get()
+        assert payload is not None
+        payloads.append(payload)
+    return payloads
+
+
+def _watched_room(spectators: int) -> tuple[GameRoom, list[Spectator]]:
+    room = GameRoom("watch")
+    for name in ("A", "B"):
+        player = Player(name)
+        room.game.add_player(player)
+        room.connections[cast(Any, name)] = Connection(cast(Any, name), player)
+    watchers = [
+        Spectator(cast(Any, f"s{i}"), compact=i == spectators - 1) for i in range(spectators)
+    ]
+    for spectator in watchers:
+        room.spectators.add(spectator)
+    return room, watchers
+
+
+def test_spectators_share_one_encoded_frame_per_format() -> None:
+    async def run() -> None:
+        room, watchers = _watched_room(4)
+        room.game.players[0].hand.append(BangCard())
+        await room.broadcast_state("first")
+        room.game.players[1].health -= 1
+        await room.broadcast_state()
+
+        frames = [await _drain(spectator) for spectator in watchers]
+        assert all(len(sent) == 2 for sent in frames)
+        # Every JSON spectator got the very same payload objects.
+        for first, other in zip(frames[0], frames[1]):
+            assert first is other
+        compact = [decode_frame(payload) for payload in frames[-1]]
+        plain = [json.loads(payload) for payload in frames[0]]
+        assert compact == plain
+
+        keyframe, update = plain
+        assert keyframe["keyframe"] and keyframe["hand"] == [] and "actions" not in keyframe
+        assert keyframe["messages"] == ["first"]
+        assert update["base"] == keyframe["version"]
+        assert update["players_diff"] == {"1": {"health": room.game.players[1].health}}
+        tracker = StateTracker()
+        assert tracker.apply(keyframe) is not None and tracker.apply(update) is not None
+
+    asyncio.run(run())
+
+
+def test_unchanged_state_sends_spectators_nothing() -> None:
+    async def run() -> None:
+        room, watchers = _watched_room(1)
+        await room.broadcast_state()
+        await room.broadcast_state()
+        assert len(await _drain(watchers[0])) == 1
+
+    asyncio.run(run())
+
+
+@pytest.mark.slow
+def test_spectator_watches_a_full_table_read_only() -> None:
+    from websockets.asyncio.client import connect
+    from websockets.asyncio.server import serve
+
+    from bang_py.network.server import BangServer
+
+    async def handshake(ws: Any, request: str) -> str:
+        await ws.recv()
+        await ws.send("w001")
+        await ws.recv()
+        await ws.send(request)
+        return str(await ws.recv())
+
+    async def run() -> None:
+        server = BangServer(host="localhost", port=0, room_code="w001", max_players=1)
+        async with serve(server.handler, server.host, server.port) as ws_server:
+            uri = f"ws://localhost:{next(iter(ws_server.sockets)).getsockname()[1]}"
+            async with connect(uri) as player, connect(uri) as watcher:
+                assert await handshake(player, "Alice") == "Joined game as Alice"
+                await player.recv()
+                reply = await handshake(watcher, json.dumps({"spectate": True}))
+                assert reply == "Watching game"
+                frame = json.loads(await watcher.recv())
+                assert frame["keyframe"] and frame["hand"] == []
+                assert [p["name"] for p in frame["players"]] == ["Alice"]
+                assert server.metrics.spectators.total() == 1
+
+                await watcher.send(json.dumps({"action": "end_turn"}))
+                error = json.loads(await watcher.recv())
+                assert error["error"]["code"] == "spectator"
+                await watcher.send(json.dumps({"action": "resync"}))
+                assert json.loads(await watcher.recv())["keyframe"]
+                assert [p.name for p in server.game.players] == ["Alice"]
+
+    asyncio.run(run())
@@ -0,0 +1,180 @@
+import json
+from typing import Any, cast
+
+import pytest
+
+from bang_py.cards.bang import BangCard
+from bang_py.network.state import (
+    KEYFRAME_INTERVAL,
+    FrameEncoder,
+    GameState,
+    StateTracker,
+    apply_frame,
+    delta,
+    hand_splice,
+    keyframe,
+)
+from bang_py.player import Player
+
+
+def _state(health: int = 4, hand: list[str] | None = None) -> GameState:
+    return {
+        "players": [
+            {"name": "A", "health": health, "role": "", "character": "", "equipment": []},
+            {"name": "B", "health": 4, "role": "", "character": "", "equipment": ["Barrel"]},
+        ],
+        "hand": hand if hand is not None else ["Bang!", "Missed!", "Beer"],
+        "character": "",
+        "event": "",
+    }
+
+
+@pytest.mark.parametrize(
+    "old,new",
+    [
+        (["a", "b", "c"], ["a", "c"]),
+        (["a", "b"], ["a", "b", "c", "d"]),
+        (["a", "b", "a"], ["a", "a"]),
+        ([], ["x"]),
+        (["x", "y"], []),
+        (["a", "b", "c"], ["a", "x", "c"]),
+    ],
+)
+def test_hand_splice_round_trip(old: list[str], new: list[str]) -> None:
+    splice = hand_splice(old, new)
+    assert splice is not None
+    at, count, inserted = cast(tuple[int, int, list[str]], splice)
+    result = list(old)
+    stop = at + count
+    result[at:stop] = inserted
+    assert result == new
+
+
+def test_delta_only_contains_changes() -> None:
+    old = _state()
+    new = _state(health=3, hand=["Bang!", "Beer"])
+    frame = delta(2, 1, old, new)
+    assert frame["players_diff"] == {"0": {"health": 3}}
+    assert frame["hand_splice"] == [1, 1, []]
+    assert "players" not in frame
+    assert apply_frame(old, frame) == new
+
+
+def test_delta_sends_full_players_when_seating_changes() -> None:
+    old = _state()
+    new = _state()
+    new["players"] = new["players"][:1]
+    frame = delta(2, 1, old, new)
+    assert frame["players"] == new["players"]
+    assert apply_frame(old, frame) == new
+
+
+def test_tracker_rejects_delta_with_unknown_base() -> None:
+    tracker = StateTracker()
+    assert tracker.apply(delta(2, 1, _state(), _state(health=2))) is None
+    assert tracker.apply(keyframe(1, _state())) == _state()
+    assert tracker.apply(delta(3, 2, _state(), _state(health=2))) is None
+    assert tracker.apply(delta(2, 1, _state(), _state(health=2))) == _state(health=2)
+    assert tracker.version == 2
+
+
+def _frame(room: Any, conn: Any, messages: list[str] | None = None) -> Any:
+    return room._state_frame(conn, room._snapshot(conn, *room._public_state()), messages)
+
+
+def test_room_sends_keyframe_then_deltas() -> None:
+    pytest.importorskip("websockets")
+    from bang_py.network.room import Connection, GameRoom
+
+    room = GameRoom("frames")
+    alice = Player("Alice")
+    room.game.add_player(alice)
+    conn = Connection(cast(Any, None), alice)
+
+    room.state_version = 1
+    first = _frame(room, conn)
+    assert first is not None and first.get("keyframe")
+
+    room.state_version = 2
+    assert _frame(room, conn) is None
+
+    alice.health -= 1
+    room.state_version = 3
+    second = _frame(room, conn, ["hit"])
+    assert second == {
+        "type": "state",
+        "version": 3,
+        "base": 1,
+        "players_diff": {"0": {"health": alice.health}},
+        "messages": ["hit"],
+    }
+
+    room.state_version = 1 + KEYFRAME_INTERVAL
+    third = _frame(room, conn, ["tick"])
+    assert third is not None and third.get("keyframe")
+
+
+def test_frame_encoder_matches_json_and_reuses_shared_values() -> None:
+    encoder = FrameEncoder()
+    state = _state()
+    frame = keyframe(1, state)
+    frame["messages"] = ["hello"]
+    assert json.loads(encoder.encode(frame)) == json.loads(json.dumps(frame))
+    assert encoder.diff_players(state["players"], []) is encoder.diff_players(state["players"], [])
+
+
+def test_prepare_broadcast_serializes_players_once(monkeypatch) -> None:
+    pytest.importorskip("websockets")
+    from bang_py.network import room as room_module
+    from bang_py.network.room import Connection, GameRoom
+
+    room = GameRoom("shared")
+    for name in ("A", "B", "C"):
+        player = Player(name)
+        room.game.add_player(player)
+        room.connections[cast(Any, name)] = Connection(cast(Any, name), player)
+    room.game.players[1].hand.append(BangCard())
+
+    calls: list[int] = []
+    original = room_module._serialize_players
+
+    def counting(players: Any) -> Any:
+        calls.append(1)
+        return original(players)
+
+    monkeypatch.setattr(room_module, "_serialize_players", counting)
+    frames = room.prepare_broadcast(["go"])
+    assert len(calls) == 1
+    decoded = {conn.player.name: json.loads(payload) for conn, payload in frames}
+    assert decoded["B"]["hand"] == ["Bang!"]
+    assert decoded["A"]["hand"] == []
+    assert decoded["A"]["players"] == decoded["C"]["players"]
+
+
+def test_requested_broadcasts_coalesce_into_one_frame(monkeypatch) -> None:
+    pytest.importorskip("websockets")
+    import asyncio
+
+    from bang_py.network.room import Connection, GameRoom
+
+    room = GameRoom("coalesce")
+    alice = Player("Alice")
+    room.game.add_player(alice)
+    room.connections[cast(Any, "alice")] = Connection(cast(Any, "alice"), alice)
+    sent: list[list[str] | None] = []
+
+    def prepare(messages: list[str] | None = None) -> list[Any]:
+        sent.append(messages)
+        return []
+
+    monkeypatch.setattr(room, "prepare_broadcast", prepare)
+
+    async def run() -> None:
+        room.request_broadcast("one")
+        room.request_broadcast()
+        room.request_broadcast("two")
+        for _ in range(3):
+            await asyncio.sleep(0)
+
+    asyncio.run(run())
+    assert sent == [["one", "two"]]
@@ -0,0 +1,112 @@
+import asyncio
+import json
+import socket
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+pytest.importorskip("websockets")
+
+from websockets.asyncio.client import connect  # noqa: E402
+
+from bang_py.network import supervisor as supervisor_module  # noqa: E402
+from bang_py.network.server import BangServer, room_shard  # noqa: E402
+from bang_py.network.supervisor import Supervisor  # noqa: E402
+
+
+def test_room_shard_is_stable_and_in_range() -> None:
+    codes = [f"c{i:03d}" for i in range(200)]
+    shards = [room_shard(code, 3) for code in codes]
+    assert shards == [room_shard(code, 3) for code in codes]
+    assert set(shards) == {0, 1, 2}
+
+
+def test_sharded_server_only_creates_and_restores_its_rooms(tmp_path: Path) -> None:
+    server = BangServer(state_dir=tmp_path)
+    codes = [server.create_room().code for _ in range(12)]
+    owned = {code for code in (server.room_code, *codes) if room_shard(code, 2) == 1}
+
+    worker = BangServer(state_dir=tmp_path, shard=(1, 2))
+    assert owned <= set(worker.rooms)
+    assert all(room_shard(code, 2) == 1 for code in worker.rooms)
+
+
+def test_supervisor_spreads_rooms_over_workers(tmp_path: Path) -> None:
+    (tmp_path / "stored").mkdir()
+    (tmp_path / "stored" / "snapshot.pickle").write_bytes(b"")
+    supervisor = Supervisor(3, rooms=8, room_code="main", state_dir=tmp_path)
+    assert supervisor.codes[:2] == ["main", "stored"] and len(supervisor.codes) == 8
+    for code in supervisor.codes:
+        worker = supervisor.worker_for(code)
+        assert code in worker.codes and room_shard(code, 3) == worker.index
+    assert sorted(c for w in supervisor.workers for c in w.codes) == sorted(supervisor.codes)
+
+
+def test_match_requests_for_one_table_reach_one_worker() -> None:
+    def match(name: str, expansions: list[str]) -> str:
+        request = {"match": True, "name": name, "players": 4, "expansions": expansions}
+        return supervisor_module._route(json.dumps(request))
+
+    assert match("Alice", ["high_noon", "dodge_city"]) == match("Bob", ["dodge_city", "high_noon"])
+    assert match("Alice", []) != match("Alice", ["dodge_city"])
+    assert supervisor_module._route("abc123") == "abc123"
+
+    # Left out settings are the workers' defaults, not a key of their own.
+    bare = json.dumps({"match": True, "name": "Cleo"})
+    assert supervisor_module._route(bare, 4, ["dodge_city"]) == match("Dan", ["dodge_city"])
+    assert supervisor_module._route(bare) == repr((7, ()))
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return int(sock.getsockname()[1])
+
+
+async def _join(uri: str, code: str, name: str) -> tuple[str, dict[str, Any]]:
+    async with connect(uri) as ws:
+        await ws.recv()
+        await ws.send(code)
+        await ws.recv()
+        await ws.send(name)
+        joined = str(await ws.recv())
+        return joined, json.loads(await ws.recv())
+
+
+@pytest.mark.slow
+def test_supervisor_relays_clients_to_the_worker_of_their_room(monkeypatch) -> None:
+    monkeypatch.setattr(supervisor_module, "CHECK_INTERVAL", 0.1)
+    port = _free_port()
+    supervisor = Supervisor(2, host="127.0.0.1", port=port, rooms=6)
+    first, second = (next(c for c in supervisor.codes if room_shard(c, 2) == i) for i in (0, 1))
+    uri = f"ws://127.0.0.1:{port}"
+
+    async def run() -> None:
+        task = asyncio.create_task(supervisor.start())
+        try:
+            await supervisor_module._wait_for_port(port)
+            for code, name in ((first, "Alice"), (second, "Bob")):
+                joined, state = await _join(uri, code, name)
+                assert joined == f"Joined game as {name}"
+                assert state["keyframe"] and state["players"][0]["name"] == name
+            async with connect(uri) as ws:
+                await ws.recv()
+                await ws.send("nope")
+                assert await ws.recv() == "Invalid room code"
+
+            crashed = supervisor.workers[0].process
+            assert crashed is not None
+            crashed.kill()
+            while supervisor.workers[0].process is crashed:
+                await asyncio.sleep(0.05)
+            await supervisor_module._wait_for_port(supervisor.workers[0].port)
+            joined, _state = await _join(uri, first, "Cleo")
+            assert joined == "Joined game as Cleo"
+        finally:
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+        assert all(not w.process or not w.process.is_alive() for w in supervisor.workers)
+
+    asyncio.run(run())
@@ -0,0 +1,76 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("websockets")
+
+from bang_py.network.room import GameRoom  # noqa: E402
+from bang_py.characters.kit_carlson import KitCarlson  # noqa: E402
+from bang_py.player import Player  # noqa: E402
+
+
+def _started_room(turn_bot: str | None = None) -> GameRoom:
+    room = GameRoom("timer", seed=7, turn_timeout=0.02, turn_bot=turn_bot)
+    for name in ("A", "B", "C"):
+        room.game.add_player(Player(name))
+    room.game.start_game()
+    return room
+
+
+async def _next_turn(room: GameRoom, player: Player | None) -> Player | None:
+    while room.game._current_player_obj() is player:
+        await asyncio.sleep(0.005)
+    return room.game._current_player_obj()
+
+
+def test_turn_ends_when_its_timer_expires() -> None:
+    async def run() -> None:
+        room = _started_room()
+        first = room.game._current_player_obj()
+        second = await _next_turn(room, first)
+        assert second is not None and second is not first
+        assert room.metrics.turn_timeouts.total() == 1
+
+        # Ending the turn in time starts a fresh timer for the next player.
+        room.game.end_turn()
+        third = room.game._current_player_obj()
+        await asyncio.sleep(0.01)
+        assert room.game._current_player_obj() is third
+        assert await _next_turn(room, third) is not third
+        assert room.metrics.turn_timeouts.total() == 2
+        room.close()
+        assert room._turn_timer is None
+
+    asyncio.run(run())
+
+
+def test_bot_plays_a_pending_draw_before_the_turn_ends() -> None:
+    async def run() -> None:
+        room = _started_room(turn_bot="random")
+        room.close()
+        player = room.game._current_player_obj()
+        assert player is not None
+        player.character = KitCarlson()
+        player.metadata.awaiting_draw = True
+        room._on_turn_started(player)
+        await _next_turn(room, player)
+        assert not player.metadata.awaiting_draw
+        log = room.game.action_log
+        assert log is not None
+        assert log.commands[-1][0] == "end_turn"
+        assert any(c[0] == "draw_phase" for c in log.commands)
+
+    asyncio.run(run())
+
+
+def test_game_over_stops_the_turn_timer() -> None:
+    async def run() -> None:
+        room = _started_room()
+        assert room._turn_timer is not None
+        for callback in room.game.game_over_listeners:
+            callback("Outlaws win")
+        assert room._turn_timer is None
+        room._on_turn_started(room.game.players[0])
+        assert room._turn_timer is None
+
+    asyncio.run(run())